@@ -0,0 +1,49 @@
+"""
+Micro-benchmark for XcomPackage.checksum.
+
+Compares the current implementation against the original per-byte loop.
+Run from the repository root:
+    python benchmarks/bench_checksum.py
+"""
+
+import os
+import random
+import struct
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from pystuderxcom import XcomPackage
+
+
+def checksum_loop(data: bytes) -> bytes:
+    """Original implementation, kept as reference"""
+    A = 0xFF
+    B = 0x00
+
+    for d in data:
+        A = (A + d) % 0x100
+        B = (B + A) % 0x100
+
+    A = struct.pack("<B", A)
+    B = struct.pack("<B", B)
+
+    return A + B
+
+
+def main():
+    number = 20000
+
+    for length in [11, 64, 256]:
+        data = bytes(random.randrange(256) for _ in range(length))
+        assert XcomPackage.checksum(data) == checksum_loop(data)
+
+        t_loop = timeit.timeit(lambda: checksum_loop(data), number=number) / number
+        t_fast = timeit.timeit(lambda: XcomPackage.checksum(data), number=number) / number
+
+        print(f"{length:4d} bytes: loop {t_loop*1e6:7.2f} us, current {t_fast*1e6:7.2f} us, speed-up {t_loop/t_fast:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
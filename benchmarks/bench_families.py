@@ -0,0 +1,69 @@
+"""
+Micro-benchmark for the XcomDeviceFamilies resolution functions.
+
+These run inside every XcomValuesItem construction, so they are on the path
+of each polled value. Compares the current lookup tables against the original
+sequential search over the family list.
+Run from the repository root:
+    python benchmarks/bench_families.py
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from pystuderxcom import XcomDeviceFamilies, XcomDeviceFamily, XcomAggregationType
+
+
+def get_list_scan() -> list[XcomDeviceFamily]:
+    """Original implementation, kept as reference"""
+    return [val for val in XcomDeviceFamilies.__dict__.values() if type(val) is XcomDeviceFamily]
+
+
+def get_code_by_addr_scan(addr: int, family_id: str) -> str:
+    """Original implementation, kept as reference"""
+    for family in get_list_scan():
+        if family.id == family_id or family.id_for_nr == family_id:
+            try:
+                return family.get_code(addr)
+            except:
+                pass
+
+    return None
+
+
+def get_addr_by_aggregationtype_scan(aggr: XcomAggregationType, family_id: str) -> int:
+    """Original implementation, kept as reference"""
+    family = next(f for f in get_list_scan() if f.id == family_id)
+
+    for addr in range(family.addr_devices_start, family.addr_devices_end+1):
+        if XcomDeviceFamilies.get_aggregationtype_by_addr(addr) == aggr:
+            return addr
+
+    return None
+
+
+def main():
+    number = 50000
+
+    cases = [
+        ("get_code_by_addr(101, 'xt')",  lambda: get_code_by_addr_scan(101, "xt"),  lambda: XcomDeviceFamilies.get_code_by_addr(101, "xt")),
+        ("get_code_by_addr(193, 'xt')",  lambda: get_code_by_addr_scan(193, "xt"),  lambda: XcomDeviceFamilies.get_code_by_addr(193, "xt")),
+        ("get_code_by_addr(601, 'bsp')", lambda: get_code_by_addr_scan(601, "bsp"), lambda: XcomDeviceFamilies.get_code_by_addr(601, "bsp")),
+        ("get_addr_by_aggr(VS15, 'vs')", lambda: get_addr_by_aggregationtype_scan(XcomAggregationType.DEVICE15, "vs"), lambda: XcomDeviceFamilies.get_addr_by_aggregationtype(XcomAggregationType.DEVICE15, "vs")),
+        ("get_addr_by_aggr(SUM, 'vt')",  lambda: get_addr_by_aggregationtype_scan(XcomAggregationType.SUM, "vt"), lambda: XcomDeviceFamilies.get_addr_by_aggregationtype(XcomAggregationType.SUM, "vt")),
+    ]
+
+    for name, scan, fast in cases:
+        assert scan() == fast()
+
+        t_scan = timeit.timeit(scan, number=number) / number
+        t_fast = timeit.timeit(fast, number=number) / number
+
+        print(f"{name:30s}: scan {t_scan*1e6:7.2f} us, current {t_fast*1e6:7.2f} us, speed-up {t_scan/t_fast:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
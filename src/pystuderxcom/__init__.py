@@ -1,26 +1,33 @@
-from .api_tcp import AsyncXcomApiTcp, XcomApiTcp
+from .api_tcp import AsyncXcomApiTcp, XcomApiTcp, AsyncXcomApiTcpServer, XcomApiTcpServer, AsyncXcomApiTcpSession, XcomApiTcpSession
 from .api_udp import AsyncXcomApiUdp, XcomApiUdp
 from .api_serial import AsyncXcomApiSerial, XcomApiSerial
 
 from .api_base_async import AsyncXcomApiBase
 from .discover_async import AsyncXcomDiscover
 from .factory_async import AsyncXcomFactory
+from .pool_async import AsyncXcomGatewayPool
+from .scheduler_async import AsyncXcomScheduler
+from .topology_async import AsyncXcomTopologyCache
 
 from .api_base_sync import XcomApiBase
 from .discover_sync import XcomDiscover
 from .factory_sync import XcomFactory
+from .pool_sync import XcomGatewayPool
+from .scheduler_sync import XcomScheduler
+from .topology_sync import XcomTopologyCache
 
 from .const import XcomApiTcpMode, XcomVoltage, XcomLevel, XcomFormat, XcomTarget, XcomCategory, XcomAggregationType
 from .const import XcomApiWriteException, XcomApiReadException, XcomApiTimeoutException, XcomApiUnpackException, XcomApiResponseIsError, XcomDiscoverNotConnected, XcomParamException
-from .data import XcomDiscoveredClient, XcomDiscoveredDevice
-from .datapoints import XcomDataset, XcomDatapoint, XcomDatapointUnknownException
+from .data import XcomDiscoveredClient, XcomDiscoveredDevice, XcomTopology
+from .datapoints import XcomDataset, XcomLazyDataset, XcomDatapoint, XcomDatapointUnknownException
 from .families import XcomDeviceFamily, XcomDeviceFamilies, XcomDeviceFamilyUnknownException, XcomDeviceCodeUnknownException, XcomDeviceAddrUnknownException
 from .messages import XcomMessage, XcomMessageUnknownException
-from .values import XcomValues, XcomValuesItem
+from .subscriptions import XcomSubscription
+from .values import XcomValues, XcomValuesColumns, XcomValuesItem
 
 # For unit testing
 from .const import ScomFrameFlag, ScomObjType, ScomObjId, ScomServiceId, ScomServiceFlag, ScomQspId, ScomQspLevel, ScomAddress, ScomErrorCode
 from .data import XcomData, XcomDataMessageRsp, XcomDataMultiInfoReq, XcomDataMultiInfoReqItem, XcomDataMultiInfoRsp, XcomDataMultiInfoRspItem
 from .messages import XcomMessageDef, XcomMessageSet
-from .protocol import XcomHeader, XcomFrame, XcomService, XcomPackage
+from .protocol import XcomHeader, XcomFrame, XcomService, XcomPackage, XcomFramer
 
@@ -4,16 +4,29 @@
 
 import asyncio
 import binascii
+import contextlib
 import logging
+import math
+import time
 
-from datetime import datetime, timedelta
+from datetime import timedelta
 
+from .cache import (
+    XcomParamCache,
+)
 from .const import (
     START_TIMEOUT,
     STOP_TIMEOUT,
     REQ_TIMEOUT,
     REQ_RETRIES,
     REQ_BURST_PERIOD,
+    REQ_BURST_PAUSE,
+    REQ_WINDOW,
+    REQ_NEGATIVE_TTL,
+    PARAM_CACHE_TTL,
+    PARAM_CACHE_SIZE,
+    RECONNECT_DELAY_MIN,
+    RECONNECT_DELAY_MAX,
     ScomAddress,
     XcomFormat,
     XcomTarget,
@@ -30,7 +43,12 @@ from .const import (
     XcomApiTimeoutException,
     XcomApiResponseIsError,
     XcomParamException,
+    SCOM_ERRORS_PERMANENT,
+    SCOM_ERRORS_UNSUPPORTED,
     safe_len,
+    deadline_remaining,
+    async_acquire_until,
+    acquire_until,
 )
 from .data import (
     XcomData,
@@ -55,17 +73,31 @@ from .messages import (
 from .protocol import (
     XcomPackage,
 )
+from .subscriptions import (
+    XcomSubscription,
+    XcomSubscriptions,
+)
 from .values import (
     XcomValues,
+    XcomValuesColumns,
     XcomValuesItem,
 )
-import time
+import concurrent.futures
 import threading
 
 
 _LOGGER = logging.getLogger(__name__)
 
 
+class XcomPendingRequest:
+    """
+    Administration of a request that was sent and is waiting for its response package
+    """
+    def __init__(self, key: tuple):
+        self.key = key
+        self.response: XcomPackage = None
+
+
 ##
 ## Base cass abstracting Xcom Api
 ##
@@ -79,15 +111,44 @@ class XcomApiBase:
         self._connected = False
         self._remote_ip = None
         self._request_id = 0
-        self._sendRequestLock = threading.Lock() # to make sure _sendRequest_inner is never called concurrently
+
+        # Request pipeline; requests are sent as soon as the window allows and
+        # received response packages are routed to the pending request they answer
+        self._request_window = REQ_WINDOW
+        self._sendWindow = threading.Semaphore(REQ_WINDOW) # to limit the number of requests in flight
+        self._sendLock = threading.Lock()     # to make sure _send_package is never called concurrently
+        self._receiveLock = threading.Lock()  # to make sure _receive_package is never called concurrently
+        self._pending: dict[tuple, list[XcomPendingRequest]] = {}
+        self._pendingLock = threading.Lock()  # guards _pending against concurrent threads (no-op in the async build)
+
+        # Negative cache; a request that got a permanent error response fails fast until its entry expires
+        self._negative: dict[tuple, tuple[float, str]] = {}   # key -> (expires on time.monotonic(), error)
+
+        # Connection supervision; derived classes report a lost connection and implement _reconnect
+        self._auto_reconnect: bool = False
+        self._reconnecting: bool = False
+        self._reconnect_generation: int = 0     # bumped by _stop_reconnect, so a superseded loop can tell it must end
+
+        # Request pacing; tracked per api instance so each gateway is paced independently
+        self._burst_start: float|None = None    # time.monotonic()
+        self._burst_last: float|None = None
 
         # Cached values
         self._msg_set = None
+        self._param_cache = XcomParamCache(PARAM_CACHE_TTL, PARAM_CACHE_SIZE)   # param values; written through on update_value
+        self._param_last = XcomParamCache(math.inf, PARAM_CACHE_SIZE)   # last read or written param values, without expiry; used by update_values
         self._latest_frame_flags: int = None   # most recent received frame flags, used for various status flags
 
+        # Change-notification subscriptions on values retrieved via request_values
+        self._subscriptions = XcomSubscriptions()
+
         # Diagnostics gathering
         self._diag_retries = {}
         self._diag_durations = {}
+        self._diag_skipped = 0
+        self._diag_disconnects = 0
+        self._diag_reconnects = 0
+        self._diag_negative_hits = 0
 
 
     def start(self, timeout=START_TIMEOUT) -> bool:
@@ -115,6 +176,40 @@ class XcomApiBase:
         """Returns the IP address of the connected Xcom client, otherwise None"""
         return self._remote_ip
     
+    @property
+    def request_window(self) -> int:
+        """Returns the max number of requests that can be in flight at the same time"""
+        return self._request_window
+    
+    @request_window.setter
+    def request_window(self, window: int):
+        """Set the max number of requests that can be in flight at the same time. Only change this while no requests are pending."""
+        if window < 1:
+            raise XcomParamException(f"Invalid request_window {window}; must be 1 or more")
+        
+        self._request_window = window
+        self._sendWindow = threading.Semaphore(window)
+
+    @property
+    def param_cache_ttl(self) -> float:
+        """Returns how many seconds read param values are reused; 0 means the param cache is disabled"""
+        return self._param_cache.ttl
+
+    @param_cache_ttl.setter
+    def param_cache_ttl(self, ttl: float):
+        """Set how many seconds read param values are reused; 0 disables the param cache"""
+        self._param_cache = XcomParamCache(ttl, self._param_cache.max_size)
+
+    @property
+    def param_cache_size(self) -> int:
+        """Returns the max number of param values in the param cache"""
+        return self._param_cache.max_size
+
+    @param_cache_size.setter
+    def param_cache_size(self, size: int):
+        """Set the max number of param values in the param cache; least recently used values are evicted first"""
+        self._param_cache = XcomParamCache(self._param_cache.ttl, size)
+
     @property
     def is_message_pending(self) -> bool|None:
         """Returns whether a message is pending. Only available once a response packet has been received."""
@@ -209,6 +304,12 @@ class XcomApiBase:
         if type(dstAddr) is str:
             dstAddr = XcomDeviceFamilies.get_addr_by_code(dstAddr)
 
+        # Params rarely change; reuse a recently read or written value
+        if parameter.category == XcomCategory.PARAMETER:
+            found, value = self._param_cache.get(parameter.nr, dstAddr)
+            if found:
+                return value
+
         # Compose the request and send it
         request: XcomPackage = XcomPackage.gen_package(
             service_id = ScomServiceId.READ,
@@ -223,7 +324,13 @@ class XcomApiBase:
         if response is not None:
             # Unpack the response value
             try:
-                return XcomData.unpack(response.frame_data.service_data.property_data, parameter.format)
+                value = XcomData.unpack(response.frame_data.service_data.property_data, parameter.format)
+
+                if parameter.category == XcomCategory.PARAMETER:
+                    self._param_cache.put(parameter.nr, dstAddr, value)
+                    self._param_last.put(parameter.nr, dstAddr, value)
+
+                return value
 
             except Exception as e:
                 msg = f"Failed to unpack response package for {parameter.nr}:{dstAddr}, data={response.frame_data.service_data.property_data.hex()}: {e}"
@@ -270,10 +377,11 @@ class XcomApiBase:
         return None
             
                                          
-    def request_infos(self, request_data: XcomValues, retries = None, timeout = None, verbose=False) -> XcomValues:
+    def request_infos(self, request_data: XcomValues, retries = None, timeout = None, verbose=False, columnar=False) -> XcomValues|XcomValuesColumns:
         """
         Request multiple infos in one call.
         Per info you can indicate what device to get it from, or to get Average or Sum of multiple devices
+        With columnar=True the result is returned as XcomValuesColumns, decoded without creating an object per value.
 
         Returns None if not connected, otherwise returns the list of requested values
         Throws
@@ -311,7 +419,10 @@ class XcomApiBase:
         if response is not None:
             try:
                 # Unpack the response value
-                return XcomValues.unpack_response(response.frame_data.service_data.property_data, request_data)
+                if columnar:
+                    return XcomValuesColumns.unpack_response(response.frame_data.service_data.property_data, request_data)
+                else:
+                    return XcomValues.unpack_response(response.frame_data.service_data.property_data, request_data)
 
             except Exception as e:
                 msg = f"Failed to unpack response package for multi-info request, data={response.frame_data.service_data.property_data.hex()}: {e}"
@@ -326,8 +437,11 @@ class XcomApiBase:
         The function will try to be as efficient as possible and combine retrieval of multiple infos in one call.
         When the xcom-client does not support multiple-infos in one call, they are retried one by one. 
         Requested params and virtuals are always retrieved one by one, so the function can take a while to finish.        
+        When the param cache is enabled (param_cache_ttl), recently read params are taken from the cache instead.
 
-        Returns None if not connected, otherwise returns the list of requested values
+        Callbacks registered via subscribe are called for the retrieved values that changed.
+
+        Returns the list of requested values. If not connected, all returned values have an error set.
         Throws
             XcomApiWriteException
             XcomApiReadException
@@ -335,7 +449,13 @@ class XcomApiBase:
             XcomApiResponseIsError
         """
 
-        # Sort out which XcomValues can be done via multi request_values and which must be done via single request_value
+        # Fail fast when the connection is down; do not wait for the timeouts of each individual request
+        if not self._check_connection():
+            return XcomValues([XcomValuesItem.from_resolved(i.datapoint, i.code, i.address, i.aggregation_type, error="Not connected to Xcom client") for i in request_data.items])
+
+        # Sort out which XcomValues can be done via multi request_values and which must be done via single request_value.
+        # Once the Xcom client answered that it does not support multi-info, go straight to single requests
+        multi_info = self._is_multi_info_supported()
         req_virtuals: list[XcomValuesItem] = []
         req_singles: list[XcomValuesItem] = []
         req_multi_items: list[XcomValuesItem] = []
@@ -357,7 +477,7 @@ class XcomApiBase:
                     # Standard datapoints are handled depending on category and aggregation type
                     match item.datapoint.category:
                         case XcomCategory.INFO:
-                            if item.aggregation_type is not None and item.aggregation_type in range(XcomAggregationType.DEVICE1, XcomAggregationType.DEVICE15+1):
+                            if multi_info and item.aggregation_type is not None and item.aggregation_type in range(XcomAggregationType.DEVICE1, XcomAggregationType.DEVICE15+1):
                                 # Can be combined with other infos in a request_values call
                                 req_multi_items.append(item)
 
@@ -383,66 +503,33 @@ class XcomApiBase:
                 req_multis.append( XcomValues(items=req_multi_items) )
                 req_multi_items = []
 
-        # Now perform all the multi request_values requests
-        result_items: list[XcomValues] = []
-        burst_start = datetime.now()
-
-        for req_multi in req_multis:
-            try:
-                rsp_multi = self.request_infos(req_multi, retries=retries, timeout=timeout, verbose=verbose)
+        # Now perform all the multi request_infos requests.
+        # When the request window allows it, several requests are in flight at the same time.
+        result_items: list[XcomValuesItem] = []
+        self._pace_burst()
 
-                # Success; gather the returned response items
-                result_items.extend(rsp_multi.items)
-            
-            except XcomApiTimeoutException as tex:
-                _LOGGER.debug(f"Failed to retrieve infos via single call. {tex}")
+        for idx in range(0, len(req_multis), self._request_window):
+            with concurrent.futures.ThreadPoolExecutor() as executor:
+                tasks = [executor.submit(self._request_values_multi, req_multi, retries=retries, timeout=timeout, verbose=verbose) for req_multi in req_multis[idx:idx+self._request_window]]
 
-                # Fail; do not retry as single request_value also expected to give timeout
-                value = None
-                error = str(tex)
-                result_items.extend( [XcomValuesItem(req.datapoint, code=req.code, address=req.address, aggregation_type=req.aggregation_type, value=value, error=error) for req in req_multi.items] )
-            
-            except Exception as ex:
-                _LOGGER.debug(f"Failed to retrieve infos via single call; will retry retrieve one-by-one. {ex}")
+            for task in tasks:
+                rsp_items, retry_items = task.result()
 
-                # Fail; retry all items as single request_value
-                req_singles.extend(req_multi.items)
+                # Gather the returned response items, and the items that need to be retried one-by-one
+                result_items.extend(rsp_items)
+                req_singles.extend(retry_items)
 
-            # Periodically wait for a second. This will make sure we do not block Xcom-LAN with
-            # too many requests at once and prevent it from uploading data to the Studer portal.
-            if (datetime.now() - burst_start).total_seconds() > REQ_BURST_PERIOD:
-                time.sleep(1)
-                burst_start = datetime.now()
+            self._pace_burst()
 
         # Next perform all the single request_value requests
-        for req_single in req_singles:
-            try:
-                error = None
-                value = self.request_value(req_single.datapoint, req_single.address, retries=retries, timeout=timeout, verbose=verbose)
-            
-            except Exception as ex:
-                value = None
-                error = str(ex)
+        for idx in range(0, len(req_singles), self._request_window):
+            with concurrent.futures.ThreadPoolExecutor() as executor:
+                tasks = [executor.submit(self._request_values_single, req_single, retries=retries, timeout=timeout, verbose=verbose) for req_single in req_singles[idx:idx+self._request_window]]
 
-            if error is not None:
-                _LOGGER.debug(f"Failed to retrieve info or param {req_single.datapoint.nr}:{req_single.address}; {error}")
+            for task in tasks:
+                result_items.append(task.result())
 
-            # Add to results
-            rsp_single = XcomValuesItem(
-                datapoint = req_single.datapoint, 
-                code = req_single.code,
-                address = req_single.address,
-                aggregation_type=req_single.aggregation_type, 
-                value = value,
-                error = error,
-            )
-            result_items.append(rsp_single)
-
-            # Periodically wait for a second. This will make sure we do not block Xcom-LAN with
-            # too many requests at once and prevent it from uploading data to the Studer portal.
-            if (datetime.now() - burst_start).total_seconds() > REQ_BURST_PERIOD:
-                time.sleep(1)
-                burst_start = datetime.now()
+            self._pace_burst()
 
         # Finally perform all the virtual request_value requests
         for req_virtual in req_virtuals:
@@ -468,14 +555,100 @@ class XcomApiBase:
             )
             result_items.append(rsp_virtual)
 
-            # Periodically wait for a second. This will make sure we do not block Xcom-LAN with
-            # too many requests at once and prevent it from uploading data to the Studer portal.
-            if (datetime.now() - burst_start).total_seconds() > REQ_BURST_PERIOD:
-                time.sleep(1)
-                burst_start = datetime.now()
+            self._pace_burst()
+
+        # Notify subscribers of changed values and return all reponse items as one XcomValues object
+        result = XcomValues(result_items)
+        self._subscriptions.notify(result)
+        return result
+
+
+    def _pace_burst(self):
+        """
+        Periodically wait for a second. This will make sure we do not block Xcom-LAN with
+        too many requests at once and prevent it from uploading data to the Studer portal.
+        A burst ends after REQ_BURST_PERIOD seconds, or when no requests were done for REQ_BURST_PAUSE seconds.
+        """
+        now = time.monotonic()
+        if self._burst_start is None or now - self._burst_last >= REQ_BURST_PAUSE:
+            self._burst_start = now
 
-        # Return all reponse items as one XcomValues object
-        return XcomValues(result_items)
+        elif now - self._burst_start > REQ_BURST_PERIOD:
+            time.sleep(REQ_BURST_PAUSE)
+            self._burst_start = time.monotonic()
+
+        self._burst_last = time.monotonic()
+
+
+    def subscribe(self, callback, nr: int, code: str, deadband: float = 0, min_interval: float = 0) -> XcomSubscription:
+        """
+        Register a callback for changes of a value retrieved via request_values.
+        The callback is called with the XcomValuesItem when the value of datapoint nr for device code (e.g. "XT1")
+        changed more than deadband since the previous notification, and at most once per min_interval seconds.
+        The first retrieved value is always notified.
+
+        Returns the subscription, to be passed into unsubscribe.
+        """
+        return self._subscriptions.subscribe(nr, code, callback, deadband=deadband, min_interval=min_interval)
+
+
+    def unsubscribe(self, subscription: XcomSubscription):
+        """
+        Remove a callback registered via subscribe
+        """
+        self._subscriptions.unsubscribe(subscription)
+
+
+    def _request_values_multi(self, req_multi: XcomValues, retries = None, timeout = None, verbose=False) -> tuple[list[XcomValuesItem], list[XcomValuesItem]]:
+        """
+        Helper for request_values to perform one multi request_infos request.
+        Returns a tuple with the response items and the request items that need to be retried one-by-one.
+        """
+        try:
+            rsp_multi = self.request_infos(req_multi, retries=retries, timeout=timeout, verbose=verbose)
+
+            # Success; return the response items
+            return (rsp_multi.items, [])
+        
+        except XcomApiTimeoutException as tex:
+            _LOGGER.debug(f"Failed to retrieve infos via single call. {tex}")
+
+            # Fail; do not retry as single request_value also expected to give timeout
+            value = None
+            error = str(tex)
+            return ([XcomValuesItem(req.datapoint, code=req.code, address=req.address, aggregation_type=req.aggregation_type, value=value, error=error) for req in req_multi.items], [])
+        
+        except Exception as ex:
+            _LOGGER.debug(f"Failed to retrieve infos via single call; will retry retrieve one-by-one. {ex}")
+
+            # Fail; retry all items as single request_value
+            return ([], req_multi.items)
+
+
+    def _request_values_single(self, req_single: XcomValuesItem, retries = None, timeout = None, verbose=False) -> XcomValuesItem:
+        """
+        Helper for request_values to perform one single request_value request.
+        Never throws; any error is returned in the response item.
+        """
+        try:
+            error = None
+            value = self.request_value(req_single.datapoint, req_single.address, retries=retries, timeout=timeout, verbose=verbose)
+        
+        except Exception as ex:
+            value = None
+            error = str(ex)
+
+        if error is not None:
+            _LOGGER.debug(f"Failed to retrieve info or param {req_single.datapoint.nr}:{req_single.address}; {error}")
+
+        return XcomValuesItem(
+            datapoint = req_single.datapoint, 
+            code = req_single.code,
+            address = req_single.address,
+            aggregation_type=req_single.aggregation_type, 
+            value = value,
+            error = error,
+        )
 
 
     def update_value(self, parameter: XcomDatapoint, value, dstAddr = 100, retries = None, timeout = None, verbose=False):
@@ -508,14 +681,106 @@ class XcomApiBase:
             dst_addr = dstAddr
         )
 
+        # Write through to the param cache. For a multicast address, that updates several devices at once, 
+        # the cached value of the param is dropped for all addresses
+        multicast = any(family.addr_multicast == dstAddr for family in XcomDeviceFamilies.get_list())
+        self._param_cache.invalidate(parameter.nr, None if multicast else dstAddr)
+        self._param_last.invalidate(parameter.nr, None if multicast else dstAddr)
+
         response = self._send_request(request, retries=retries, timeout=timeout, verbose=verbose)
         if response is not None:
             # No need to unpack the response value
+            self._param_cache.put(parameter.nr, dstAddr, value)
+            self._param_last.put(parameter.nr, dstAddr, value)
             return True
         
         return False
     
 
+    def update_values(self, update_data: XcomValues, retries = None, timeout = None, verbose=False) -> XcomValues:
+        """
+        Update multiple params in one call; each item holds the param, the device address and the new value.
+
+        Several writes to the same param and address are coalesced, so only the last value is sent.
+        Writes of a value equal to the last value read or written via this api are skipped. This does not depend
+        on param_cache_ttl; the last values are kept until the connection is restored or the RCC was reset.
+        A change made outside of this api (e.g. on the RCC itself) is not noticed, so request the value first
+        when that matters.
+        The remaining writes are pipelined, up to request_window at the same time.
+
+        Returns one item per written param and address, in the order of the last write to each.
+        The item has the written value on success, or an error set if the write failed.
+        If not connected, all returned values have an error set.
+        Throws
+            XcomParamException
+        """
+        # Sanity check
+        for item in update_data.items:
+            if item.datapoint.target != XcomTarget.STANDARD or item.datapoint.category != XcomCategory.PARAMETER or item.address is None:
+                raise XcomParamException(f"Invalid XcomValuesItem passed to update_values; must be a STANDARD PARAMETER with an address. Violated by '{item.datapoint.name}' ({item.datapoint.nr}), code='{item.code}'")
+            if item.value is None:
+                raise XcomParamException(f"Invalid XcomValuesItem passed to update_values; must have a value. Violated by '{item.datapoint.name}' ({item.datapoint.nr}), code='{item.code}'")
+
+        # Coalesce writes to the same param and address; the last one wins
+        req_updates: dict[tuple, XcomValuesItem] = {}
+        for item in update_data.items:
+            key = (item.datapoint.nr, item.address)
+            req_updates.pop(key, None)
+            req_updates[key] = item
+
+        # Fail fast when the connection is down; do not wait for the timeouts of each individual request
+        if not self._check_connection():
+            return XcomValues([XcomValuesItem.from_resolved(i.datapoint, i.code, i.address, i.aggregation_type, value=None, error="Not connected to Xcom client") for i in req_updates.values()])
+
+        # Skip writes that would not change anything; compare the packed values so float rounding does not matter
+        result_items: dict[tuple, XcomValuesItem] = {}
+        req_writes: list[XcomValuesItem] = []
+        for key, item in req_updates.items():
+            found, value = self._param_last.get(item.datapoint.nr, item.address)
+            if found and XcomData.pack(value, item.datapoint.format) == XcomData.pack(item.value, item.datapoint.format):
+                result_items[key] = XcomValuesItem.from_resolved(item.datapoint, item.code, item.address, item.aggregation_type, value=item.value)
+            else:
+                result_items[key] = None
+                req_writes.append(item)
+
+        # Perform the remaining writes; when the request window allows it, several are in flight at the same time
+        self._pace_burst()
+
+        for idx in range(0, len(req_writes), self._request_window):
+            with concurrent.futures.ThreadPoolExecutor() as executor:
+                tasks = [executor.submit(self._update_values_single, req_write, retries=retries, timeout=timeout, verbose=verbose) for req_write in req_writes[idx:idx+self._request_window]]
+
+            for task in tasks:
+                rsp_item = task.result()
+                result_items[(rsp_item.datapoint.nr, rsp_item.address)] = rsp_item
+
+            self._pace_burst()
+
+        return XcomValues(list(result_items.values()))
+
+
+    def _update_values_single(self, req_update: XcomValuesItem, retries = None, timeout = None, verbose=False) -> XcomValuesItem:
+        """
+        Helper for update_values to perform one single update_value request.
+        Never throws; any error is returned in the response item.
+        """
+        try:
+            error = None
+            value = req_update.value
+            if not self.update_value(req_update.datapoint, req_update.value, req_update.address, retries=retries, timeout=timeout, verbose=verbose):
+                value = None
+                error = "Failed to update value"
+
+        except Exception as ex:
+            value = None
+            error = str(ex)
+
+        if error is not None:
+            _LOGGER.debug(f"Failed to update param {req_update.datapoint.nr}:{req_update.address}; {error}")
+
+        return XcomValuesItem.from_resolved(req_update.datapoint, req_update.code, req_update.address, req_update.aggregation_type, value=value, error=error)
+
+
     def request_message(self, index:int = 0, retries = None, timeout = None, verbose=False) -> XcomMessage:
         """
         Request a Message from the RCC.
@@ -568,34 +833,57 @@ class XcomApiBase:
     
         # Sometimes the Xcom client does not seem to pickup a request
         # so retry if needed
-        if not self._connected:
+        if not self._check_connection():
             _LOGGER.warning(f"_sendRequest - not connected")
             return None
         
+        # Fail fast when the same request recently got a permanent error response
+        negative_key = self._get_negative_key(request)
+        error = self._get_negative(negative_key)
+        if error is not None:
+            self._diag_negative_hits += 1
+            raise XcomApiResponseIsError(error)
+
         last_exception = None
         retries = retries or REQ_RETRIES
         timeout = timeout or REQ_TIMEOUT
 
         for retry in range(retries):
-            try:
-                with self._sendRequestLock:
-                    ts_start = datetime.now()
+            # No use retrying once the connection was lost
+            if retry > 0 and not self._connected:
+                break
 
-                    response = self._send_request_inner(request, timeout=timeout, verbose=verbose)
+            try:
+                # Each attempt gets its own deadline, that includes any wait for other requests in flight
+                ts_start = time.monotonic()
+                deadline = ts_start + timeout
 
-                    # Update diagnostics
-                    ts_end = datetime.now()
-                    self._add_diagnostics(retries = retry, duration = ts_end-ts_start)
+                response = self._send_request_inner(request, verbose=verbose, deadline=deadline)
 
-                    # Check the response
-                    if response is None:
-                        return None
+                # Update diagnostics
+                ts_end = time.monotonic()
+                self._add_diagnostics(retries = retry, duration = timedelta(seconds=ts_end-ts_start))
 
-                    if response.is_error():
-                        raise XcomApiResponseIsError(response.get_error())
-                    
-                    # Success
-                    return response
+                # Check the response
+                if response is None:
+                    return None
+
+                if response.is_error():
+                    error = response.get_error()
+                    error_code = response.get_error_code()
+                    if error_code in SCOM_ERRORS_PERMANENT:
+                        # No use retrying; remember it so the next requests for the same object fail fast.
+                        # For multi-info, only remember that the Xcom client does not support it at all;
+                        # other errors are about the items in this one request (e.g. an absent device).
+                        if request.frame_data.service_data.object_type != ScomObjType.MULTI_INFO or error_code in SCOM_ERRORS_UNSUPPORTED:
+                            self._negative[negative_key] = (time.monotonic() + REQ_NEGATIVE_TTL, error)
+                        last_exception = XcomApiResponseIsError(error)
+                        break
+
+                    raise XcomApiResponseIsError(error)
+                
+                # Success
+                return response
                         
             except Exception as e:
                 last_exception = e
@@ -607,66 +895,309 @@ class XcomApiBase:
             raise last_exception from None
 
 
-    def _send_request_inner(self, request: XcomPackage, retries = None, timeout = None, verbose=False):
+    def _send_request_inner(self, request: XcomPackage, retries = None, timeout = None, verbose=False, deadline: float|None = None):
         """
-        Send a request package to the Xcom client and wait for the correct response package
+        Send a request package to the Xcom client and wait for the correct response package.
+
+        Up to request_window requests can be in flight at the same time. Whichever request holds 
+        the receive lock reads the next package and routes it to the pending request it answers.
+
+        The request must complete before the deadline on the monotonic clock; if none is given it is 
+        derived from the timeout. Waiting for a free slot in the request window and for the send and 
+        receive locks counts as well, so a request never waits longer than its timeout, whatever 
+        happens in the layers below or in other requests in flight.
         """
+        # We implement our own deadline mechanism that is robust when converted from 
+        # async to sync via unasyncd tool, and immune to changes of the wall clock
+        if deadline is None:
+            deadline = time.monotonic() + (timeout or REQ_TIMEOUT)
 
-        # Send the request package to the Xcom client
+        # Register the request as pending before it is sent, so the response cannot be missed
+        pending = self._add_pending(request)
         try:
-            if verbose:
-                data = request.get_bytes()
-                _LOGGER.debug(f"send {len(data)} bytes ({binascii.hexlify(data).decode('ascii')}), decoded: {request}")
+            window = self._sendWindow
+            if not acquire_until(window, deadline):
+                raise XcomApiTimeoutException("Timeout while waiting for a free slot in the request window") from None
 
-            self._send_package(request)
+            try:
+                # Send the request package to the Xcom client
+                if not acquire_until(self._sendLock, deadline):
+                    raise XcomApiTimeoutException("Timeout while waiting to send request package to Xcom client") from None
 
-        except Exception as e:
-            msg = f"Exception while sending request package to Xcom client: {e}"
-            raise XcomApiWriteException(msg) from None
+                try:
+                    if verbose:
+                        data = request.get_bytes()
+                        _LOGGER.debug(f"send {len(data)} bytes ({binascii.hexlify(data).decode('ascii')}), decoded: {request}")
 
-        # Receive packages until we get the one we expect
-        # We implement our own primitive timeout mechanism that
-        # is robust when converted from async to sync via unasyncd tool
-        ts_end = datetime.now() + timedelta(seconds=timeout)
+                    self._send_package(request)
 
-        while datetime.now() < ts_end:
-            try:
-                response = self._receive_package()
-                
-                if response is None:
-                    continue
+                except Exception as e:
+                    msg = f"Exception while sending request package to Xcom client: {e}"
+                    raise XcomApiWriteException(msg) from None
 
-                # Remember most recent received frame flags, used for various status flags
-                if response.is_response():
-                    self._latest_frame_flags = response.header.frame_flags
+                finally:
+                    self._sendLock.release()
 
-                # Does this response match our request
-                if response.is_response() and \
-                    response.frame_data.service_id == request.frame_data.service_id and \
-                    response.frame_data.service_data.object_id == request.frame_data.service_data.object_id and \
-                    response.frame_data.service_data.property_id == request.frame_data.service_data.property_id:
+                # Receive packages until we get the one we expect, or until the deadline has passed.
+                while pending.response is None and time.monotonic() < deadline:
+                    # Fail fast when the connection was lost while waiting, instead of waiting for the timeout
+                    if not self._connected:
+                        raise XcomApiReadException("Connection to Xcom client was lost")
 
-                    # Yes, this is the answer to our request
-                    if verbose:
-                        data = response.get_bytes()
-                        _LOGGER.debug(f"recv {len(data)} bytes ({binascii.hexlify(data).decode('ascii')}), decoded: {response}")
+                    if not acquire_until(self._receiveLock, deadline):
+                        break
 
-                    return response
-                else:
-                    # No, not an answer to our request, continue loop for next answer (or timeout)
-                    if verbose:
-                        data = response.get_bytes()
-                        _LOGGER.debug(f"skip {len(data)} bytes ({binascii.hexlify(data).decode('ascii')}), decoded: {response}")
+                    try:
+                        # Another request may have received our response while we waited for the lock
+                        if pending.response is not None:
+                            break
 
-            except Exception as e:
-                msg = f"Exception while listening for response package from Xcom client: {e}"
-                raise XcomApiReadException() from None
+                        response = self._receive_package(deadline=deadline)
+
+                    except Exception as e:
+                        msg = f"Exception while listening for response package from Xcom client: {e}"
+                        raise XcomApiReadException(msg) from None
+
+                    finally:
+                        self._receiveLock.release()
+
+                    if response is not None:
+                        self._dispatch_package(response, verbose=verbose)
+
+            finally:
+                window.release()
+
+        finally:
+            self._remove_pending(pending)
+
+        if pending.response is not None:
+            # This is the answer to our request
+            if verbose:
+                data = pending.response.get_bytes()
+                _LOGGER.debug(f"recv {len(data)} bytes ({binascii.hexlify(data).decode('ascii')}), decoded: {pending.response}")
+
+            return pending.response
 
         # If we reach this point then there was a timeout
         msg = f"Timeout while listening for response package from Xcom client"
         raise XcomApiTimeoutException(msg) from None
 
 
+    @staticmethod
+    def _get_negative_key(package: XcomPackage) -> tuple:
+        """
+        Key used to remember a permanent error response to a request.
+        For multi-info requests the property_id holds the request id, so it is left out;
+        only errors meaning the Xcom client does not support multi-info at all are remembered for these.
+        """
+        service_data = package.frame_data.service_data
+        if service_data.object_type == ScomObjType.MULTI_INFO:
+            return (package.header.dst_addr, service_data.object_type, service_data.object_id, None)
+
+        return (package.header.dst_addr, service_data.object_type, service_data.object_id, service_data.property_id)
+
+
+    def _get_negative(self, key: tuple) -> str|None:
+        """
+        Returns the remembered error for the key, or None if there is none or it has expired
+        """
+        entry = self._negative.get(key, None)
+        if entry is None:
+            return None
+
+        expires, error = entry
+        if time.monotonic() >= expires:
+            self._negative.pop(key, None)
+            return None
+
+        return error
+
+
+    def _is_multi_info_supported(self) -> bool:
+        """
+        False while the Xcom client is known to not support multi-info requests (firmware older than 1.6.74)
+        """
+        return self._get_negative((ScomAddress.RCC, ScomObjType.MULTI_INFO, ScomObjId.MULTI_INFO, None)) is None
+
+
+    def clear_negative_cache(self):
+        """
+        Forget all remembered error responses, so all requests are sent to the Xcom client again.
+        Entries also expire by themselves after REQ_NEGATIVE_TTL seconds.
+        """
+        self._negative.clear()
+
+
+    @staticmethod
+    def _get_request_key(package: XcomPackage) -> tuple:
+        """
+        Key used to match a response package to its request package.
+        A request is addressed to dst_addr and answered by that same device as src_addr.
+        For multi-info requests the property_id holds the request id.
+        """
+        return (
+            package.header.src_addr if package.is_response() else package.header.dst_addr,
+            package.frame_data.service_id,
+            package.frame_data.service_data.object_id,
+            package.frame_data.service_data.property_id,
+        )
+
+
+    def _add_pending(self, request: XcomPackage) -> XcomPendingRequest:
+        pending = XcomPendingRequest(self._get_request_key(request))
+        with self._pendingLock:
+            self._pending.setdefault(pending.key, []).append(pending)
+        return pending
+
+
+    def _remove_pending(self, pending: XcomPendingRequest):
+        with self._pendingLock:
+            queue = self._pending.get(pending.key, [])
+            if pending in queue:
+                queue.remove(pending)
+            if not queue:
+                self._pending.pop(pending.key, None)
+
+
+    def _dispatch_package(self, response: XcomPackage, verbose=False) -> bool:
+        """
+        Route a received package to the pending request it is the answer to.
+        When several pending requests have the same key, the oldest one gets the response.
+        Returns False if no pending request was found for the package.
+        """
+        if response.is_response():
+            # A reset of the RCC may have changed params; drop all cached values once the flag gets set
+            if response.header.frame_flags & ScomFrameFlag.WAS_RCC_RESETED and not self.was_rcc_reseted:
+                self._param_cache.invalidate()
+                self._param_last.invalidate()
+
+            # Remember most recent received frame flags, used for various status flags
+            self._latest_frame_flags = response.header.frame_flags
+
+            with self._pendingLock:
+                queue = self._pending.get(self._get_request_key(response), [])
+                pending = next((p for p in queue if p.response is None), None)
+                if pending is not None:
+                    pending.response = response
+                    return True
+
+        # Not an answer to any of our requests
+        self._diag_skipped += 1
+        if verbose:
+            data = response.get_bytes()
+            _LOGGER.debug(f"skip {len(data)} bytes ({binascii.hexlify(data).decode('ascii')}), decoded: {response}")
+
+        return False
+
+
+    def _check_connection(self) -> bool:
+        """
+        Returns whether we are connected.
+        Derived classes can override this to detect a connection that was closed while we were idle.
+        """
+        return self._connected
+
+
+    def _connection_lost(self, reason: str):
+        """
+        Called by derived classes as soon as they detect that the connection was closed or reset.
+        Marks the connection down, so pending and new requests fail fast instead of waiting for their timeouts.
+        """
+        if not self._connected:
+            return
+
+        _LOGGER.warning(f"Connection to Xcom client lost: {reason}")
+        self._connected = False
+        self._diag_disconnects += 1
+
+        self._on_connection_lost()
+
+
+    def _on_connection_lost(self):
+        """
+        Called after the connection was lost.
+        Derived classes that support reconnecting override this to start _reconnect_loop in the background.
+        """
+        pass
+
+
+    def _connection_restored(self):
+        """
+        Called by derived classes once the connection is up again after it was lost.
+        """
+        _LOGGER.info(f"Connection to Xcom client restored")
+        self._connected = True
+        self._diag_reconnects += 1
+
+        # Values may have changed during the outage; make sure subscribers get the current ones
+        self._subscriptions.reset()
+
+        # The gateway or its devices may have changed as well; do not rely on old error responses or param values
+        self.clear_negative_cache()
+        self._param_cache.invalidate()
+        self._param_last.invalidate()
+
+
+    def _reconnect_loop(self, generation: int):
+        """
+        Keep trying to reconnect, with an increasing wait in between attempts, until connected or stopped.
+        Derived classes pass the current _reconnect_generation when they start the loop; once _stop_reconnect
+        was called, the loop ends without touching the state of a loop started after it.
+        """
+        if generation != self._reconnect_generation:
+            return
+
+        self._reconnecting = True
+        delay = RECONNECT_DELAY_MIN
+        try:
+            while generation == self._reconnect_generation and not self._connected:
+                self._reconnect_wait(delay)
+                if generation != self._reconnect_generation:
+                    break
+
+                try:
+                    if self._reconnect():
+                        if generation != self._reconnect_generation:
+                            break
+
+                        self._connection_restored()
+                        break
+
+                except Exception as e:
+                    _LOGGER.debug(f"Reconnect to Xcom client failed: {e}")
+
+                delay = min(delay * 2, RECONNECT_DELAY_MAX)
+                _LOGGER.info(f"Reconnect to Xcom client failed; next attempt in {delay} seconds")
+        finally:
+            if generation == self._reconnect_generation:
+                self._reconnecting = False
+
+
+    def _stop_reconnect(self):
+        """
+        Make a running _reconnect_loop end; called by derived classes when they are stopped
+        """
+        self._reconnect_generation += 1
+        self._reconnecting = False
+
+
+    def _reconnect_wait(self, delay: float):
+        """
+        Wait in between reconnect attempts.
+        Derived classes can override this to return early when they are stopped.
+        """
+        time.sleep(delay)
+
+
+    def _reconnect(self) -> bool:
+        """
+        Attempt to re-establish the connection. Returns True on success.
+
+        Must be implemented in derived classes that support reconnecting.
+        """
+        raise NotImplementedError()
+
+
     def _send_package(self, package: XcomPackage):
         """
         Send an Xcom package.
@@ -677,10 +1208,10 @@ class XcomApiBase:
         raise NotImplementedError()
     
 
-    def _receive_package(self) -> XcomPackage | None:
+    def _receive_package(self, deadline: float|None = None) -> XcomPackage | None:
         """
         Attempt to receive an Xcom package. 
-        Return None of nothing was received within REQ_TIMEOUT.
+        Return None of nothing was received before the deadline (time.monotonic), or within REQ_TIMEOUT if no deadline is given.
         Exception handling is dealed with by the caller.
         
         Must be implemented in derived classes.
@@ -709,10 +1240,34 @@ class XcomApiBase:
 
 
     def get_diagnostics(self):
+        with self._pendingLock:
+            pending = sum(len(queue) for queue in self._pending.values())
+
         return {
             "statistics": {
                 "retries": dict(sorted(self._diag_retries.items())),
                 "durations": dict(sorted(self._diag_durations.items())),
-            }
+                "skipped": self._diag_skipped,
+            },
+            "connection": {
+                "connected": self._connected,
+                "disconnects": self._diag_disconnects,
+                "reconnects": self._diag_reconnects,
+            },
+            "pipeline": {
+                "window": self._request_window,
+                "pending": pending,
+            },
+            "negative_cache": {
+                "entries": len(self._negative),
+                "hits": self._diag_negative_hits,
+                "multi_info_supported": self._is_multi_info_supported(),
+            },
+            "param_cache": {
+                "entries": len(self._param_cache),
+                "hits": self._param_cache.hits,
+                "misses": self._param_cache.misses,
+                "last_values": len(self._param_last),
+            },
         }
 
@@ -9,6 +9,8 @@ import asyncio
 import binascii
 import logging
 import socket
+import threading
+import time
 import serial
 import serial_asyncio
 
@@ -25,7 +27,10 @@ from .api_base_sync import (
 )
 from .const import (
     START_TIMEOUT,
+    STOP_TIMEOUT,
     REQ_TIMEOUT,
+    deadline_remaining,
+    RECV_SIZE,
 )
 from .factory_async import (
     AsyncXcomFactory,
@@ -34,6 +39,7 @@ from .factory_sync import (
     XcomFactory,
 )
 from .protocol import (
+    XcomFramer,
     XcomPackage,
 )
 
@@ -55,9 +61,10 @@ SERIAL_TERMINATOR = b'\x0D\x0A' # from Studer Xcom documentation
 ##
 class AsyncXcomApiSerial(AsyncXcomApiBase):
 
-    def __init__(self, port=DEFAULT_PORT, baudrate=DEFAULT_BAUDRATE):
+    def __init__(self, port=DEFAULT_PORT, baudrate=DEFAULT_BAUDRATE, auto_reconnect=True):
         """
         Initialize a new XcomApiSerial object.
+        With auto_reconnect, the serial port is re-opened in the background when it was lost (e.g. usb adapter unplugged).
         """
         super().__init__()
 
@@ -66,7 +73,11 @@ class AsyncXcomApiSerial(AsyncXcomApiBase):
 
         self._reader = None
         self._writer = None
+        self._framer = XcomFramer()
         self._connected = False
+        self._started = False
+        self._auto_reconnect = auto_reconnect
+        self._reconnect_task: asyncio.Task = None
 
 
     async def start(self, timeout=START_TIMEOUT) -> bool:
@@ -76,14 +87,8 @@ class AsyncXcomApiSerial(AsyncXcomApiBase):
         if not self._connected:
             _LOGGER.info(f"Xcom-232i serial connection start via {self.port}")
 
-            # Open serial connection.
-            self._reader, self._writer = await serial_asyncio.open_serial_connection(
-                url = self.port, 
-                baudrate = self.baudrate,
-                bytesize = DEFAULT_DATA_BITS,
-                stopbits = DEFAULT_STOP_BITS,
-                parity = DEFAULT_PARITY
-            )
+            await self._open()
+            self._started = True
             self._connected = True
         else:
             _LOGGER.info(f"Xcom-232i serial connection already connected to {self.port}")
@@ -91,10 +96,32 @@ class AsyncXcomApiSerial(AsyncXcomApiBase):
         return True
 
 
+    async def _open(self):
+        """
+        Open the serial connection
+        """
+        self._reader, self._writer = await serial_asyncio.open_serial_connection(
+            url = self.port, 
+            baudrate = self.baudrate,
+            bytesize = DEFAULT_DATA_BITS,
+            stopbits = DEFAULT_STOP_BITS,
+            parity = DEFAULT_PARITY
+        )
+        self._framer.reset()
+
+
     async def stop(self):
         """
         Stop listening to the the Xcom Client and stop the Xcom Server.
         """
+        # Stop reconnecting (if we were) and wait until the reconnect task has ended
+        self._started = False
+        self._stop_reconnect()
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+            await asyncio.wait([self._reconnect_task], timeout=STOP_TIMEOUT)
+            self._reconnect_task = None
+
         if not self._connected:
             return
         
@@ -116,31 +143,77 @@ class AsyncXcomApiSerial(AsyncXcomApiBase):
         _LOGGER.info(f"Stopped Xcom-232i serial Connection")
     
 
+    def _on_connection_lost(self):
+        """
+        Start re-opening the serial port in the background
+        """
+        if self._auto_reconnect and self._started:
+            if self._reconnect_task is None or self._reconnect_task.done():
+                self._reconnect_task = asyncio.create_task(self._reconnect_loop(self._reconnect_generation), name="XcomApiSerialReconnect")
+
+
+    async def _reconnect(self) -> bool:
+        """
+        Re-open the serial port
+        """
+        try:
+            if self._writer:
+                self._writer.close()
+        except Exception:
+            pass
+
+        _LOGGER.info(f"Xcom-232i serial connection reopen via {self.port}")
+        await self._open()
+
+        if not self._started:
+            # Stopped while re-opening; do not leave the port open
+            self._writer.close()
+            return False
+
+        return True
+
+
     async def _send_package(self, package: XcomPackage):
         """
         Send an Xcom package.
         Exception handling is dealed with by the caller
         """
-        data = package.get_bytes()
+        try:
+            data = package.get_bytes()
+            self._writer.write(data)
+            await self._writer.drain()
 
-        self._writer.write(data)
-        await self._writer.drain()
+        except OSError as e:
+            self._connection_lost(str(e))
+            raise
     
 
-    async def _receive_package(self) -> XcomPackage | None:
+    async def _receive_package(self, deadline: float|None = None) -> XcomPackage | None:
         """
         Attempt to receive an Xcom package. 
-        Return None of nothing was received within REQ_TIMEOUT
+        Return None of nothing was received before the deadline (time.monotonic), or within REQ_TIMEOUT if no deadline is given
         Exception handling is dealed with by the caller
         """
         try:
-            async with asyncio.timeout(REQ_TIMEOUT):
-                return await AsyncXcomFactory.parse_package(self._reader)
+            async with asyncio.timeout(deadline_remaining(deadline)):
+                # One read can hold several packages, or only part of one; the framer sorts that out
+                while (package := self._framer.get_package()) is None:
+                    data = await self._reader.read(RECV_SIZE)
+                    if not data:
+                        self._connection_lost("Serial connection closed")
+                        raise XcomApiReadException("Serial connection closed")
+
+                    self._framer.feed(data)
+
+                return package
         
         except asyncio.exceptions.TimeoutError:
             return None
         except asyncio.exceptions.CancelledError:
             return None
+        except OSError as e:
+            self._connection_lost(str(e))
+            raise
 
 
 ##
@@ -148,9 +221,10 @@ class AsyncXcomApiSerial(AsyncXcomApiBase):
 ##
 class XcomApiSerial(XcomApiBase):
 
-    def __init__(self, port=DEFAULT_PORT, baudrate=DEFAULT_BAUDRATE):
+    def __init__(self, port=DEFAULT_PORT, baudrate=DEFAULT_BAUDRATE, auto_reconnect=True):
         """
         Initialize a new XcomApiSerial object.
+        With auto_reconnect, the serial port is re-opened in a background thread when it was lost (e.g. usb adapter unplugged).
         """
         super().__init__()
 
@@ -158,25 +232,25 @@ class XcomApiSerial(XcomApiBase):
         self.baudrate: int = baudrate
 
         self._serial: serial.Serial = None
+        self._framer = XcomFramer()
         self._connected: bool = False
+        self._started: bool = False
+        self._auto_reconnect: bool = auto_reconnect
+        self._reconnect_thread: threading.Thread = None
+        self._reconnect_stop = threading.Event()    # set on stop, to wake up the reconnect thread
 
 
     def start(self, timeout=START_TIMEOUT) -> bool:
         """
         Start the serial connection to the Xcom-232i client.
         """
+        self._reconnect_stop.clear()
+
         if not self._connected:
             _LOGGER.info(f"Xcom-232i serial connection start via {self.port}")
 
-            # Open serial connection.
-            self._serial = serial.Serial(
-                port = self.port, 
-                baudrate = self.baudrate,
-                bytesize = DEFAULT_DATA_BITS,
-                stopbits = DEFAULT_STOP_BITS,
-                parity = DEFAULT_PARITY,
-                timeout = REQ_TIMEOUT
-            )
+            self._open()
+            self._started = True
             self._connected = True
         else:
             _LOGGER.info(f"Xcom-232i serial connection already connected to {self.port}")
@@ -184,10 +258,33 @@ class XcomApiSerial(XcomApiBase):
         return True
 
 
+    def _open(self):
+        """
+        Open the serial connection
+        """
+        self._serial = serial.Serial(
+            port = self.port, 
+            baudrate = self.baudrate,
+            bytesize = DEFAULT_DATA_BITS,
+            stopbits = DEFAULT_STOP_BITS,
+            parity = DEFAULT_PARITY,
+            timeout = REQ_TIMEOUT
+        )
+        self._framer.reset()
+
+
     def stop(self):
         """
         Stop listening to the the Xcom Client and stop the Xcom Server.
         """
+        # Stop reconnecting (if we were); wake up the reconnect thread and wait until it has ended
+        self._started = False
+        self._stop_reconnect()
+        self._reconnect_stop.set()
+        if self._reconnect_thread is not None and self._reconnect_thread is not threading.current_thread():
+            self._reconnect_thread.join(STOP_TIMEOUT)
+        self._reconnect_thread = None
+
         if not self._connected:
             return
         
@@ -206,26 +303,87 @@ class XcomApiSerial(XcomApiBase):
         _LOGGER.info(f"Stopped Xcom-232i serial Connection")
     
 
+    def _on_connection_lost(self):
+        """
+        Start re-opening the serial port in a background thread
+        """
+        if self._auto_reconnect and self._started:
+            if self._reconnect_thread is None or not self._reconnect_thread.is_alive():
+                self._reconnect_thread = threading.Thread(target=self._reconnect_loop, args=(self._reconnect_generation,), name="XcomApiSerialReconnect", daemon=True)
+                self._reconnect_thread.start()
+
+
+    def _reconnect_wait(self, delay: float):
+        """
+        Wait in between reconnect attempts; returns early when stopped
+        """
+        self._reconnect_stop.wait(delay)
+
+
+    def _reconnect(self) -> bool:
+        """
+        Re-open the serial port
+        """
+        try:
+            if self._serial and self._serial.is_open:
+                self._serial.close()
+        except Exception:
+            pass
+
+        _LOGGER.info(f"Xcom-232i serial connection reopen via {self.port}")
+        self._open()
+
+        if not self._started:
+            # Stopped while re-opening; do not leave the port open
+            self._serial.close()
+            return False
+
+        return True
+
+
     def _send_package(self, package: XcomPackage):
         """
         Send an Xcom package.
         Exception handling is dealed with by the caller
         """
-        data = package.get_bytes()
+        try:
+            data = package.get_bytes()
+            self._serial.write(data)
 
-        self._serial.write(data)
+        except OSError as e:
+            self._connection_lost(str(e))
+            raise
     
 
-    def _receive_package(self) -> XcomPackage | None:
+    def _receive_package(self, deadline: float|None = None) -> XcomPackage | None:
         """
         Attempt to receive an Xcom package. 
-        Return None of nothing was received within REQ_TIMEOUT
+        Return None of nothing was received before the deadline (time.monotonic), or within REQ_TIMEOUT if no deadline is given
         Exception handling is dealed with by the caller
         """
         try:
-            return XcomFactory.parse_package(self._serial, REQ_TIMEOUT)
+            # Read whatever is waiting (at least one byte, blocking until the deadline); the framer sorts out the packages
+            if deadline is None:
+                deadline = time.monotonic() + REQ_TIMEOUT
+
+            while (package := self._framer.get_package()) is None:
+                remaining = deadline_remaining(deadline)
+                if remaining <= 0:
+                    return None
+
+                self._serial.timeout = remaining
+                data = self._serial.read(min(max(self._serial.in_waiting, 1), RECV_SIZE))
+                if not data:
+                    return None
+
+                self._framer.feed(data)
+
+            return package
 
         except socket.timeout:
             return None
+        except OSError as e:
+            self._connection_lost(str(e))
+            raise
 
  
\ No newline at end of file
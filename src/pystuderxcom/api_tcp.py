@@ -3,11 +3,13 @@
 import asyncio
 import binascii
 import logging
+import select
 import socket
 
 from datetime import datetime, timedelta
 import threading
-from typing import Iterable
+import time
+from typing import Any, Callable, Iterable
 
 
 from .api_base_async import (
@@ -25,6 +27,8 @@ from .const import (
     START_TIMEOUT,
     STOP_TIMEOUT,
     REQ_TIMEOUT,
+    deadline_remaining,
+    RECV_SIZE,
     XcomApiTcpMode,
     XcomLevel,
     XcomFormat,
@@ -56,6 +60,7 @@ from .messages import (
     XcomMessage,
 )
 from .protocol import (
+    XcomFramer,
     XcomPackage,
 )
 from .values import (
@@ -68,14 +73,75 @@ _LOGGER = logging.getLogger(__name__)
 
 
 DEFAULT_PORT = 4001
+DEFAULT_BACKLOG = 16    # max number of not yet accepted gateway connections on a multi-client server
+
+
+##
+## Stream I/O shared by AsyncXcomApiTcp and AsyncXcomApiTcpSession
+##
+class _AsyncXcomApiTcpStream(AsyncXcomApiBase):
+    """
+    Sends and receives Xcom packages over an asyncio stream.
+    Derived classes set self._reader, self._writer and self._framer once connected.
+    """
+
+    def _check_connection(self) -> bool:
+        """
+        Returns whether we are connected; detects a connection that was closed by the remote while we were idle
+        """
+        if self._connected and self._reader is not None and self._reader.at_eof():
+            self._connection_lost("Connection closed by remote")
+
+        return self._connected
+
+
+    async def _send_package(self, package: XcomPackage):
+        """
+        Send an Xcom package.
+        Exception handling is dealed with by the caller
+        """
+        if self._writer.is_closing():
+            self._connection_lost("Connection closed")
+            raise XcomApiWriteException("Connection closed")
+
+        self._writer.write(package.get_bytes())
+    
+
+    async def _receive_package(self, deadline: float|None = None) -> XcomPackage | None:
+        """
+        Attempt to receive an Xcom package. 
+        Return None of nothing was received before the deadline (time.monotonic), or within REQ_TIMEOUT if no deadline is given
+        Exception handling is dealed with by the caller
+        """
+        try:
+            async with asyncio.timeout(deadline_remaining(deadline)):
+                # One read can hold several packages, or only part of one; the framer sorts that out
+                while (package := self._framer.get_package()) is None:
+                    data = await self._reader.read(RECV_SIZE)
+                    if not data:
+                        self._connection_lost("Connection closed by remote")
+                        raise XcomApiReadException("Connection closed by remote")
+                    
+                    self._framer.feed(data)
+
+                return package
+        
+        except asyncio.exceptions.TimeoutError:
+            return None
+        except asyncio.exceptions.CancelledError:
+            return None
+        except ConnectionError as e:
+            self._connection_lost(str(e))
+            raise
+
 
 
 ##
 ## Class implementing Xcom-LAN TCP network protocol
 ##
-class AsyncXcomApiTcp(AsyncXcomApiBase):
+class AsyncXcomApiTcp(_AsyncXcomApiTcpStream):
 
-    def __init__(self, mode:XcomApiTcpMode=XcomApiTcpMode.SERVER, listen_port=DEFAULT_PORT, remote_ip:str=None, remote_port:int=None):
+    def __init__(self, mode:XcomApiTcpMode=XcomApiTcpMode.SERVER, listen_port=DEFAULT_PORT, remote_ip:str=None, remote_port:int=None, auto_reconnect:bool=True):
         """
         Usage: AsyncXcomApiTcp(mode=XcomApiTcpMode.SERVER, listen_port=port)
         or:    AsyncXcomApiTcp(mode=XcomApiTcpMode.CLIENT, remote_ip=ip, remote_port=port)
@@ -84,6 +150,8 @@ class AsyncXcomApiTcp(AsyncXcomApiBase):
         In Client mode, MOXA needs to be running as TCP Server and will listen for a connection from the TCP client we are creating here.
 
         In both cases, once connected we can send package requests.
+        When the connection is lost, requests fail immediately until it is restored. With auto_reconnect,
+        Client mode reconnects in the background; Server mode always accepts the next connection from the MOXA.
         """
         super().__init__()
 
@@ -108,8 +176,11 @@ class AsyncXcomApiTcp(AsyncXcomApiBase):
         self._connection: socket.socket = None
         self._reader: asyncio.StreamReader = None
         self._writer: asyncio.StreamWriter = None
+        self._framer = XcomFramer()
         self._started: bool = False
         self._connected: bool = False
+        self._auto_reconnect: bool = auto_reconnect
+        self._reconnect_task: asyncio.Task = None
 
 
     async def start(self, timeout=START_TIMEOUT, wait_for_connect=True) -> bool:
@@ -129,6 +200,7 @@ class AsyncXcomApiTcp(AsyncXcomApiBase):
             _LOGGER.info(f"Xcom TCP client connect to {self._remote_ip}:{self._remote_port}")
 
             self._reader, self._writer = await asyncio.open_connection(self._remote_ip, self._remote_port, limit=1000, family=socket.AF_INET)
+            self._framer.reset()
 
             _LOGGER.info(f"Connected to Xcom server '{self._remote_ip}'")
             self._started = True
@@ -163,15 +235,29 @@ class AsyncXcomApiTcp(AsyncXcomApiBase):
         """
         Callback called once the Xcom Client connects to our Server
         """
+        if not self._started:
+            # Stopped in the meantime; do not leave the new connection open
+            writer.close()
+            return
+
+        previous = self._writer
+        
         self._reader = reader
         self._writer = writer
-        self._connected = True
+        self._framer.reset()
 
         # Gather some info about remote server
         (self._remote_ip,_) = self._writer.get_extra_info("peername")
 
         _LOGGER.info(f"Connected to Xcom client '{self._remote_ip}'")
 
+        if previous is None:
+            self._connected = True
+        else:
+            # The Xcom client reconnected; the previous connection is of no use anymore
+            previous.close()
+            self._connection_restored()
+
 
     async def stop(self):
         """
@@ -182,6 +268,15 @@ class AsyncXcomApiTcp(AsyncXcomApiBase):
             case XcomApiTcpMode.CLIENT: name = "Xcom TCP client"
 
         _LOGGER.info(f"Stopping {name}")
+
+        # Stop reconnecting (if we were) and wait until the reconnect task has ended
+        self._started = False
+        self._stop_reconnect()
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+            await asyncio.wait([self._reconnect_task], timeout=STOP_TIMEOUT)
+            self._reconnect_task = None
+
         try:
             self._connected = False
 
@@ -206,40 +301,326 @@ class AsyncXcomApiTcp(AsyncXcomApiBase):
             _LOGGER.warning(f"Exception during closing of Xcom server: {e}")
 
         self._started = False
+        self._writer = None
+        self._reader = None
         _LOGGER.info(f"Stopped {name}")
-    
 
-    async def _send_package(self, package: XcomPackage):
+
+    def _on_connection_lost(self):
+        """
+        In Client mode, start reconnecting in the background.
+        In Server mode nothing needs to be done; the next connection from the Xcom client is accepted automatically.
+        """
+        if self._auto_reconnect and self._started and self._mode == XcomApiTcpMode.CLIENT:
+            if self._reconnect_task is None or self._reconnect_task.done():
+                self._reconnect_task = asyncio.create_task(self._reconnect_loop(self._reconnect_generation), name="XcomApiTcpReconnect")
+
+
+    async def _reconnect(self) -> bool:
+        """
+        Re-establish the connection to the Xcom server (Client mode only)
+        """
+        if self._writer:
+            self._writer.close()
+
+        _LOGGER.info(f"Xcom TCP client reconnect to {self._remote_ip}:{self._remote_port}")
+
+        reader, writer = await asyncio.open_connection(self._remote_ip, self._remote_port, limit=1000, family=socket.AF_INET)
+        if not self._started:
+            # Stopped while connecting; do not leave the new connection open
+            writer.close()
+            return False
+
+        self._reader, self._writer = reader, writer
+        self._framer.reset()
+        return True
+
+
+
+##
+## Class implementing one Xcom-LAN gateway connected to an AsyncXcomApiTcpServer
+##
+class AsyncXcomApiTcpSession(_AsyncXcomApiTcpStream):
+
+    def __init__(self, server: 'AsyncXcomApiTcpServer', reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """
+        Created by AsyncXcomApiTcpServer for each gateway that connects; not meant to be created directly.
+        The session is connected from the start and can be used like any other api instance.
+        """
+        super().__init__()
+
+        self._owner = server
+        self._reader: asyncio.StreamReader = reader
+        self._writer: asyncio.StreamWriter = writer
+        self._framer = XcomFramer()
+        self._connected: bool = True
+
+        # Gather some info about remote server
+        (self._remote_ip, self._remote_port) = writer.get_extra_info("peername")[0:2]
+        self._guid: str|None = None
+
+
+    @property
+    def guid(self) -> str|None:
+        """GUID of the installation, once identified by the server"""
+        return self._guid
+
+
+    @property
+    def key(self) -> str:
+        """Key of this session within the server; the GUID if known, else the remote ip and port"""
+        return self._guid or f"{self._remote_ip}:{self._remote_port}"
+
+
+    async def start(self, timeout=START_TIMEOUT) -> bool:
+        """
+        The session is started by the server when the gateway connects
+        """
+        return self._connected
+
+
+    async def stop(self):
+        """
+        Close the connection to this gateway and remove it from the server
+        """
+        _LOGGER.info(f"Stopping Xcom TCP session '{self.key}'")
+        try:
+            self._connected = False
+
+            # Close the writer; we do not need to close the reader
+            self._writer.close()
+            await self._writer.wait_closed()
+
+        except Exception as e:
+            _LOGGER.warning(f"Exception during closing of Xcom writer: {e}")
+
+        self._owner._remove_session(self)
+
+
+
+##
+## Class implementing an Xcom-LAN TCP server that accepts many gateways on one port
+##
+class AsyncXcomApiTcpServer:
+
+    def __init__(self, listen_port=DEFAULT_PORT, identify=True, on_connect: Callable[[AsyncXcomApiTcpSession], Any]|None = None):
+        """
+        Usage: AsyncXcomApiTcpServer(listen_port=port)
+
+        Each MOXA needs to be running as TCP Client, and all can connect to the same port.
+        Every connection becomes its own AsyncXcomApiTcpSession, keyed by the remote ip and port of the gateway.
+        When identify is set, the GUID of the installation is requested directly after connecting,
+        and the session is keyed by GUID from then on. Only a new session with the same GUID replaces
+        an existing session; without a GUID, several gateways behind one ip each get their own session.
+        The optional on_connect callback is called with each new session once it is ready for use.
+        """
+        if listen_port is None: raise XcomParamException("Parameter 'listen_port' was not specified")
+
+        # Remember our parameters
+        self._listen_port: int = listen_port
+        self._identify: bool = identify
+        self._on_connect = on_connect
+
+        # Internal administration
+        self._server: asyncio.Server = None
+        self._sessions: dict[str, AsyncXcomApiTcpSession] = {}
+        self._started: bool = False
+
+
+    @property
+    def sessions(self) -> dict[str, AsyncXcomApiTcpSession]:
+        """All connected gateways, by key (GUID or remote ip and port)"""
+        return dict(self._sessions)
+
+
+    def get_session(self, key: str) -> AsyncXcomApiTcpSession|None:
+        """Find a connected gateway by GUID, remote ip and port, or remote ip"""
+        session = self._sessions.get(key, None)
+        if session is None:
+            session = next((s for s in self._sessions.values() if s.remote_ip == key), None)
+        return session
+
+
+    async def start(self) -> bool:
+        """
+        Start listening for Xcom clients
+        """
+        if not self._started:
+            _LOGGER.info(f"Xcom TCP multi-client server start listening on port {self._listen_port}")
+
+            self._server = await asyncio.start_server(self._client_connected_callback, "0.0.0.0", self._listen_port, limit=1000, family=socket.AF_INET, backlog=DEFAULT_BACKLOG)
+            self._server._start_serving()
+            self._started = True
+        else:
+            _LOGGER.info(f"Xcom TCP multi-client server already listening on port {self._listen_port}")
+
+        return True
+
+
+    async def wait_for_sessions(self, count: int, timeout=START_TIMEOUT) -> bool:
+        """Wait until at least count gateways are connected. Or timeout."""
+        try:
+            async with asyncio.timeout(timeout):
+                while len(self._sessions) < count:
+                    await asyncio.sleep(0.1)
+                return True
+
+        except asyncio.TimeoutError:
+            return False
+
+
+    async def _client_connected_callback(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """
+        Callback called each time an Xcom Client connects to our Server
+        """
+        session = AsyncXcomApiTcpSession(self, reader, writer)
+        _LOGGER.info(f"Connected to Xcom client '{session.remote_ip}'")
+
+        if self._identify:
+            try:
+                session._guid = await session.request_guid()
+
+            except Exception as e:
+                _LOGGER.warning(f"Failed to request GUID from Xcom client '{session.remote_ip}': {e}")
+
+        await self._add_session(session)
+
+
+    async def _add_session(self, session: AsyncXcomApiTcpSession):
+        # A gateway that reconnects (confirmed by its GUID) replaces its previous session; its subscriptions are resumed on the new one
+        previous = self._sessions.get(session.key, None) if session.guid is not None else None
+        if previous is not None:
+            _LOGGER.info(f"Xcom client '{session.key}' reconnected; closing previous session")
+            await previous.stop()
+
+            session._subscriptions = previous._subscriptions
+            session._subscriptions.reset()
+
+        self._sessions[session.key] = session
+
+        if self._on_connect is not None:
+            try:
+                result = self._on_connect(session)
+                if asyncio.iscoroutine(result):
+                    await result
+
+            except Exception as e:
+                _LOGGER.warning(f"Exception in on_connect callback for Xcom client '{session.key}': {e}")
+
+
+    def _remove_session(self, session: AsyncXcomApiTcpSession):
+        if self._sessions.get(session.key, None) is session:
+            self._sessions.pop(session.key)
+
+
+    async def stop(self):
+        """
+        Close all sessions and stop the server
+        """
+        _LOGGER.info(f"Stopping Xcom TCP multi-client server")
+
+        for session in list(self._sessions.values()):
+            await session.stop()
+
+        try:
+            if self._server:
+                async with asyncio.timeout(STOP_TIMEOUT):
+                    self._server.close()
+                    await self._server.wait_closed()
+
+        except asyncio.TimeoutError:
+            pass
+        except Exception as e:
+            _LOGGER.warning(f"Exception during closing of Xcom server: {e}")
+
+        self._started = False
+        _LOGGER.info(f"Stopped Xcom TCP multi-client server")
+
+
+
+##
+## Socket I/O shared by XcomApiTcp and XcomApiTcpSession
+##
+class _XcomApiTcpStream(XcomApiBase):
+    """
+    Sends and receives Xcom packages over a connected socket.
+    Derived classes set self._connection and self._framer once connected.
+    """
+
+    def _check_connection(self) -> bool:
+        """
+        Returns whether we are connected; detects a connection that was closed by the remote while we were idle
+        """
+        if self._connected and self._connection is not None:
+            try:
+                # Readable without any data to peek at means the remote closed the connection
+                readable,_,_ = select.select([self._connection], [], [], 0)
+                if readable and not self._connection.recv(1, socket.MSG_PEEK):
+                    self._connection_lost("Connection closed by remote")
+
+            except (socket.timeout, BlockingIOError):
+                # Nothing to peek at after all; the connection is still up
+                pass
+            except OSError as e:
+                self._connection_lost(str(e))
+
+        return self._connected
+
+
+    def _send_package(self, package: XcomPackage):
         """
         Send an Xcom package.
         Exception handling is dealed with by the caller
         """
-        self._writer.write(package.get_bytes())
+        try:
+            self._connection.send(package.get_bytes())
+
+        except OSError as e:
+            self._connection_lost(str(e))
+            raise
     
 
-    async def _receive_package(self) -> XcomPackage | None:
+    def _receive_package(self, deadline: float|None = None) -> XcomPackage | None:
         """
         Attempt to receive an Xcom package. 
-        Return None of nothing was received within REQ_TIMEOUT
+        Return None of nothing was received before the deadline (time.monotonic), or within REQ_TIMEOUT if no deadline is given
         Exception handling is dealed with by the caller
         """
         try:
-            async with asyncio.timeout(REQ_TIMEOUT):
-                return await AsyncXcomFactory.parse_package(self._reader)
-        
-        except asyncio.exceptions.TimeoutError:
-            return None
-        except asyncio.exceptions.CancelledError:
+            # One recv can hold several packages, or only part of one; the framer sorts that out.
+            # Each recv only waits for what is left until the deadline, so partial packages cannot stretch it
+            if deadline is None:
+                deadline = time.monotonic() + REQ_TIMEOUT
+
+            while (package := self._framer.get_package()) is None:
+                remaining = deadline_remaining(deadline)
+                if remaining <= 0:
+                    return None
+
+                self._connection.settimeout(remaining)
+                data = self._connection.recv(RECV_SIZE)
+                if not data:
+                    self._connection_lost("Connection closed by remote")
+                    raise XcomApiReadException("Connection closed by remote")
+
+                self._framer.feed(data)
+
+            return package
+
+        except socket.timeout:
             return None
-            
+        except ConnectionError as e:
+            self._connection_lost(str(e))
+            raise
+
 
 
 ##
 ## Class implementing Xcom-LAN TCP network protocol
 ##
-class XcomApiTcp(XcomApiBase):
+class XcomApiTcp(_XcomApiTcpStream):
 
-    def __init__(self, mode:XcomApiTcpMode=XcomApiTcpMode.SERVER, listen_port=DEFAULT_PORT, remote_ip:str=None, remote_port:int=None):
+    def __init__(self, mode:XcomApiTcpMode=XcomApiTcpMode.SERVER, listen_port=DEFAULT_PORT, remote_ip:str=None, remote_port:int=None, auto_reconnect:bool=True):
         """
         Usage: XcomApiTcp(mode=XcomApiTcpMode.SERVER, listen_port=port)
         or:    XcomApiTcp(mode=XcomApiTcpMode.CLIENT, remote_ip=ip, remote_port=port)
@@ -248,6 +629,8 @@ class XcomApiTcp(XcomApiBase):
         In Client mode, MOXA needs to be running as TCP Server and will listen for a connection from the TCP client we are creating here.
 
         In both cases, once connected we can send package requests.
+        When the connection is lost, requests fail immediately until it is restored. With auto_reconnect,
+        a background thread reconnects (Client mode) or accepts the next connection from the MOXA (Server mode).
         """
         super().__init__()
 
@@ -268,14 +651,20 @@ class XcomApiTcp(XcomApiBase):
         # internal administration
         self._server: socket.socket = None
         self._connection: socket.socket = None
+        self._framer = XcomFramer()
         self._started: bool = False
         self._connected: bool = False
+        self._auto_reconnect: bool = auto_reconnect
+        self._reconnect_thread: threading.Thread = None
+        self._reconnect_stop = threading.Event()    # set on stop, to wake up the reconnect thread
 
 
     def start(self, timeout=START_TIMEOUT, wait_for_connect:bool = False) -> bool:
         """
         Start the Xcom Server or Client
         """
+        self._reconnect_stop.clear()
+
         match self._mode:
             case XcomApiTcpMode.CLIENT: return self._start_client(timeout)
             case XcomApiTcpMode.SERVER: return self._start_server(timeout)
@@ -291,6 +680,7 @@ class XcomApiTcp(XcomApiBase):
             self._connection = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             self._connection.connect((self._remote_ip, self._remote_port))
             self._connection.settimeout(REQ_TIMEOUT)
+            self._framer.reset()
             self._started = True
             self._connected = True
         else:
@@ -315,11 +705,12 @@ class XcomApiTcp(XcomApiBase):
 
             self._connection, addr = self._server.accept()
             self._connection.settimeout(REQ_TIMEOUT)
+            self._framer.reset()
             self._connected = True
 
             self._remote_ip = addr[0]
         else:
-            _LOGGER.info(f"Xcom TCP server already listening on port {self.port}")
+            _LOGGER.info(f"Xcom TCP server already listening on port {self._listen_port}")
         
         return True
 
@@ -333,6 +724,12 @@ class XcomApiTcp(XcomApiBase):
             case XcomApiTcpMode.CLIENT: name = "Xcom TCP client"
 
         _LOGGER.info(f"Stopping {name}")
+
+        # Stop reconnecting (if we were) and wake up the reconnect thread
+        self._started = False
+        self._stop_reconnect()
+        self._reconnect_stop.set()
+
         try:
             self._connected = False
 
@@ -345,30 +742,299 @@ class XcomApiTcp(XcomApiBase):
 
         try:
             if self._server is not None:
+                # Closing alone does not wake up a thread blocked in accept; shutting down the socket does
+                try:
+                    self._server.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
                 self._server.close()
                 self._server = None
 
         except Exception as e:
            _LOGGER.warning(f"Exception during closing of tcp server: {e}")
-        
-        self._started = False
+
+        # Wait until the reconnect thread has ended; the shutdown above ends a pending accept
+        if self._reconnect_thread is not None and self._reconnect_thread is not threading.current_thread():
+            self._reconnect_thread.join(STOP_TIMEOUT)
+        self._reconnect_thread = None
+
         _LOGGER.info(f"Stopped {name}")
-        
 
-    def _send_package(self, package: XcomPackage):
+
+    def _on_connection_lost(self):
         """
-        Send an Xcom package.
-        Exception handling is dealed with by the caller
+        Start reconnecting (Client mode) or accepting the next connection (Server mode) in a background thread
         """
-        self._connection.send(package.get_bytes())
-    
+        if self._auto_reconnect and self._started:
+            if self._reconnect_thread is None or not self._reconnect_thread.is_alive():
+                self._reconnect_thread = threading.Thread(target=self._reconnect_loop, args=(self._reconnect_generation,), name="XcomApiTcpReconnect", daemon=True)
+                self._reconnect_thread.start()
 
-    def _receive_package(self) -> XcomPackage | None:
+
+    def _reconnect_wait(self, delay: float):
         """
-        Attempt to receive an Xcom package. 
-        Return None of nothing was received within REQ_TIMEOUT
-        Exception handling is dealed with by the caller
+        Wait in between reconnect attempts; returns early when stopped
         """
-        data = self._connection.recv(XcomPackage.max_length)
-        
-        return XcomFactory.parse_package_bytes(data)
+        self._reconnect_stop.wait(delay)
+
+
+    def _reconnect(self) -> bool:
+        """
+        Re-establish the connection to the Xcom server (Client mode), or wait for the Xcom client to connect again (Server mode)
+        """
+        generation = self._reconnect_generation
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+        match self._mode:
+            case XcomApiTcpMode.CLIENT:
+                _LOGGER.info(f"Xcom TCP client reconnect to {self._remote_ip}:{self._remote_port}")
+
+                connection = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                connection.settimeout(REQ_TIMEOUT)
+                connection.connect((self._remote_ip, self._remote_port))
+
+            case XcomApiTcpMode.SERVER:
+                _LOGGER.info("Waiting for Xcom TCP client to reconnect...")
+
+                connection, addr = self._server.accept()
+                self._remote_ip = addr[0]
+
+        if not self._started or generation != self._reconnect_generation:
+            # Stopped while connecting; do not leave the new connection open
+            connection.close()
+            return False
+
+        connection.settimeout(REQ_TIMEOUT)
+        self._framer.reset()
+        self._connection = connection
+        return True
+
+
+
+##
+## Class implementing one Xcom-LAN gateway connected to an XcomApiTcpServer
+##
+class XcomApiTcpSession(_XcomApiTcpStream):
+
+    def __init__(self, server: 'XcomApiTcpServer', connection: socket.socket, addr: tuple):
+        """
+        Created by XcomApiTcpServer for each gateway that connects; not meant to be created directly.
+        The session is connected from the start and can be used like any other api instance.
+        """
+        super().__init__()
+
+        self._owner = server
+        self._connection: socket.socket = connection
+        self._connection.settimeout(REQ_TIMEOUT)
+        self._framer = XcomFramer()
+        self._connected: bool = True
+
+        # Gather some info about remote server
+        (self._remote_ip, self._remote_port) = addr[0:2]
+        self._guid: str|None = None
+
+
+    @property
+    def guid(self) -> str|None:
+        """GUID of the installation, once identified by the server"""
+        return self._guid
+
+
+    @property
+    def key(self) -> str:
+        """Key of this session within the server; the GUID if known, else the remote ip and port"""
+        return self._guid or f"{self._remote_ip}:{self._remote_port}"
+
+
+    def start(self, timeout=START_TIMEOUT) -> bool:
+        """
+        The session is started by the server when the gateway connects
+        """
+        return self._connected
+
+
+    def stop(self):
+        """
+        Close the connection to this gateway and remove it from the server
+        """
+        _LOGGER.info(f"Stopping Xcom TCP session '{self.key}'")
+        try:
+            self._connected = False
+            self._connection.close()
+
+        except Exception as e:
+           _LOGGER.warning(f"Exception during closing of tcp connection: {e}")
+
+        self._owner._remove_session(self)
+
+
+
+##
+## Class implementing an Xcom-LAN TCP server that accepts many gateways on one port
+##
+class XcomApiTcpServer:
+
+    def __init__(self, listen_port=DEFAULT_PORT, identify=True, on_connect: Callable[[XcomApiTcpSession], Any]|None = None):
+        """
+        Usage: XcomApiTcpServer(listen_port=port)
+
+        Each MOXA needs to be running as TCP Client, and all can connect to the same port.
+        Every connection becomes its own XcomApiTcpSession, keyed by the remote ip and port of the gateway.
+        When identify is set, the GUID of the installation is requested directly after connecting,
+        and the session is keyed by GUID from then on. Only a new session with the same GUID replaces
+        an existing session; without a GUID, several gateways behind one ip each get their own session.
+        The optional on_connect callback is called with each new session once it is ready for use.
+
+        Connections are accepted in a background thread.
+        """
+        if listen_port is None: raise XcomParamException("Parameter 'listen_port' was not specified")
+
+        # Remember our parameters
+        self._listen_port: int = listen_port
+        self._identify: bool = identify
+        self._on_connect = on_connect
+
+        # Internal administration
+        self._server: socket.socket = None
+        self._thread: threading.Thread = None
+        self._sessions: dict[str, XcomApiTcpSession] = {}
+        self._sessionsLock = threading.Lock()
+        self._started: bool = False
+
+
+    @property
+    def sessions(self) -> dict[str, XcomApiTcpSession]:
+        """All connected gateways, by key (GUID or remote ip and port)"""
+        with self._sessionsLock:
+            return dict(self._sessions)
+
+
+    def get_session(self, key: str) -> XcomApiTcpSession|None:
+        """Find a connected gateway by GUID, remote ip and port, or remote ip"""
+        sessions = self.sessions
+        session = sessions.get(key, None)
+        if session is None:
+            session = next((s for s in sessions.values() if s.remote_ip == key), None)
+        return session
+
+
+    def start(self) -> bool:
+        """
+        Start listening for Xcom clients
+        """
+        if not self._started:
+            _LOGGER.info(f"Xcom TCP multi-client server start listening on port {self._listen_port}")
+
+            self._server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self._server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            self._server.bind(("0.0.0.0", self._listen_port))
+            self._server.listen(DEFAULT_BACKLOG)
+            self._server.settimeout(1)  # so the accept loop regularly checks whether we were stopped
+            self._started = True
+
+            self._thread = threading.Thread(target=self._accept_loop, name="XcomApiTcpServer", daemon=True)
+            self._thread.start()
+        else:
+            _LOGGER.info(f"Xcom TCP multi-client server already listening on port {self._listen_port}")
+
+        return True
+
+
+    def wait_for_sessions(self, count: int, timeout=START_TIMEOUT) -> bool:
+        """Wait until at least count gateways are connected. Or timeout."""
+        deadline = time.monotonic() + timeout
+        while len(self.sessions) < count:
+            if deadline_remaining(deadline) <= 0:
+                return False
+            time.sleep(0.1)
+
+        return True
+
+
+    def _accept_loop(self):
+        """
+        Accept connecting Xcom clients until stopped
+        """
+        while self._started:
+            try:
+                connection, addr = self._server.accept()
+
+            except socket.timeout:
+                continue
+            except OSError:
+                break   # server socket was closed
+
+            # Identify each client in its own thread, so other clients can connect meanwhile
+            threading.Thread(target=self._client_connected, args=(connection, addr), daemon=True).start()
+
+
+    def _client_connected(self, connection: socket.socket, addr: tuple):
+        """
+        Called each time an Xcom Client connects to our Server
+        """
+        session = XcomApiTcpSession(self, connection, addr)
+        _LOGGER.info(f"Connected to Xcom client '{session.remote_ip}'")
+
+        if self._identify:
+            try:
+                session._guid = session.request_guid()
+
+            except Exception as e:
+                _LOGGER.warning(f"Failed to request GUID from Xcom client '{session.remote_ip}': {e}")
+
+        self._add_session(session)
+
+
+    def _add_session(self, session: XcomApiTcpSession):
+        # A gateway that reconnects (confirmed by its GUID) replaces its previous session; its subscriptions are resumed on the new one
+        with self._sessionsLock:
+            previous = self._sessions.get(session.key, None) if session.guid is not None else None
+            if previous is not None:
+                session._subscriptions = previous._subscriptions
+                session._subscriptions.reset()
+
+            self._sessions[session.key] = session
+
+        if previous is not None:
+            _LOGGER.info(f"Xcom client '{session.key}' reconnected; closing previous session")
+            previous.stop()
+
+        if self._on_connect is not None:
+            try:
+                self._on_connect(session)
+
+            except Exception as e:
+                _LOGGER.warning(f"Exception in on_connect callback for Xcom client '{session.key}': {e}")
+
+
+    def _remove_session(self, session: XcomApiTcpSession):
+        with self._sessionsLock:
+            if self._sessions.get(session.key, None) is session:
+                self._sessions.pop(session.key)
+
+
+    def stop(self):
+        """
+        Close all sessions and stop the server
+        """
+        _LOGGER.info(f"Stopping Xcom TCP multi-client server")
+        self._started = False
+
+        for session in list(self.sessions.values()):
+            session.stop()
+
+        try:
+            if self._server is not None:
+                self._server.close()
+                self._server = None
+
+        except Exception as e:
+           _LOGGER.warning(f"Exception during closing of tcp server: {e}")
+
+        if self._thread is not None:
+            self._thread.join(STOP_TIMEOUT)
+            self._thread = None
+
+        _LOGGER.info(f"Stopped Xcom TCP multi-client server")
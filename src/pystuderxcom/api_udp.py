@@ -27,6 +27,7 @@ from .const import (
     START_TIMEOUT,
     STOP_TIMEOUT,
     REQ_TIMEOUT,
+    deadline_remaining,
     ScomAddress,
     XcomLevel,
     XcomFormat,
@@ -135,14 +136,14 @@ class AsyncXcomApiUdp(AsyncXcomApiBase):
         self._socket.sendto(data, addr=addr )
     
 
-    async def _receive_package(self) -> XcomPackage | None:
+    async def _receive_package(self, deadline: float|None = None) -> XcomPackage | None:
         """
         Attempt to receive an Xcom package. 
-        Return None of nothing was received within REQ_TIMEOUT
+        Return None of nothing was received before the deadline (time.monotonic), or within REQ_TIMEOUT if no deadline is given
         Exception handling is dealed with by the caller
         """
         try:
-            async with asyncio.timeout(REQ_TIMEOUT):
+            async with asyncio.timeout(deadline_remaining(deadline)):
                 data,_ = await self._socket.recvfrom()
             
                 return await AsyncXcomFactory.parse_package_bytes(data)
@@ -217,13 +218,20 @@ class XcomApiUdp(XcomApiBase):
         self._socket.sendto(data, addr)
     
 
-    def _receive_package(self) -> XcomPackage | None:
+    def _receive_package(self, deadline: float|None = None) -> XcomPackage | None:
         """
         Attempt to receive an Xcom package. 
-        Return None of nothing was received within REQ_TIMEOUT
+        Return None of nothing was received before the deadline (time.monotonic), or within REQ_TIMEOUT if no deadline is given
         Exception handling is dealed with by the caller
         """
         try:
+            if deadline is not None:
+                remaining = deadline_remaining(deadline)
+                if remaining <= 0:
+                    return None
+
+                self._socket.settimeout(remaining)
+
             data = self._socket.recv(XcomPackage.max_length)
             
             return XcomFactory.parse_package_bytes(data)
@@ -0,0 +1,83 @@
+##
+## Class implementing a cache of parameter values, to avoid re-reading params that rarely change
+##
+
+import time
+
+from collections import OrderedDict
+from typing import Any
+
+from .const import (
+    XcomParamException,
+)
+
+
+class XcomParamCache:
+    """
+    Cache of parameter values per (datapoint nr, device address).
+    Entries expire after ttl seconds. When more than max_size entries are cached, the least recently used one is evicted.
+    A ttl of 0 disables the cache.
+    """
+    def __init__(self, ttl: float = 0, max_size: int = 256):
+        if ttl < 0:
+            raise XcomParamException(f"Invalid param cache ttl {ttl}; must be 0 or more")
+        if max_size < 1:
+            raise XcomParamException(f"Invalid param cache max_size {max_size}; must be 1 or more")
+
+        self.ttl = ttl
+        self.max_size = max_size
+
+        self._entries: OrderedDict[tuple, tuple[float, Any]] = OrderedDict()   # key -> (expires on time.monotonic(), value)
+
+        # Diagnostics gathering
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def get(self, nr: int, addr: int, now: float|None = None) -> tuple[bool, Any]:
+        """Returns a tuple (found, value); found is False if the value is not cached or has expired"""
+        if not self.enabled:
+            return (False, None)
+
+        key = (nr, addr)
+        entry = self._entries.get(key, None)
+        if entry is None:
+            self.misses += 1
+            return (False, None)
+
+        expires, value = entry
+        if (now or time.monotonic()) >= expires:
+            self._entries.pop(key, None)
+            self.misses += 1
+            return (False, None)
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return (True, value)
+
+    def put(self, nr: int, addr: int, value: Any, now: float|None = None):
+        """Store a value; evicts the least recently used entry when the cache is full"""
+        if not self.enabled or value is None:
+            return
+
+        key = (nr, addr)
+        self._entries[key] = ((now or time.monotonic()) + self.ttl, value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, nr: int|None = None, addr: int|None = None):
+        """Remove the entries for a datapoint nr and/or address; all entries if neither is given"""
+        if nr is None and addr is None:
+            self._entries.clear()
+            return
+
+        for key in [key for key in self._entries.keys() if (nr is None or key[0] == nr) and (addr is None or key[1] == addr)]:
+            self._entries.pop(key, None)
@@ -4,6 +4,10 @@
 # Definition of all parameters / constants used in the Xcom protocol
 ##
 
+import asyncio
+import threading
+import time
+
 from dataclasses import dataclass
 from enum import IntEnum, StrEnum
 from typing import Iterable
@@ -36,6 +40,18 @@ STOP_TIMEOUT = 5
 REQ_TIMEOUT = 3
 REQ_RETRIES = 3
 REQ_BURST_PERIOD = 5 # do burst of requests for 5 seconds, then wait a second, then the next burst
+REQ_BURST_PAUSE = 1 # seconds to wait after a burst; being idle this long also starts a new burst
+REQ_WINDOW = 1 # max number of requests in flight at the same time; 1 means stop-and-wait
+REQ_NEGATIVE_TTL = 300 # seconds; a request that got a permanent error response is not sent again during this time
+PARAM_CACHE_TTL = 0 # seconds; how long read param values are reused, 0 disables the param cache
+PARAM_CACHE_SIZE = 256 # max number of param values in the param cache
+RECV_SIZE = 4096 # max number of bytes to read from a tcp or serial stream in one call
+RECONNECT_DELAY_MIN = 1 # seconds; first wait before reconnecting after the connection was lost
+RECONNECT_DELAY_MAX = 60 # seconds; the wait doubles after each failed reconnect attempt, up to this maximum
+
+POLL_INTERVAL_FAST = 5 # seconds; power and current infos
+POLL_INTERVAL_NORMAL = 30 # seconds; all other infos
+POLL_INTERVAL_SLOW = 300 # seconds; params and ID-type infos
 
 NR_VIRTUAL_START = 98000
 NR_VIRTUAL_END = 99999
@@ -314,6 +330,23 @@ class ScomErrorCode:
                 return key
 
         return f"unknown error '{error:04x}'"
+
+
+# Error responses that will not go away by retrying the same request; these are remembered in a negative cache
+SCOM_ERRORS_PERMANENT = frozenset([
+    ScomErrorCode.DEVICE_NOT_FOUND,
+    ScomErrorCode.SERVICE_NOT_SUPPORTED,
+    ScomErrorCode.TYPE_NOT_SUPPORTED,
+    ScomErrorCode.OBJECT_ID_NOT_FOUND,
+    ScomErrorCode.PROPERTY_NOT_SUPPORTED,
+    ScomErrorCode.SCOM_ERROR_OBJECT_NOT_SUPPORTED,
+])
+
+# Error responses to a multi-info request that mean the Xcom client does not support multi-info at all
+SCOM_ERRORS_UNSUPPORTED = frozenset([
+    ScomErrorCode.SERVICE_NOT_SUPPORTED,
+    ScomErrorCode.TYPE_NOT_SUPPORTED,
+])
     
 
 def safe_len(lst: Iterable):
@@ -321,3 +354,36 @@ def safe_len(lst: Iterable):
         return len(lst)
     except:
         return sum(1 for i in lst) 
+
+
+def deadline_remaining(deadline: float|None, default: float = REQ_TIMEOUT) -> float:
+    """
+    Seconds left until a deadline on the time.monotonic() clock; never negative.
+    Returns the default when there is no deadline.
+    """
+    if deadline is None:
+        return default
+
+    return max(deadline - time.monotonic(), 0)
+
+
+async def async_acquire_until(lock, deadline: float|None) -> bool:
+    """
+    Acquire an asyncio lock or semaphore, but wait no longer than until the deadline on the time.monotonic() clock.
+    Returns False if it could not be acquired in time. Waits up to REQ_TIMEOUT when there is no deadline.
+    """
+    try:
+        async with asyncio.timeout(deadline_remaining(deadline)):
+            await lock.acquire()
+        return True
+
+    except TimeoutError:
+        return False
+
+
+def acquire_until(lock, deadline: float|None) -> bool:
+    """
+    Acquire a threading lock or semaphore, but wait no longer than until the deadline on the time.monotonic() clock.
+    Returns False if it could not be acquired in time. Waits up to REQ_TIMEOUT when there is no deadline.
+    """
+    return lock.acquire(timeout=deadline_remaining(deadline))
@@ -50,6 +50,13 @@ class XcomDiscoveredDevice:
     fid: str = None
 
 
+@dataclass
+class XcomTopology:
+    # What was discovered for one Xcom gateway
+    client: XcomDiscoveredClient
+    devices: list[XcomDiscoveredDevice]
+
+
 class XcomData:
     NONE = b''
 
@@ -193,30 +200,37 @@ class XcomDataMultiInfoRsp:
         self.datetime = datetime
         self.items = items
 
+    _struct_head = struct.Struct("<II")     # flags, datetime
+    _struct_item = struct.Struct("<HBf")    # user_info_ref, aggregation_type, data
+
     @staticmethod
     def unpack(buf: bytes) -> 'XcomDataMultiInfoRsp':
-        f = BytesIO(buf)
-        f_len = f.getbuffer().nbytes
-
-        flags = read_uint32(f)
-        datetime= read_uint32(f)
-        items = list()
-        f_len -= 8
+        flags, datetime = XcomDataMultiInfoRsp._struct_head.unpack_from(buf, 0)
 
-        while f_len >= 7:
-            user_info_ref = read_uint16(f)
-            aggr = read_uint8(f)
-            data = read_bytes(f, 4)
-            f_len -= 7
+        # Decode all 7-byte records in one pass; any trailing partial record is ignored
+        start = XcomDataMultiInfoRsp._struct_head.size
+        count = (len(buf) - start) // XcomDataMultiInfoRsp._struct_item.size
+        end = start + count * XcomDataMultiInfoRsp._struct_item.size
 
-            items.append(XcomDataMultiInfoRspItem(
-                user_info_ref,
-                XcomAggregationType(aggr),
-                XcomData.unpack(data, XcomFormat.FLOAT)
-            ))
+        items = [XcomDataMultiInfoRspItem(user_info_ref, XcomAggregationType(aggr), data) 
+                 for user_info_ref, aggr, data in XcomDataMultiInfoRsp._struct_item.iter_unpack(memoryview(buf)[start:end])]
 
         return XcomDataMultiInfoRsp(flags, datetime, items)
 
+    @staticmethod
+    def unpack_columns(buf: bytes) -> tuple[int, int, tuple[int], tuple[XcomAggregationType], tuple[float]]:
+        """Unpack into parallel tuples (flags, datetime, user_info_refs, aggregation_types, data) without per-item objects"""
+        flags, datetime = XcomDataMultiInfoRsp._struct_head.unpack_from(buf, 0)
+
+        start = XcomDataMultiInfoRsp._struct_head.size
+        count = (len(buf) - start) // XcomDataMultiInfoRsp._struct_item.size
+        end = start + count * XcomDataMultiInfoRsp._struct_item.size
+
+        records = XcomDataMultiInfoRsp._struct_item.iter_unpack(memoryview(buf)[start:end])
+        user_info_refs, aggrs, data = tuple(zip(*records)) or ((), (), ())
+
+        return (flags, datetime, user_info_refs, tuple(map(XcomAggregationType, aggrs)), data)
+
     def pack(self) -> bytes:
         f = BytesIO()
         write_uint32(f, self.flags)
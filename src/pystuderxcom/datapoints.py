@@ -4,7 +4,10 @@
 # Definition of all parameters / constants used in the Xcom protocol
 ##
 
+import decimal
 import logging
+import os
+import sys
 
 from dataclasses import dataclass
 
@@ -28,7 +31,7 @@ class XcomDatapointUnknownException(Exception):
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class XcomDatapoint:
     family_id: str
     level: XcomLevel
@@ -44,6 +47,14 @@ class XcomDatapoint:
     inc: float|str = None
     options: dict = None
 
+    @staticmethod
+    def is_valid_dict(d) -> bool:
+        """Returns True if from_dict will result in a datapoint for this dict"""
+        if not d.get('fam') or not d.get('lvl') or not d.get('nr') or not d.get('name') or not d.get('fmt'):
+            return False
+
+        return type(d.get('pnr')) is int and type(d.get('nr')) is int
+
     @staticmethod
     def from_dict(d):
         fam = d.get('fam', None)
@@ -61,31 +72,41 @@ class XcomDatapoint:
         opt = d.get('opt', None)
 
         # Check and convert properties
-        if not fam or not lvl or not nr or not name or not fmt:
-            return None
-        
-        if type(pnr) is not int:
-            return None
-
-        if type(nr) is not int:
+        if not XcomDatapoint.is_valid_dict(d):
             return None
         
-        family_id = str(fam)
+        # Strings that repeat over many datapoints are interned, so all datapoints share one copy
+        family_id = sys.intern(str(fam))
         level = XcomLevel.from_str(str(lvl))
         parent = int(pnr)
         number = int(nr)
         name = str(name).strip()
         abbr = str(short)
-        unit = unit if type(unit) is str else None
+        unit = sys.intern(unit) if type(unit) is str else None
         format = XcomFormat.from_str(str(fmt))
         default = float(dft) if (type(dft) is int or type(dft) is float) else "S" if (dft=="S") else None
         minimum = float(min) if (type(min) is int or type(min) is float) else "S" if (dft=="S") else None
         maximum = float(max) if (type(max) is int or type(max) is float) else "S" if (dft=="S") else None
         increment = float(inc) if (type(inc) is int or type(inc) is float) else "S" if (dft=="S") else None
-        options = opt if type(opt) is dict else None
+        options = {sys.intern(str(k)): sys.intern(v) if type(v) is str else v for k,v in opt.items()} if type(opt) is dict else None
             
         return XcomDatapoint(family_id, level, parent, number, name, abbr, unit, format, default, minimum, maximum, increment, options)
         
+    def scale_voltage(self, mult: float):
+        """
+        The datapoints are defined for 48Vdc; adapt the DC voltage limits for a 12 or 24Vdc system
+        """
+        if self.unit=="Vdc" and \
+           self.min is not None and self.min > 24.0 and \
+           self.max is not None and self.max < 96.0:
+
+            d = decimal.Decimal(str(self.inc)) if self.inc is not None else decimal.Decimal('1')
+            digits = d.as_tuple().exponent * -1
+
+            self.default = round(mult * self.default, digits) if self.default is not None else None
+            self.min     = round(mult * self.min    , digits) if self.min     is not None else None
+            self.max     = round(mult * self.max    , digits) if self.max     is not None else None
+
     @property
     def category(self) -> XcomCategory:
         if self.level in [XcomLevel.INFO]:
@@ -132,31 +153,149 @@ class XcomDataset:
     PATH_240V = __file__.replace('.py', '_240v.json')
     PATH_XCOM = __file__.replace('.py', '_xcom.json')
 
+    # Binary snapshot of created datasets, to speed up later creates. Bump CACHE_VERSION when XcomDatapoint changes.
+    # Kept in the user cache dir (the package dir may be read-only), unless another dir is passed to create_dataset.
+    CACHE_DIR = os.path.join(os.environ.get("LOCALAPPDATA") or os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"), "pystuderxcom")
+    CACHE_VERSION = 2
+
     def __init__(self, datapoints: list[XcomDatapoint] | None = None):
-        self._datapoints = datapoints
+        self._datapoints = datapoints or []
 
+        # Build lookup indexes once, so each lookup does not need to scan all datapoints.
+        # Keys with family_id None point to the first datapoint of any family, same as a linear scan would.
+        # Iterate in reverse so that the first datapoint in the list is the one that ends up in the index.
+        self._by_nr: dict[tuple[int, str|None], XcomDatapoint] = {(p.nr, p.family_id): p for p in reversed(self._datapoints)}
+        self._by_nr.update({(p.nr, None): p for p in reversed(self._datapoints)})
 
-    def get_by_nr(self, nr: int, family_id: str|None = None) -> XcomDatapoint:
+        self._by_name: dict[tuple[str, str|None], XcomDatapoint] = {(p.name, p.family_id): p for p in reversed(self._datapoints)}
+        self._by_name.update({(p.name, None): p for p in reversed(self._datapoints)})
+
+        self._by_parent: dict[tuple[int, str|None], list[XcomDatapoint]] = {}
         for point in self._datapoints:
-            if point.nr == nr and (point.family_id == family_id or family_id is None):
-                return point
+            self._by_parent.setdefault((point.parent, point.family_id), []).append(point)
+            self._by_parent.setdefault((point.parent, None), []).append(point)
+
+
+    def __len__(self):
+        return len(self._datapoints)
+
+
+    def get_by_nr(self, nr: int, family_id: str|None = None) -> XcomDatapoint:
+        point = self._by_nr.get((nr, family_id))
+        if point is not None:
+            return point
 
         raise XcomDatapointUnknownException(nr, family_id)
     
 
     def get_by_name(self, name: str, family_id: str|None = None) -> XcomDatapoint:
-        for point in self._datapoints:
-            if point.name == name and (point.family_id == family_id or family_id is None):
-                return point
+        point = self._by_name.get((name, family_id))
+        if point is not None:
+            return point
 
         raise XcomDatapointUnknownException(name, family_id)
     
 
     def get_menu_items(self, parent: int = 0, family_id: str|None = None):
-        datapoints = []
-        for point in self._datapoints:
-            if point.parent == parent and (point.family_id == family_id or family_id is None):
-                datapoints.append(point)
+        return list(self._by_parent.get((parent, family_id), []))
+
+
+
+class XcomLazyDataset(XcomDataset):
+    """
+    Variant of XcomDataset that only keeps the parsed records in memory, each as a compact tuple of its fields.
+    An XcomDatapoint is built the first time a lookup returns it, and is then kept for next lookups.
+    The family, nr, name and parent of each record are kept in separate lists up front; the index on nr is
+    built from these directly, the indexes for name and menu on their first use.
+    """
+
+    # Record fields in the order in which they are kept
+    FIELDS = ('fam', 'lvl', 'pnr', 'nr', 'name', 'short', 'unit', 'fmt', 'def', 'min', 'max', 'inc', 'opt')
+
+    def __init__(self, records: list[dict], voltage_mult: float = 1.0):
+        # Many records have identical options (e.g. No/Yes) and repeat the same short strings; let those share one object
+        record_options: dict[tuple, dict] = {}
+        self._records: list[tuple] = [tuple(self._share(f, r.get(f), record_options) for f in self.FIELDS) for r in records]
+
+        self._families: list[str] = [sys.intern(str(r['fam'])) for r in records]
+        self._nrs: list[int] = [r['nr'] for r in records]
+        self._names: list[str] = [str(r['name']).strip() for r in records]
+        self._parents: list[int] = [r.get('pnr') for r in records]
+
+        self._points: list[XcomDatapoint|None] = [None] * len(records)
+        self._voltage_mult = voltage_mult
+        self._shared_options: dict[tuple, dict] = {}
+
+        by_nr: dict[int, list[int]] = {}
+        for idx,nr in enumerate(self._nrs):
+            by_nr.setdefault(nr, []).append(idx)
 
-        return datapoints
+        self._by_nr: dict[int, tuple[int]] = {nr: tuple(indexes) for nr,indexes in by_nr.items()}
+        self._by_name: dict[tuple[str, str|None], int]|None = None
+        self._by_parent: dict[tuple[int, str|None], list[int]]|None = None
+
+
+    @staticmethod
+    def _share(field: str, value, shared_options: dict[tuple, dict]):
+        """Returns a shared instance of an options dict or a short string, so equal values are only kept once"""
+        if field == 'opt' and isinstance(value, dict):
+            return shared_options.setdefault(tuple(value.items()), value)
+        if field in ('fam', 'lvl', 'unit', 'fmt') and isinstance(value, str):
+            return sys.intern(value)
+        return value
+
+
+    def __len__(self):
+        return len(self._records)
+
+
+    @property
+    def _datapoints(self) -> list[XcomDatapoint]:
+        """Materialises all datapoints; only intended for diagnostics and unit-tests"""
+        return [self._get_point(idx) for idx in range(len(self._records))]
+
+
+    def _get_record(self, idx: int) -> dict:
+        return dict(zip(self.FIELDS, self._records[idx]))
+
+
+    def _get_point(self, idx: int) -> XcomDatapoint:
+        point = self._points[idx]
+        if point is None:
+            point = XcomDatapoint.from_dict(self._get_record(idx))
+            point.scale_voltage(self._voltage_mult)
+            if point.options is not None:
+                point.options = self._shared_options.setdefault(tuple(point.options.items()), point.options)
+
+            self._points[idx] = point
+        return point
+
+
+    def get_by_nr(self, nr: int, family_id: str|None = None) -> XcomDatapoint:
+        idx = next((idx for idx in self._by_nr.get(nr, ()) if family_id is None or self._families[idx] == family_id), None)
+        if idx is not None:
+            return self._get_point(idx)
+
+        raise XcomDatapointUnknownException(nr, family_id)
+    
+
+    def get_by_name(self, name: str, family_id: str|None = None) -> XcomDatapoint:
+        if self._by_name is None:
+            self._by_name = {(name, self._families[idx]): idx for idx,name in reversed(list(enumerate(self._names)))}
+            self._by_name.update({(name, None): idx for idx,name in reversed(list(enumerate(self._names)))})
+
+        idx = self._by_name.get((name, family_id))
+        if idx is not None:
+            return self._get_point(idx)
+
+        raise XcomDatapointUnknownException(name, family_id)
+    
+
+    def get_menu_items(self, parent: int = 0, family_id: str|None = None):
+        if self._by_parent is None:
+            self._by_parent = {}
+            for idx,pnr in enumerate(self._parents):
+                self._by_parent.setdefault((pnr, self._families[idx]), []).append(idx)
+                self._by_parent.setdefault((pnr, None), []).append(idx)
 
+        return [self._get_point(idx) for idx in self._by_parent.get((parent, family_id), [])]
@@ -22,6 +22,7 @@ from .const import (
 from .data import (
     XcomDiscoveredDevice,
     XcomDiscoveredClient,
+    XcomTopology,
 )
 from .datapoints import (
     XcomDatapoint,
@@ -29,7 +30,18 @@ from .datapoints import (
     XcomDatapointUnknownException,
 )
 from .families import (
-    XcomDeviceFamilies
+    XcomDeviceFamily,
+    XcomDeviceFamilies,
+)
+from .topology_async import (
+    AsyncXcomTopologyCache,
+)
+from .topology_sync import (
+    XcomTopologyCache,
+)
+from .values import (
+    XcomValues,
+    XcomValuesItem,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -48,9 +60,15 @@ class AsyncXcomDiscover:
         self._dataset = dataset
 
 
-    async def discover_devices(self, getExtendedInfo = False, verbose = False) -> list[XcomDiscoveredDevice]:
+    async def discover_devices(self, getExtendedInfo = False, verbose = False, retries = None, timeout = None) -> list[XcomDiscoveredDevice]:
         """
-        Discover which Studer devices can be reached via the Xcom client
+        Discover which Studer devices can be reached via the Xcom client.
+
+        Within a family the addresses are probed one after the other, up to the first address that is not found.
+        When the api allows more than one request in flight (request_window), that many families are probed at the same time,
+        so a missing device no longer holds up the probes of the others while no probe has to wait for a free slot.
+        Families that share addresses (BMS and BSP) are probed one after the other, the later only for addresses not found yet.
+        Virtual families (Xcom) are probed last; their values are derived from the responses to the other probes.
         """
         devices: list[XcomDiscoveredDevice] = []
 
@@ -58,60 +76,202 @@ class AsyncXcomDiscover:
         if not self._api.connected:
             raise XcomDiscoverNotConnected("XcomApi is not connected to remote client; please connect first.")
         
-        # Check presence of devices for each family
+        # Ask the devices themselves, not the negative cache of earlier requests; devices may have been added
+        self._api.clear_negative_cache()
+
+        # Group the families that share addresses; each group is probed in family order
+        groups: dict[int, list[XcomDeviceFamily]] = {}
+        virtuals: list[XcomDeviceFamily] = []
         for family in XcomDeviceFamilies.get_list():
+            if self._is_virtual_family(family):
+                virtuals.append(family)
+            else:
+                groups.setdefault(family.addr_multicast, []).append(family)
+
+        # Check presence of devices for each group of families
+        window = max(self._api.request_window, 1)
+        families = list(groups.values())
+        for idx in range(0, len(families), window):
+            async with asyncio.TaskGroup() as task_group:
+                tasks = [task_group.create_task(self._discover_families(group, verbose=verbose, retries=retries, timeout=timeout)) for group in families[idx:idx+window]]
 
-            _LOGGER.info(f"Trying family {family.id} ({family.model})")
+            for task in tasks:
+                devices.extend(task.result())
 
-            # Get value for the specific discovery nr, or otherwise the first info nr or first param nr
-            nr = family.nr_discover or family.nr_infos_start or family.nr_params_start or None
-            if not nr:
-                continue
+        for family in virtuals:
+            devices.extend(await self._discover_family(family, verbose=verbose, retries=retries, timeout=timeout))
 
-            # Iterate all addresses in the family, up to the first address that is not found
-            for device_addr in range(family.addr_devices_start, family.addr_devices_end+1):
+        if getExtendedInfo:
+            await self._get_extended_device_infos(devices, verbose)
 
-                device_code = family.get_code(device_addr)
+        return devices
 
-                # Have we already discovered a device for this address?
-                device_found = next((d for d in devices if d.addr == device_addr), None)
-                if device_found is not None:
-                    # Do not test further device addresses in this family
-                    _LOGGER.info(f"  Skip device {device_code}; already found device {device_found.code}")
-                    break
 
-                # Send the test request to the device. This will return None in case:
-                # - the device does not exist (DEVICE_NOT_FOUND)
-                # - the device does not support the param (INVALID_DATA), used to distinguish BSP from BMS
-                try:
-                    param = self._dataset.get_by_nr(nr, family.id_for_nr)
+    async def _discover_families(self, families: list[XcomDeviceFamily], verbose = False, retries = None, timeout = None) -> list[XcomDiscoveredDevice]:
+        """
+        Probe families that share addresses one after the other; a later family skips the addresses already found
+        """
+        devices: list[XcomDiscoveredDevice] = []
+
+        for family in families:
+            skip = set(device.addr for device in devices)
+            devices.extend(await self._discover_family(family, skip=skip, verbose=verbose, retries=retries, timeout=timeout))
+
+        return devices
+
+
+    async def _discover_family(self, family: XcomDeviceFamily, skip: set[int]|None = None, verbose = False, retries = None, timeout = None) -> list[XcomDiscoveredDevice]:
+        """
+        Probe the addresses of one family, up to the first address that is not found or was already found for another family
+        """
+        devices: list[XcomDiscoveredDevice] = []
 
-                    _LOGGER.info(f"Trying device {device_code} on {device_addr} for nr {nr}")
-                    match param.target:
-                        case XcomTarget.STANDARD: value = await self._api.request_value(param, device_addr, verbose=verbose)
-                        case XcomTarget.VIRTUAL : value = await self._api.request_virtual(param, device_addr, verbose=verbose)
-                        
-                    if value is not None:
-                        _LOGGER.info(f"  Found device {device_code} via {nr}:{device_addr}")
+        _LOGGER.info(f"Trying family {family.id} ({family.model})")
 
-                        device = XcomDiscoveredDevice(device_code, device_addr, family.id, family.model)
-                        if getExtendedInfo:
-                            device = await self.get_extended_device_info(device, verbose=verbose)
-                        
-                        devices.append(device)
+        nr = self._get_discover_nr(family)
+        if not nr:
+            return devices
 
-                    else:
-                        _LOGGER.info(f"  No device {device_code}; no value returned from Xcom client")
+        # Iterate all addresses in the family, up to the first address that is not found
+        for device_addr in range(family.addr_devices_start, family.addr_devices_end+1):
 
-                except Exception as e:
-                    _LOGGER.info(f"  No device {device_code}; no value returned from Xcom client: {e}")
+            device_code = family.get_code(device_addr)
 
-                    # Do not test further device addresses in this family
-                    break
+            # Have we already discovered a device for this address?
+            if skip and device_addr in skip:
+                # Do not test further device addresses in this family
+                _LOGGER.info(f"  Skip device {device_code}; already found a device on {device_addr}")
+                break
+
+            # Send the test request to the device. This will return None in case:
+            # - the device does not exist (DEVICE_NOT_FOUND)
+            # - the device does not support the param (INVALID_DATA), used to distinguish BSP from BMS
+            try:
+                param = self._dataset.get_by_nr(nr, family.id_for_nr)
+
+                _LOGGER.info(f"Trying device {device_code} on {device_addr} for nr {nr}")
+                match param.target:
+                    case XcomTarget.STANDARD: value = await self._api.request_value(param, device_addr, retries=retries, timeout=timeout, verbose=verbose)
+                    case XcomTarget.VIRTUAL : value = await self._api.request_virtual(param, device_addr, retries=retries, timeout=timeout, verbose=verbose)
+                    
+                if value is not None:
+                    _LOGGER.info(f"  Found device {device_code} via {nr}:{device_addr}")
+
+                    devices.append( XcomDiscoveredDevice(device_code, device_addr, family.id, family.model) )
+
+                else:
+                    _LOGGER.info(f"  No device {device_code}; no value returned from Xcom client")
+
+            except Exception as e:
+                _LOGGER.info(f"  No device {device_code}; no value returned from Xcom client: {e}")
+
+                # Do not test further device addresses in this family
+                break
 
         return devices
 
 
+    async def _get_extended_device_infos(self, devices: list[XcomDiscoveredDevice], verbose = False):
+        """
+        Fill in the extended info of the devices, as many devices at the same time as the request_window allows
+        """
+        window = max(self._api.request_window, 1)
+        for idx in range(0, len(devices), window):
+            async with asyncio.TaskGroup() as task_group:
+                for device in devices[idx:idx+window]:
+                    task_group.create_task(self.get_extended_device_info(device, verbose))
+
+
+    @staticmethod
+    def _has_extended_info(devices: list[XcomDiscoveredDevice]) -> bool:
+        """
+        Whether the devices were discovered with extended info; some devices have none, so any device having it counts
+        """
+        return any(device.device_model or device.hw_version or device.sw_version or device.fid for device in devices)
+
+
+    def _is_virtual_family(self, family: XcomDeviceFamily) -> bool:
+        """
+        Whether the discovery nr of the family is a virtual datapoint, derived from responses to other requests
+        """
+        nr = self._get_discover_nr(family)
+        if not nr:
+            return False
+
+        try:
+            return self._dataset.get_by_nr(nr, family.id_for_nr).target == XcomTarget.VIRTUAL
+        except XcomDatapointUnknownException:
+            return False
+
+
+    @staticmethod
+    def _get_discover_nr(family: XcomDeviceFamily) -> int|None:
+        """
+        Get the specific discovery nr, or otherwise the first info nr or first param nr
+        """
+        return family.nr_discover or family.nr_infos_start or family.nr_params_start or None
+
+
+    async def discover_topology(self, cache: AsyncXcomTopologyCache|None = None, getExtendedInfo = False, verbose = False) -> XcomTopology:
+        """
+        Discover the remote Xcom client and the Studer devices reachable via it.
+
+        When a cache is passed and it holds a topology for the GUID of the client, the cached devices are
+        revalidated with one probe of all of them at once (combined into multi-info requests where possible).
+        If extended info is asked for and the cached devices lack it, it is fetched for these devices and cached as well.
+        A full discover_devices is only done when the GUID is not known yet, or when the probe fails.
+        The cache is updated, and saved if it has a path, after each full discovery.
+        """
+        client = await self.discover_client_info(verbose=verbose)
+
+        if cache is not None and client.guid is not None:
+            cached = cache.get(client.guid)
+            if cached is not None:
+                if await self._probe_devices(cached.devices, verbose=verbose):
+                    _LOGGER.info(f"Using cached topology for {client.guid} with {len(cached.devices)} devices")
+                    topology = XcomTopology(client, cached.devices)
+
+                    if getExtendedInfo and not self._has_extended_info(cached.devices):
+                        # Cached by a discovery without extended info; fetch it once for the cached devices
+                        await self._get_extended_device_infos(topology.devices, verbose)
+                        cache.put(topology)
+                        await cache.save()
+
+                    return topology
+
+                _LOGGER.info(f"Cached topology for {client.guid} is no longer valid; discovering all devices")
+
+        devices = await self.discover_devices(getExtendedInfo=getExtendedInfo, verbose=verbose)
+        topology = XcomTopology(client, devices)
+
+        if cache is not None and client.guid is not None:
+            cache.put(topology)
+            await cache.save()
+
+        return topology
+
+
+    async def _probe_devices(self, devices: list[XcomDiscoveredDevice], verbose=False) -> bool:
+        """
+        Check that all devices still respond on their address, using a single request_values call.
+        Returns False if any of the devices did not respond.
+        """
+        try:
+            items: list[XcomValuesItem] = []
+            for device in devices:
+                family = XcomDeviceFamilies.get_by_id(device.family_id)
+                param = self._dataset.get_by_nr(self._get_discover_nr(family), family.id_for_nr)
+                items.append(XcomValuesItem(param, address=device.addr))
+
+            rsp_data = await self._api.request_values(XcomValues(items), verbose=verbose)
+
+            return all(item.error is None and item.value is not None for item in rsp_data.items)
+
+        except Exception as e:
+            _LOGGER.info(f"  Probe of cached devices failed: {e}")
+            return False
+
+
     async def get_extended_device_info(self, device: XcomDiscoveredDevice, verbose=False) -> XcomDiscoveredDevice:
         # ID type
         # ID HW
@@ -123,13 +283,25 @@ class AsyncXcomDiscover:
             _LOGGER.info(f"Trying to get extended device info for device {device.code})")
             family = XcomDeviceFamilies.get_by_id(device.family_id)
 
-            id_type    = await self._request_value_by_name("ID type",     family.id, device.addr, verbose=verbose)
-            id_hw      = await self._request_value_by_name("ID HW",       family.id, device.addr, verbose=verbose)
-            id_hw_pwr  = await self._request_value_by_name("ID HW PWR",   family.id, device.addr, verbose=verbose)
-            id_sw_msb  = await self._request_value_by_name("ID SOFT msb", family.id, device.addr, verbose=verbose)
-            id_sw_lsb  = await self._request_value_by_name("ID SOFT lsb", family.id, device.addr, verbose=verbose)
-            id_fid_msb = await self._request_value_by_name("ID FID msb",  family.id, device.addr, verbose=verbose)
-            id_fid_lsb = await self._request_value_by_name("ID FID lsb",  family.id, device.addr, verbose=verbose)
+            # Request all ID values at once; request_values combines the infos into multi-info requests
+            # and falls back to one-by-one requests if the Xcom client does not support these.
+            names = ["ID type", "ID HW", "ID HW PWR", "ID SOFT msb", "ID SOFT lsb", "ID FID msb", "ID FID lsb"]
+            params: dict[str, XcomDatapoint] = {}
+            for name in names:
+                try:
+                    params[name] = self._dataset.get_by_name(name, family.id)
+                except XcomDatapointUnknownException:
+                    # Not all devices have these IDs
+                    pass
+
+            req_data = XcomValues([XcomValuesItem(param, address=device.addr) for param in params.values()])
+            rsp_data = await self._api.request_values(req_data, verbose=verbose)
+
+            values = { item.datapoint.nr: item.value for item in rsp_data.items if item.error is None }
+            id_type, id_hw, id_hw_pwr, id_sw_msb, id_sw_lsb, id_fid_msb, id_fid_lsb = [
+                values.get(params[name].nr, None) if name in params else None
+                for name in names
+            ]
 
             device.device_model = self._decode_type(id_type, "ID type", family.id_for_nr)
             device.hw_version   = self._decode_id_hw(id_hw, id_hw_pwr)
@@ -142,15 +314,6 @@ class AsyncXcomDiscover:
             _LOGGER.warning(f"  Exception in getExtendedDeviceInfo: {e}")
 
         return device
-
-
-    async def _request_value_by_name(self, param_name, family_id, device_addr, verbose=False):
-        try:
-            param = self._dataset.get_by_name(param_name, family_id)
-            return await self._api.request_value(param, device_addr, verbose=verbose)
-        except:
-            # Not all devices have these IDs
-            return None
         
 
     def _decode_type(self, val, param_name, family_id):
@@ -6,18 +6,22 @@
 
 import asyncio
 import binascii
-from datetime import datetime, timedelta
-import decimal
+import hashlib
+import importlib.metadata
 import logging
 import math
 import orjson
+import os
+import pickle
+import time
 
 from aiofiles import open as aiofiles_open
 from io import BufferedReader
 
 from .const import (
     REQ_TIMEOUT,
-    XcomVoltage
+    XcomApiUnpackException,
+    XcomVoltage,
 )
 from .data import (
     AsyncReader,
@@ -27,6 +31,7 @@ from .data import (
 from .datapoints import (
     XcomDatapoint,
     XcomDataset,
+    XcomLazyDataset,
 )
 from .messages import (
     XcomMessageDef, 
@@ -45,67 +50,145 @@ _LOGGER = logging.getLogger(__name__)
 class AsyncXcomFactory:
 
     @staticmethod
-    async def create_dataset(voltageAC:str=XcomVoltage.AC240, voltageDC:str=XcomVoltage.DC48) -> XcomDataset:
+    async def create_dataset(voltageAC:str=XcomVoltage.AC240, voltageDC:str=XcomVoltage.DC48, use_cache:bool=True, lazy:bool=False, cache_dir:str|None=None) -> XcomDataset:
         """
         The actual XcomDataset list is kept in a separate json file to reduce the memory size needed to load the integration.
         The list is only loaded during config flow and during initial startup, and then released again.
+
+        The created list is also stored in a binary snapshot in cache_dir (default XcomDataset.CACHE_DIR, in the user cache dir).
+        The snapshot is keyed by the package version and the size and modification time of the json sources. 
+        As long as these do not change, later calls load the snapshot without reading, parsing and merging the json.
+
+        With lazy=True an XcomLazyDataset is returned instead. It only keeps the raw json records and builds
+        each datapoint the first time it is looked up, so it can stay loaded at a fraction of the memory.
         """
-        async with aiofiles_open(XcomDataset.PATH_120V, "r", encoding="UTF-8") as file_120vac:
+        cache_path = AsyncXcomFactory._get_dataset_cache_path(voltageAC, voltageDC, cache_dir) if use_cache and not lazy else None
+        if cache_path is not None:
+            try:
+                async with aiofiles_open(cache_path, "rb") as file_cache:
+                    datapoints = pickle.loads(await file_cache.read())
+
+                _LOGGER.info(f"Using {len(datapoints)} cached datapoints for {str(voltageAC)} and {str(voltageDC)}")
+                return XcomDataset(datapoints)
+
+            except Exception as ex:
+                _LOGGER.debug(f"Cached datapoints not available in '{cache_path}': {ex}")
+
+        async with aiofiles_open(XcomDataset.PATH_120V, "rb") as file_120vac:
             text_120vac = await file_120vac.read()
-        async with aiofiles_open(XcomDataset.PATH_240V, "r", encoding="UTF-8") as file_240vac:
+        async with aiofiles_open(XcomDataset.PATH_240V, "rb") as file_240vac:
             text_240vac = await file_240vac.read()
-        async with aiofiles_open(XcomDataset.PATH_XCOM, "r", encoding="UTF-8") as file_xcom:
+        async with aiofiles_open(XcomDataset.PATH_XCOM, "rb") as file_xcom:
             text_xcom = await file_xcom.read()
-        
-        values_120vac = orjson.loads(text_120vac)
-        values_240vac = orjson.loads(text_240vac)
-        values_xcom   = orjson.loads(text_xcom)
 
-        datapoints_120vac = list(filter(None, [XcomDatapoint.from_dict(val) for val in values_120vac]))
-        datapoints_240vac = list(filter(None, [XcomDatapoint.from_dict(val) for val in values_240vac]))
-        datapoints_xcom   = list(filter(None, [XcomDatapoint.from_dict(val) for val in values_xcom]))
+        if lazy:
+            records = AsyncXcomFactory._create_records(voltageAC, text_120vac, text_240vac, text_xcom)
+            mult = AsyncXcomFactory._get_voltage_mult(voltageDC)
+
+            _LOGGER.info(f"Using {len(records)} lazy datapoints for {str(voltageAC)} and {str(voltageDC)}")
+            return XcomLazyDataset(records, mult)
+
+        datapoints = AsyncXcomFactory._create_datapoints(voltageAC, voltageDC, text_120vac, text_240vac, text_xcom)
+
+        if cache_path is not None:
+            try:
+                # Write to a temporary file first, so a concurrent create never reads a partial snapshot
+                os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+                async with aiofiles_open(f"{cache_path}.{os.getpid()}", "wb") as file_cache:
+                    await file_cache.write(pickle.dumps(datapoints, protocol=pickle.HIGHEST_PROTOCOL))
+                os.replace(f"{cache_path}.{os.getpid()}", cache_path)
+
+            except Exception as ex:
+                _LOGGER.debug(f"Failed to cache datapoints in '{cache_path}': {ex}")
+
+        _LOGGER.info(f"Using {len(datapoints)} datapoints for {str(voltageAC)} and {str(voltageDC)}")
+        return XcomDataset(datapoints)
+
+
+    @staticmethod
+    def _get_dataset_cache_path(voltageAC:str, voltageDC:str, cache_dir:str|None = None) -> str:
+        """
+        Path of the binary snapshot; changes whenever the package version, any of the json sources or the snapshot format changes.
+        The sources are only checked on size and modification time, so they do not need to be read.
+        """
+        try:
+            version = importlib.metadata.version("pystuderxcom")
+        except importlib.metadata.PackageNotFoundError:
+            version = "unknown"
+
+        digest = hashlib.sha256(version.encode())
+        for path in [XcomDataset.PATH_120V, XcomDataset.PATH_240V, XcomDataset.PATH_XCOM]:
+            stat = os.stat(path)
+            digest.update(f"{path}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+
+        name = f"datapoints_{str(voltageAC).replace(' ','')}_{str(voltageDC).replace(' ','')}_v{XcomDataset.CACHE_VERSION}_{digest.hexdigest()[:16]}.pickle"
+        return os.path.join(cache_dir or XcomDataset.CACHE_DIR, name)
+
+
+    @staticmethod
+    def _create_records(voltageAC:str, text_120vac: bytes, text_240vac: bytes, text_xcom: bytes) -> list[dict]:
+        """
+        Parse the json sources and merge them into one list of raw datapoint records for the given AC voltage
+        """
+        records_120vac = list(filter(XcomDatapoint.is_valid_dict, orjson.loads(text_120vac)))
+        records_240vac = list(filter(XcomDatapoint.is_valid_dict, orjson.loads(text_240vac)))
+        records_xcom   = list(filter(XcomDatapoint.is_valid_dict, orjson.loads(text_xcom)))
 
         # start with the merged 240v + xcom lists as base
-        datapoints = datapoints_240vac + datapoints_xcom
+        records = records_240vac + records_xcom
 
         match voltageAC:
             case XcomVoltage.AC240:
                 pass
             case XcomVoltage.AC120:
                 # Merge the 120v list into the 240v one by replacing duplicates. This maintains the order of menu items
-                for dp120 in datapoints_120vac:
+                index = {(rec['nr'], rec['fam']): idx for idx,rec in reversed(list(enumerate(records)))}
+                for rec120 in records_120vac:
                     # already in result?
-                    index = next( (idx for idx,dp240 in enumerate(datapoints) if dp120.nr == dp240.nr and dp120.family_id == dp240.family_id ), None)
-                    if index is not None:
-                        datapoints[index] = dp120
+                    idx = index.get( (rec120['nr'], rec120['fam']) )
+                    if idx is not None:
+                        records[idx] = rec120
             case _:
                 msg = f"Unknown AC voltage: '{voltageAC}'"
                 raise Exception(msg)
-        
-        # Standard list is for 48vdc. Adapt for 12 or 24vdc if needed.
+
+        return records
+
+
+    @staticmethod
+    def _get_voltage_mult(voltageDC:str) -> float:
+        """
+        Standard list is for 48vdc. Returns the multiplier to adapt it for 12 or 24vdc.
+        """
         match voltageDC:
-            case XcomVoltage.DC48: mult = 1.0
-            case XcomVoltage.DC24: mult = 0.5
-            case XcomVoltage.DC12: mult = 0.25
+            case XcomVoltage.DC48: return 1.0
+            case XcomVoltage.DC24: return 0.5
+            case XcomVoltage.DC12: return 0.25
             case _: 
                 msg = f"Unknown DC voltage: '{voltageDC}'"
                 raise Exception(msg)
-            
-        for idx,dp in enumerate(datapoints):
-            if dp.unit=="Vdc" and \
-               dp.min is not None and dp.min > 24.0 and \
-               dp.max is not None and dp.max < 96.0:
 
-                d = decimal.Decimal(str(dp.inc)) if dp.inc is not None else decimal('1')
-                digits = d.as_tuple().exponent * -1
 
-                dp.default = round(mult * dp.default, digits) if dp.default is not None else None
-                dp.min     = round(mult * dp.min    , digits) if dp.min     is not None else None
-                dp.max     = round(mult * dp.max    , digits) if dp.max     is not None else None
-                datapoints[idx] = dp
+    @staticmethod
+    def _create_datapoints(voltageAC:str, voltageDC:str, text_120vac: bytes, text_240vac: bytes, text_xcom: bytes) -> list[XcomDatapoint]:
+        """
+        Parse the json sources and merge them into one list of datapoints for the given voltages
+        """
+        records = AsyncXcomFactory._create_records(voltageAC, text_120vac, text_240vac, text_xcom)
+        mult = AsyncXcomFactory._get_voltage_mult(voltageDC)
 
-        _LOGGER.info(f"Using {len(datapoints)} datapoints for {str(voltageAC)} and {str(voltageDC)}")
-        return XcomDataset(datapoints)
+        datapoints = [XcomDatapoint.from_dict(rec) for rec in records]
+        for dp in datapoints:
+            dp.scale_voltage(mult)
+
+        # Many enum datapoints have identical options (e.g. No/Yes); let those share one dict.
+        # The options are considered read-only, so sharing is safe.
+        shared_options = {}
+        for dp in datapoints:
+            if dp.options is not None:
+                dp.options = shared_options.setdefault(tuple(dp.options.items()), dp.options)
+
+        return datapoints
 
 
     @staticmethod
@@ -130,35 +213,62 @@ class AsyncXcomFactory:
 
     @staticmethod
     async def parse_package(f: BufferedReader, timeout:float=REQ_TIMEOUT, verbose=False) -> XcomPackage:
+        """
+        Parse one package from a stream; any bytes before the start byte are skipped.
+        All bytes are collected in one buffer, and never more are read than the package needs,
+        so the next package can be parsed from the same stream.
+        """
+        # Smallest read that can still hold the start byte, header and header checksum
+        size = 1 + XcomHeader.length + 2
+        buf = bytearray()
+        searched = 0
+        deadline = time.monotonic() + timeout
+
         # package sometimes starts with 0xff
-        skipped = bytearray(b'')
-        ts_end = datetime.now() + timedelta(seconds=timeout)
+        while (start := buf.find(XcomPackage.start_byte, searched)) < 0:
+            if time.monotonic() >= deadline:
+                raise XcomApiUnpackException(f"No start-byte found within {timeout} seconds ({binascii.hexlify(buf).decode('ascii')})")
+
+            data = await read_bytes(f, size)
+            if not data:
+                raise XcomApiUnpackException(f"No start-byte found ({binascii.hexlify(buf).decode('ascii')})")
 
-        while datetime.now() < ts_end:
-            sb = await read_bytes(f, 1)
-            if sb == XcomPackage.start_byte:
-                break
+            searched = len(buf)
+            buf.extend(data)
 
-            skipped.extend(sb)
+        if verbose and start > 0:
+            _LOGGER.debug(f"skip {start} bytes until start-byte ({binascii.hexlify(buf[:start]).decode('ascii')})")
 
-        if verbose and len(skipped) > 0:
-            _LOGGER.debug(f"skip {len(skipped)} bytes until start-byte ({binascii.hexlify(skipped).decode('ascii')})")
+        # Complete the header and its checksum, and validate it before trusting its data_length
+        if len(buf) < start + size:
+            buf.extend(await read_bytes(f, start + size - len(buf)))
 
-        h_raw = await read_bytes(f, XcomHeader.length)
-        h_chk = await read_bytes(f, 2)
-        assert XcomPackage.checksum(h_raw) == h_chk
-        header = XcomHeader.parse_bytes(h_raw)
+        h_start = start + 1
+        h_end = h_start + XcomHeader.length
+        if len(buf) < start + size or XcomPackage.checksum(buf[h_start:h_end]) != buf[h_end:h_end+2]:
+            raise XcomApiUnpackException(f"Invalid package header ({binascii.hexlify(buf[start:]).decode('ascii')})")
 
-        f_raw = await read_bytes(f, header.data_length)
-        f_chk = await read_bytes(f, 2)
-        assert XcomPackage.checksum(f_raw) == f_chk
-        frame = XcomFrame.parse_bytes(f_raw)
+        header = XcomHeader.parse_buffer(buf, h_start)
+        buf.extend(await read_bytes(f, header.data_length + 2))
 
-        return XcomPackage(header, frame)
+        package,_,_ = XcomPackage.parse_buffer(buf, start)
+        if package is None:
+            raise XcomApiUnpackException(f"Incomplete package ({binascii.hexlify(buf[start:]).decode('ascii')})")
+
+        return package
 
 
     @staticmethod
     async def parse_package_bytes(buf: bytes, timeout:float=REQ_TIMEOUT, verbose=False) -> XcomPackage:
-        reader = AsyncReader(buf)
-        return await AsyncXcomFactory.parse_package(reader, timeout, verbose)
-    
+        """
+        Parse a package from a received buffer; any bytes before the start byte are skipped
+        """
+        package, start, _ = XcomPackage.parse_buffer(buf)
+
+        if verbose and start > 0:
+            _LOGGER.debug(f"skip {start} bytes until start-byte ({binascii.hexlify(buf[:start]).decode('ascii')})")
+
+        if package is None:
+            raise XcomApiUnpackException(f"Incomplete package ({binascii.hexlify(buf).decode('ascii')})")
+
+        return package
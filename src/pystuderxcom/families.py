@@ -5,7 +5,8 @@
 import logging
 
 from dataclasses import dataclass
-from typing import Any
+from types import MappingProxyType
+from typing import Any, Mapping
 
 from .const import (
     XcomAggregationType,
@@ -150,46 +151,66 @@ class XcomDeviceFamilies:
 
     @staticmethod
     def get_by_id(id: str) -> XcomDeviceFamily:
-        for f in XcomDeviceFamilies.get_list():
-            if id == f.id:
-                return f
+        family = XcomDeviceFamilies._id_to_family_map.get(id, None)
+        if family is None:
+            raise XcomDeviceFamilyUnknownException(id)
 
-        raise XcomDeviceFamilyUnknownException(id)
+        return family
 
 
     @staticmethod
     def get_list() -> list[XcomDeviceFamily]:
-        return [val for val in XcomDeviceFamilies.__dict__.values() if type(val) is XcomDeviceFamily]
+        return list(XcomDeviceFamilies._families)
 
 
-    # Static variables to cache helper mappings
-    _code_to_family_map: dict[str,XcomDeviceFamily] = None
-    _code_to_addr_map: dict[str,int] = None
-    _code_to_aggr_map: dict[int,XcomAggregationType] = None
-    _addr_to_aggr_map: dict[str,int] = None
+    # Static variables holding helper mappings; filled once at import by _build_static_maps()
+    _families: tuple[XcomDeviceFamily, ...] = ()
+    _id_to_family_map: Mapping[str,XcomDeviceFamily] = MappingProxyType({})
+    _code_map: Mapping[str,tuple[XcomDeviceFamily,int,XcomAggregationType|None]] = MappingProxyType({})
+    _addr_to_aggr_map: Mapping[int,XcomAggregationType|None] = MappingProxyType({})
+    _family_addr_to_code_map: Mapping[tuple[str,int],str] = MappingProxyType({})
+    _family_aggr_to_addr_map: Mapping[tuple[str,XcomAggregationType|None],int] = MappingProxyType({})
 
     @staticmethod
     def _build_static_maps():
-        """Fill static variable once"""
-        if XcomDeviceFamilies._code_to_family_map is None:
-
-            XcomDeviceFamilies._code_to_family_map = {}
-            XcomDeviceFamilies._code_to_addr_map = {}
-            XcomDeviceFamilies._code_to_aggr_map = {}
-            XcomDeviceFamilies._addr_to_aggr_map = {}
-            # Note: no _addr_to_code_map because address range for BMS and BSP overlap
-
-            for f in XcomDeviceFamilies.get_list():
-                has_aggr = f not in [XcomDeviceFamilies.L1, XcomDeviceFamilies.L2, XcomDeviceFamilies.L3]
-
-                for addr in range(f.addr_devices_start, f.addr_devices_end+1):
-                    code = f.get_code(addr)
-                    aggr = XcomAggregationType(addr - f.addr_devices_start + 1) if has_aggr else None
-                    
-                    XcomDeviceFamilies._code_to_family_map[code] = f
-                    XcomDeviceFamilies._code_to_addr_map[code] = addr # XT1-XT9 -> 101-109,  VT1-VT15 -> 301-315,  VS1-VS15 -> 701-715
-                    XcomDeviceFamilies._code_to_aggr_map[code] = aggr # XT1-XT9 -> 1-9,      VT1-VT15 -> 1-15,     VS1-VS15 -> 1-15
-                    XcomDeviceFamilies._addr_to_aggr_map[addr] = aggr # 101-109 -> 1-9,      301-315  -> 1-15,     701-715  -> 1-15
+        """Fill static variables; called once when this module is imported"""
+        families = tuple(val for val in XcomDeviceFamilies.__dict__.values() if type(val) is XcomDeviceFamily)
+
+        id_to_family_map = {}
+        code_map = {}
+        addr_to_aggr_map = {}
+        family_addr_to_code_map = {}
+        family_aggr_to_addr_map = {}
+        # Note: no addr_to_code_map because address range for BMS and BSP overlap.
+        # Instead the family id is part of the key in family_addr_to_code_map.
+
+        for f in families:
+            id_to_family_map.setdefault(f.id, f)
+            has_aggr = f not in [XcomDeviceFamilies.L1, XcomDeviceFamilies.L2, XcomDeviceFamilies.L3]
+
+            for addr in range(f.addr_devices_start, f.addr_devices_end+1):
+                code = f.get_code(addr)
+                aggr = XcomAggregationType(addr - f.addr_devices_start + 1) if has_aggr else None
+
+                code_map[code] = (f, addr, aggr)    # XT1-XT9 -> 101-109, 1-9,   VT1-VT15 -> 301-315, 1-15,   VS1-VS15 -> 701-715, 1-15
+                addr_to_aggr_map[addr] = aggr       # 101-109 -> 1-9,      301-315  -> 1-15,     701-715  -> 1-15
+
+            # Lookup by family id also matches families that use the numbers of another family (L1 -> xt).
+            # The first family in the list wins, same as when the list is searched sequentially.
+            for family_id in (f.id, f.id_for_nr):
+                for addr in [f.addr_multicast] + list(range(f.addr_devices_start, f.addr_devices_end+1)):
+                    family_addr_to_code_map.setdefault((family_id, addr), f.get_code(addr))
+
+        for f in families:
+            for addr in range(f.addr_devices_start, f.addr_devices_end+1):
+                family_aggr_to_addr_map.setdefault((f.id, addr_to_aggr_map.get(addr, None)), addr)
+
+        XcomDeviceFamilies._families = families
+        XcomDeviceFamilies._id_to_family_map = MappingProxyType(id_to_family_map)
+        XcomDeviceFamilies._code_map = MappingProxyType(code_map)
+        XcomDeviceFamilies._addr_to_aggr_map = MappingProxyType(addr_to_aggr_map)
+        XcomDeviceFamilies._family_addr_to_code_map = MappingProxyType(family_addr_to_code_map)
+        XcomDeviceFamilies._family_aggr_to_addr_map = MappingProxyType(family_aggr_to_addr_map)
 
 
     @staticmethod
@@ -197,9 +218,8 @@ class XcomDeviceFamilies:
         """
         Lookup the code to find the device family
         """
-        XcomDeviceFamilies._build_static_maps()
-
-        return  XcomDeviceFamilies._code_to_family_map.get(code, None)
+        entry = XcomDeviceFamilies._code_map.get(code, None)
+        return entry[0] if entry is not None else None
     
 
     @staticmethod
@@ -207,9 +227,8 @@ class XcomDeviceFamilies:
         """
         Lookup the code to find the addr
         """
-        XcomDeviceFamilies._build_static_maps()
-
-        return XcomDeviceFamilies._code_to_addr_map.get(code, None)
+        entry = XcomDeviceFamilies._code_map.get(code, None)
+        return entry[1] if entry is not None else None
 
 
     @staticmethod
@@ -217,9 +236,8 @@ class XcomDeviceFamilies:
         """
         Lookup the code to find the aggregation_type
         """
-        XcomDeviceFamilies._build_static_maps()
-        
-        return XcomDeviceFamilies._code_to_aggr_map.get(code, None)
+        entry = XcomDeviceFamilies._code_map.get(code, None)
+        return entry[2] if entry is not None else None
 
 
     @staticmethod
@@ -228,14 +246,7 @@ class XcomDeviceFamilies:
         Lookup the addr to find the code.
         Family is passed as hint because BMS and BSP use same address range
         """
-        for family in XcomDeviceFamilies.get_list():
-            if family.id == family_id or family.id_for_nr == family_id:
-                try:
-                    return family.get_code(addr)
-                except:
-                    pass
-        
-        return None
+        return XcomDeviceFamilies._family_addr_to_code_map.get((family_id, addr), None)
 
 
     @staticmethod
@@ -244,8 +255,6 @@ class XcomDeviceFamilies:
         Lookup the device address to find the aggregation_type
         Note that addr 601 can either be BMS or BSP. However, both result in XcomAggregationType=1 so we don't care...
         """
-        XcomDeviceFamilies._build_static_maps()
-        
         return XcomDeviceFamilies._addr_to_aggr_map.get(addr, None)
     
 
@@ -268,11 +277,10 @@ class XcomDeviceFamilies:
         Reverse lookup an aggregation_type to find the corresponding device address within a family.
         Note that some aggregation_types (AVERAGE,SUM) will result in a None response.
         """
-        XcomDeviceFamilies._build_static_maps()
-        family = XcomDeviceFamilies.get_by_id(family_id)
-
-        for addr in range(family.addr_devices_start, family.addr_devices_end+1):
-            if XcomDeviceFamilies._addr_to_aggr_map.get(addr, None) == aggr:
-                return addr
-            
-        return None
+        if family_id not in XcomDeviceFamilies._id_to_family_map:
+            raise XcomDeviceFamilyUnknownException(family_id)
+
+        return XcomDeviceFamilies._family_aggr_to_addr_map.get((family_id, aggr), None)
+
+
+XcomDeviceFamilies._build_static_maps()
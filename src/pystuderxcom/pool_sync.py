@@ -0,0 +1,200 @@
+# Do not edit this file directly. It has been autogenerated from
+# src\pystuderxcom\pool_async.py
+##
+## Class implementing a pool of Xcom gateways that are used together from one event loop
+##
+
+import asyncio
+import logging
+
+from .api_base_async import (
+    AsyncXcomApiBase,
+)
+from .api_base_sync import (
+    XcomApiBase,
+)
+from .const import (
+    START_TIMEOUT,
+    XcomParamException,
+)
+from .values import (
+    XcomValues,
+)
+import concurrent.futures
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class XcomGatewayPool:
+
+    def __init__(self):
+        """
+        Own several api instances, one per Xcom gateway (site), and use them together.
+        Gateways are started, stopped and polled concurrently. Request pacing (REQ_BURST_PERIOD)
+        is done by each api instance itself, so a busy gateway never slows down the others.
+        """
+        self._gateways: dict[str, XcomApiBase] = {}
+
+        # Diagnostics gathering
+        self._diag_errors: dict[str, int] = {}
+        self._diag_last_error: dict[str, str] = {}
+
+
+    def add(self, name: str, api: XcomApiBase):
+        """
+        Add a gateway to the pool under a unique name
+        """
+        if name in self._gateways:
+            raise XcomParamException(f"Gateway '{name}' is already part of the pool")
+
+        self._gateways[name] = api
+        self._diag_errors[name] = 0
+
+
+    def remove(self, name: str) -> XcomApiBase|None:
+        """
+        Remove a gateway from the pool. Does not stop it.
+        """
+        self._diag_errors.pop(name, None)
+        self._diag_last_error.pop(name, None)
+        return self._gateways.pop(name, None)
+
+
+    def get(self, name: str) -> XcomApiBase|None:
+        return self._gateways.get(name, None)
+
+
+    @property
+    def names(self) -> list[str]:
+        return list(self._gateways.keys())
+
+
+    @property
+    def connected(self) -> dict[str, bool]:
+        return { name: api.connected for name, api in self._gateways.items() }
+
+
+    def __len__(self):
+        return len(self._gateways)
+
+
+    def __contains__(self, name: str):
+        return name in self._gateways
+
+
+    def start(self, timeout=START_TIMEOUT) -> dict[str, bool]:
+        """
+        Start all gateways at the same time.
+        Returns per gateway whether it was started; a gateway that fails to start does not affect the others.
+        """
+        names = list(self._gateways.keys())
+
+        with concurrent.futures.ThreadPoolExecutor() as executor:
+            tasks = [executor.submit(self._start_gateway, name, timeout) for name in names]
+
+        return { name: task.result() for name, task in zip(names, tasks) }
+
+
+    def stop(self):
+        """
+        Stop all gateways at the same time
+        """
+        names = list(self._gateways.keys())
+
+        with concurrent.futures.ThreadPoolExecutor() as executor:
+            for name in names:
+                executor.submit(self._stop_gateway, name)
+
+
+    def request_values(self, request_data: dict[str, XcomValues], retries = None, timeout = None, verbose=False) -> dict[str, XcomValues|None]:
+        """
+        Request values from several gateways at the same time; request_data holds the XcomValues per gateway name.
+        Each gateway combines its values into as few requests as possible, see AsyncXcomApiBase.request_values.
+
+        Returns the XcomValues per gateway name. A gateway that is not connected or that failed
+        has None as result; the failure is logged and counted in the diagnostics.
+        """
+        for name in request_data.keys():
+            if name not in self._gateways:
+                raise XcomParamException(f"Gateway '{name}' is not part of the pool")
+
+        names = list(request_data.keys())
+
+        with concurrent.futures.ThreadPoolExecutor() as executor:
+            tasks = [executor.submit(self._request_values_gateway, name, request_data[name], retries=retries, timeout=timeout, verbose=verbose) for name in names]
+
+        return { name: task.result() for name, task in zip(names, tasks) }
+
+
+    def _start_gateway(self, name: str, timeout) -> bool:
+        try:
+            return self._gateways[name].start(timeout=timeout)
+
+        except Exception as ex:
+            self._add_error(name, ex)
+            return False
+
+
+    def _stop_gateway(self, name: str):
+        try:
+            self._gateways[name].stop()
+
+        except Exception as ex:
+            self._add_error(name, ex)
+
+
+    def _request_values_gateway(self, name: str, request_data: XcomValues, retries = None, timeout = None, verbose=False) -> XcomValues|None:
+        api = self._gateways[name]
+        if not api.connected:
+            return None
+
+        try:
+            return api.request_values(request_data, retries=retries, timeout=timeout, verbose=verbose)
+
+        except Exception as ex:
+            self._add_error(name, ex)
+            return None
+
+
+    def _add_error(self, name: str, ex: Exception):
+        _LOGGER.warning(f"Gateway '{name}' failed: {ex!r}")
+
+        self._diag_errors[name] = self._diag_errors.get(name, 0) + 1
+        self._diag_last_error[name] = repr(ex)
+
+
+    def get_diagnostics(self):
+        """
+        Returns the diagnostics of all gateways, plus the statistics summed over all gateways
+        """
+        gateways = {}
+        retries = {}
+        durations = {}
+        skipped = 0
+
+        for name, api in self._gateways.items():
+            diag = api.get_diagnostics()
+            gateways[name] = diag | {
+                "connected": api.connected,
+                "errors": self._diag_errors.get(name, 0),
+                "last_error": self._diag_last_error.get(name, None),
+            }
+
+            for key, count in diag["statistics"]["retries"].items():
+                retries[key] = retries.get(key, 0) + count
+            for key, count in diag["statistics"]["durations"].items():
+                durations[key] = durations.get(key, 0) + count
+            skipped += diag["statistics"]["skipped"]
+
+        return {
+            "statistics": {
+                "gateways": len(self._gateways),
+                "connected": sum(1 for api in self._gateways.values() if api.connected),
+                "errors": sum(self._diag_errors.values()),
+                "retries": dict(sorted(retries.items())),
+                "durations": dict(sorted(durations.items())),
+                "skipped": skipped,
+            },
+            "gateways": gateways,
+        }
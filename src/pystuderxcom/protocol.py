@@ -10,7 +10,9 @@
 
 import asyncio
 import binascii
+import collections
 import io
+import itertools
 import logging
 import struct
 
@@ -21,6 +23,7 @@ from .const import (
     ScomAddress,
     ScomErrorCode,
     ScomServiceFlag,
+    XcomApiUnpackException,
 )
 from .data import (
     XcomData,
@@ -86,6 +89,8 @@ class XcomFrame:
     service_id: int
     service_data: XcomService
 
+    _struct = struct.Struct("<BBHIH")   # service_flags, service_id, object_type, object_id, property_id
+
     @staticmethod
     def parse(f: BufferedReader):
         return XcomFrame(
@@ -96,7 +101,22 @@ class XcomFrame:
 
     @staticmethod
     def parse_bytes(buf: bytes):
-        return XcomFrame.parse(BytesIO(buf))
+        return XcomFrame.parse_buffer(buf, 0, len(buf))
+
+    @staticmethod
+    def parse_buffer(buf: bytes|bytearray|memoryview, offset: int, length: int):
+        """Parse the frame directly from a receive buffer, without intermediate stream objects"""
+        service_flags, service_id, object_type, object_id, property_id = XcomFrame._struct.unpack_from(buf, offset)
+        return XcomFrame(
+            service_flags = service_flags,
+            service_id = service_id,
+            service_data = XcomService(
+                object_type = object_type,
+                object_id = object_id,
+                property_id = property_id,
+                property_data = bytes(buf[offset+XcomFrame._struct.size : offset+length]),
+            ),
+        )
 
     def __init__(self, service_id: bytes, service_data: XcomService, service_flags=0):
         self.service_flags = service_flags
@@ -128,6 +148,7 @@ class XcomHeader:
     data_length: int
 
     length: int = 1 + 4 + 4 + 2
+    _struct = struct.Struct("<BIIH")    # frame_flags, src_addr, dst_addr, data_length
 
     @staticmethod
     def parse(f: BufferedReader):
@@ -140,7 +161,18 @@ class XcomHeader:
 
     @staticmethod
     def parse_bytes(buf: bytes):
-        return XcomHeader.parse(BytesIO(buf))
+        return XcomHeader.parse_buffer(buf, 0)
+
+    @staticmethod
+    def parse_buffer(buf: bytes|bytearray|memoryview, offset: int):
+        """Parse the header directly from a receive buffer, without intermediate stream objects"""
+        frame_flags, src_addr, dst_addr, data_length = XcomHeader._struct.unpack_from(buf, offset)
+        return XcomHeader(
+            frame_flags = frame_flags,
+            src_addr = src_addr,
+            dst_addr = dst_addr,
+            data_length = data_length,
+        )
 
     def __init__(self, src_addr: int, dst_addr: int, data_length: int, frame_flags=0):
         assert frame_flags >= 0, "frame_flags must not be negative"
@@ -176,6 +208,12 @@ class XcomPackage():
     header: XcomHeader
     frame_data: XcomFrame
 
+    # Assembled bytes of earlier packages, keyed on all fields except property_id.
+    # Repeated polls only need a copy, and for multi-info requests a patch of the request id and frame checksum.
+    _templates: dict[tuple, bytes] = {}
+    _templates_max = 256
+    _property_id_offset = 1 + XcomHeader.length + 2 + 8    # start byte, header, checksum, frame up to property_id
+
     @staticmethod
     def gen_package(
             service_id: int,
@@ -196,6 +234,44 @@ class XcomPackage():
         self.header = header
         self.frame_data = frame_data
 
+    @staticmethod
+    def parse_buffer(buf: bytes|bytearray, offset: int = 0) -> tuple['XcomPackage|None', int, int]:
+        """
+        Parse one package directly from a receive buffer, starting the search for the start byte at offset.
+
+        Returns a tuple (package, start, end):
+          - package is None if the buffer does not yet hold a complete package
+          - start is the position of the start byte; any bytes before it can be discarded
+          - end is the position just after the package
+        Throws XcomApiUnpackException if a checksum does not match
+        """
+        start = buf.find(XcomPackage.start_byte, offset)
+        if start < 0:
+            return (None, len(buf), len(buf))
+
+        h_start = start + 1
+        h_end = h_start + XcomHeader.length
+        if len(buf) < h_end + 2:
+            return (None, start, start)
+
+        view = memoryview(buf)
+        if XcomPackage.checksum(view[h_start:h_end]) != view[h_end:h_end+2]:
+            raise XcomApiUnpackException(f"Header checksum mismatch at position {start}")
+
+        header = XcomHeader.parse_buffer(buf, h_start)
+
+        f_start = h_end + 2
+        f_end = f_start + header.data_length
+        if len(buf) < f_end + 2:
+            return (None, start, start)
+
+        if XcomPackage.checksum(view[f_start:f_end]) != view[f_end:f_end+2]:
+            raise XcomApiUnpackException(f"Frame checksum mismatch at position {start}")
+
+        frame = XcomFrame.parse_buffer(buf, f_start, header.data_length)
+
+        return (XcomPackage(header, frame), start, f_end + 2)
+
     def assemble(self, f: BufferedWriter):
         write_bytes(f, self.start_byte)
 
@@ -210,10 +286,69 @@ class XcomPackage():
         # Don't write delimeter, seems not needed as we send the package in one whole chunk
         #write_bytes(f, self.delimeters)
 
+    def _encode(self) -> bytes:
+        """
+        Single-pass equivalent of assemble; packs all fields into one preallocated buffer
+        """
+        header = self.header
+        frame = self.frame_data
+        service = frame.service_data
+
+        h_start = 1
+        h_end = h_start + XcomHeader.length
+        f_start = h_end + 2
+        d_start = f_start + XcomFrame._struct.size
+        f_end = d_start + len(service.property_data)
+
+        buf = bytearray(f_end + 2)
+        buf[0] = XcomPackage.start_byte[0]
+        XcomHeader._struct.pack_into(buf, h_start, header.frame_flags, header.src_addr, header.dst_addr, header.data_length)
+        XcomFrame._struct.pack_into(buf, f_start, frame.service_flags, frame.service_id, service.object_type, service.object_id, service.property_id)
+        buf[d_start:f_end] = service.property_data
+
+        view = memoryview(buf)
+        buf[h_end:f_start] = XcomPackage.checksum(view[h_start:h_end])
+        buf[f_end:] = XcomPackage.checksum(view[f_start:f_end])
+        view.release()
+
+        return bytes(buf)
+
     def get_bytes(self) -> bytes:
-        buf = BytesIO()
-        self.assemble(buf)
-        return buf.getvalue()
+        header = self.header
+        frame = self.frame_data
+        service = frame.service_data
+        key = (header.frame_flags, header.src_addr, header.dst_addr, header.data_length, 
+               frame.service_flags, frame.service_id, 
+               service.object_type, service.object_id, bytes(service.property_data))
+
+        template = XcomPackage._templates.get(key)
+        if template is None:
+            template = self._encode()
+
+            if len(XcomPackage._templates) >= XcomPackage._templates_max:
+                XcomPackage._templates.clear()
+            XcomPackage._templates[key] = template
+            return template
+
+        # Same package apart from maybe the property_id; patch it and update the frame checksum to match
+        pos = XcomPackage._property_id_offset
+        old = template[pos:pos+2]
+        new = struct.pack("<H", service.property_id)
+        if old == new:
+            return template
+
+        buf = bytearray(template)
+        buf[pos:pos+2] = new
+
+        # Each frame byte at index i contributes once to A and (length-i) times to B
+        length = len(template) - (1 + XcomHeader.length + 2) - 2
+        idx = pos - (1 + XcomHeader.length + 2)
+        delta0 = new[0] - old[0]
+        delta1 = new[1] - old[1]
+        buf[-2] = (buf[-2] + delta0 + delta1) & 0xFF
+        buf[-1] = (buf[-1] + (length-idx)*delta0 + (length-idx-1)*delta1) & 0xFF
+
+        return bytes(buf)
     
     def is_response(self) -> bool:
         return self.frame_data.service_flags & ScomServiceFlag.IS_RESPONSE != 0
@@ -223,8 +358,12 @@ class XcomPackage():
 
     def get_error(self) -> str:
         if self.is_error():
-            error = XcomData.unpack(self.frame_data.service_data.property_data, XcomFormat.ERROR)
-            return ScomErrorCode.get_by_error(error)
+            return ScomErrorCode.get_by_error(self.get_error_code())
+        return None
+
+    def get_error_code(self) -> int|None:
+        if self.is_error():
+            return XcomData.unpack(self.frame_data.service_data.property_data, XcomFormat.ERROR)
         return None
  
     def __str__(self) -> str:
@@ -233,16 +372,72 @@ class XcomPackage():
 
     @staticmethod
     def checksum(data: bytes) -> bytes:
-        """Function to calculate the checksum needed for the header and the data"""
-        A = 0xFF
-        B = 0x00
+        """
+        Function to calculate the checksum needed for the header and the data.
 
-        for d in data:
-            A = (A + d) % 0x100
-            B = (B + A) % 0x100
+        This is a Fletcher-style checksum: A is the running sum of all bytes (starting at 0xFF)
+        and B is the sum of all intermediate values of A, both modulo 0x100.
+        Both sums are calculated using builtins that run in C, so there is no Python loop per byte.
+        """
+        A = (0xFF + sum(data)) & 0xFF
+        B = (sum(itertools.accumulate(data, initial=0xFF)) - 0xFF) & 0xFF
 
-        A = struct.pack("<B", A)
-        B = struct.pack("<B", B)
+        return bytes((A, B))
 
-        return A + B
 
+class XcomFramer():
+    """
+    Incremental framer for stream connections (tcp and serial).
+    Received chunks of any size are fed into it; complete and checksum-validated packages
+    are queued until retrieved, while any partial remainder is kept for the next chunk.
+    """
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._packages: collections.deque[XcomPackage] = collections.deque()
+        self.skipped = 0    # number of discarded bytes, for diagnostics
+
+    def __len__(self) -> int:
+        return len(self._packages)
+
+    def reset(self):
+        """Discard any buffered bytes and queued packages, e.g. after a reconnect"""
+        self._buffer.clear()
+        self._packages.clear()
+
+    def feed(self, data: bytes) -> int:
+        """
+        Add received bytes and parse all complete packages from them.
+        Returns the number of packages that became available.
+        """
+        self._buffer.extend(data)
+
+        count = 0
+        pos = 0
+        while True:
+            try:
+                package, start, end = XcomPackage.parse_buffer(self._buffer, pos)
+
+            except XcomApiUnpackException as ex:
+                # Not a real package; resync on the next start byte
+                start = self._buffer.find(XcomPackage.start_byte, pos)
+                _LOGGER.debug(f"Discard invalid package: {ex}")
+                self.skipped += start + 1 - pos
+                pos = start + 1
+                continue
+
+            self.skipped += start - pos
+            if package is None:
+                pos = start
+                break
+
+            self._packages.append(package)
+            count += 1
+            pos = end
+
+        del self._buffer[:pos]
+        return count
+
+    def get_package(self) -> XcomPackage | None:
+        """Returns the oldest complete package, or None if no package is available"""
+        return self._packages.popleft() if self._packages else None
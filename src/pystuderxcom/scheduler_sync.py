@@ -0,0 +1,170 @@
+# Do not edit this file directly. It has been autogenerated from
+# src\pystuderxcom\scheduler_async.py
+##
+## Class implementing a poll scheduler with a refresh interval per value
+##
+
+import asyncio
+import logging
+import time
+
+from .api_base_async import (
+    AsyncXcomApiBase,
+)
+from .api_base_sync import (
+    XcomApiBase,
+)
+from .const import (
+    POLL_INTERVAL_FAST,
+    POLL_INTERVAL_NORMAL,
+    POLL_INTERVAL_SLOW,
+    XcomCategory,
+    XcomParamException,
+)
+from .datapoints import (
+    XcomDatapoint,
+)
+from .values import (
+    XcomValues,
+    XcomValuesItem,
+)
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class XcomScheduleItem:
+    """
+    Administration of one registered value; when it was last polled and when it is due again.
+    Due times are on the time.monotonic() clock, so they are not affected by changes of the wall clock.
+    """
+    def __init__(self, item: XcomValuesItem, interval: float):
+        self.item = item
+        self.interval = interval
+        self.next_due: float = float("-inf")
+
+    def is_due(self, now: float) -> bool:
+        return self.next_due <= now
+
+
+class XcomScheduler:
+
+    def __init__(self, api: XcomApiBase):
+        """
+        Poll registered values, each at its own refresh interval.
+        Every tick, all values that are due are combined into as few requests as possible.
+        """
+        self._api = api
+        self._items: dict[tuple, XcomScheduleItem] = {}
+        self._running = False
+
+
+    @staticmethod
+    def get_default_interval(datapoint: XcomDatapoint) -> float:
+        """
+        Fast for power and current infos, slow for params and the ID-type infos, normal for all other infos.
+        """
+        if datapoint.category == XcomCategory.PARAMETER:
+            return POLL_INTERVAL_SLOW
+
+        if datapoint.name.startswith("ID "):
+            return POLL_INTERVAL_SLOW
+
+        if datapoint.unit in ["W", "kW", "VA", "kVA", "A", "Adc", "Aac"]:
+            return POLL_INTERVAL_FAST
+
+        return POLL_INTERVAL_NORMAL
+
+
+    @staticmethod
+    def _get_key(item: XcomValuesItem) -> tuple:
+        return (item.datapoint.nr, item.datapoint.family_id, item.code, item.address, item.aggregation_type)
+
+
+    def register(self, item: XcomValuesItem, interval: float|None = None):
+        """
+        Register a value to be polled. When no interval (in seconds) is given, a default is chosen based on the datapoint.
+        Registering an already known value again only updates its interval.
+        """
+        if interval is None:
+            interval = self.get_default_interval(item.datapoint)
+        elif interval <= 0:
+            raise XcomParamException(f"Invalid poll interval {interval}; must be more than 0")
+
+        key = self._get_key(item)
+
+        if key in self._items:
+            self._items[key].interval = interval
+        else:
+            self._items[key] = XcomScheduleItem(item, interval)
+
+
+    def unregister(self, item: XcomValuesItem):
+        """
+        Stop polling a value
+        """
+        self._items.pop(self._get_key(item), None)
+
+
+    @property
+    def items(self) -> list[XcomValuesItem]:
+        """Returns all registered values"""
+        return [s.item for s in self._items.values()]
+
+
+    def get_due_items(self, now: float|None = None) -> list[XcomValuesItem]:
+        """Returns all registered values that are due for polling at time.monotonic() value now"""
+        if now is None:
+            now = time.monotonic()
+        return [s.item for s in self._items.values() if s.is_due(now)]
+
+
+    def get_next_due(self) -> float|None:
+        """Returns the time.monotonic() value when the next registered value is due, or None if nothing is registered"""
+        return min((s.next_due for s in self._items.values()), default=None)
+
+
+    def tick(self, retries = None, timeout = None, verbose=False) -> XcomValues:
+        """
+        Poll all values that are due.
+        The values are retrieved via request_values, which combines all due infos into as few
+        multi-info requests as possible.
+
+        Returns the polled values; empty if nothing was due.
+        """
+        now = time.monotonic()
+        due = [s for s in self._items.values() if s.is_due(now)]
+        if not due:
+            return XcomValues([])
+
+        # Schedule the next poll relative to the start of this one, so the intervals do not drift
+        for s in due:
+            s.next_due = now + s.interval
+
+        _LOGGER.debug(f"Poll {len(due)} of {len(self._items)} values")
+
+        return self._api.request_values(XcomValues([s.item for s in due]), retries=retries, timeout=timeout, verbose=verbose)
+
+
+    def run(self, callback, retries = None, timeout = None, verbose=False):
+        """
+        Keep polling until stop() is called.
+        The callback is called with the XcomValues retrieved in each tick.
+        """
+        self._running = True
+        while self._running:
+            values = self.tick(retries=retries, timeout=timeout, verbose=verbose)
+            if values.items:
+                callback(values)
+
+            # Sleep until the next value is due, but check regularly whether we were stopped
+            next_due = self.get_next_due()
+            wait = (next_due - time.monotonic()) if next_due is not None else POLL_INTERVAL_FAST
+            time.sleep(min(max(wait, 0), 1))
+
+
+    def stop(self):
+        """
+        Stop a running poll loop
+        """
+        self._running = False
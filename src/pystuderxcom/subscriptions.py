@@ -0,0 +1,124 @@
+##
+## Classes implementing change-notification subscriptions on polled values
+##
+
+import logging
+import time
+
+from typing import Any, Callable
+
+from .values import (
+    XcomValues,
+    XcomValuesItem,
+)
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class XcomSubscription:
+    """
+    One registered callback for a (datapoint nr, device code) pair.
+    The callback is only called when the value changed more than the deadband,
+    and at most once per min_interval seconds.
+    """
+    def __init__(self, nr: int, code: str, callback: Callable[[XcomValuesItem], Any], deadband: float = 0, min_interval: float = 0):
+        self.nr = nr
+        self.code = code
+        self.callback = callback
+        self.deadband = deadband
+        self.min_interval = min_interval
+
+        self.last_value: Any = None
+        self.last_notified: float|None = None   # time.monotonic() of the last notification
+
+    @property
+    def key(self) -> tuple:
+        return (self.nr, self.code)
+
+    def is_changed(self, value: Any) -> bool:
+        """Returns True if the value differs from the last notified value by more than the deadband"""
+        if self.last_notified is None:
+            return True
+
+        if isinstance(value, (int, float)) and isinstance(self.last_value, (int, float)):
+            return abs(value - self.last_value) > self.deadband
+
+        return value != self.last_value
+
+    def is_allowed(self, now: float) -> bool:
+        """Returns True if the min_interval since the last notification (time.monotonic) has passed"""
+        if self.last_notified is None:
+            return True
+
+        return now - self.last_notified >= self.min_interval
+
+
+class XcomSubscriptions:
+    """
+    Registry of all subscriptions; matches polled values against them and calls the callbacks.
+    """
+    def __init__(self):
+        self._subscriptions: dict[tuple, list[XcomSubscription]] = {}
+
+    def __len__(self):
+        return sum(len(subs) for subs in self._subscriptions.values())
+
+    def subscribe(self, nr: int, code: str, callback: Callable[[XcomValuesItem], Any], deadband: float = 0, min_interval: float = 0) -> XcomSubscription:
+        """Register a callback; returns the subscription that can be passed to unsubscribe"""
+        subscription = XcomSubscription(nr, code, callback, deadband=deadband, min_interval=min_interval)
+        self._subscriptions.setdefault(subscription.key, []).append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: XcomSubscription):
+        """Remove a previously registered callback"""
+        subs = self._subscriptions.get(subscription.key, [])
+        if subscription in subs:
+            subs.remove(subscription)
+        if not subs:
+            self._subscriptions.pop(subscription.key, None)
+
+    def reset(self):
+        """
+        Forget the last notified values, so all subscribers are notified again on the next poll.
+        Used after a reconnect, when values may have changed during the outage.
+        """
+        for subs in self._subscriptions.values():
+            for sub in subs:
+                sub.last_value = None
+                sub.last_notified = None
+
+    def notify(self, values: XcomValues, now: float|None = None) -> int:
+        """
+        Match all polled values against the subscriptions and call the callbacks of the changed ones.
+        Values that could not be retrieved (error set) are never notified.
+        The optional now is a time.monotonic() value.
+        Returns the number of callbacks called.
+        """
+        if not self._subscriptions:
+            return 0
+
+        now = time.monotonic() if now is None else now
+        count = 0
+
+        for item in values.items:
+            if item.error is not None or item.datapoint is None:
+                continue
+
+            subs = self._subscriptions.get((item.datapoint.nr, item.code))
+            if not subs:
+                continue
+
+            for sub in subs:
+                if not sub.is_changed(item.value) or not sub.is_allowed(now):
+                    continue
+
+                sub.last_value = item.value
+                sub.last_notified = now
+                count += 1
+                try:
+                    sub.callback(item)
+                except Exception as ex:
+                    _LOGGER.warning(f"Exception in subscription callback for {item.datapoint.nr}:{item.code}: {ex}")
+
+        return count
@@ -0,0 +1,123 @@
+##
+## Class implementing a persistent cache of discovered topologies, one per Xcom gateway GUID
+##
+
+import logging
+import orjson
+import os
+
+from aiofiles import open as aiofiles_open
+
+from .const import (
+    XcomParamException,
+)
+from .data import (
+    XcomDiscoveredClient,
+    XcomDiscoveredDevice,
+    XcomTopology,
+)
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class AsyncXcomTopologyCache:
+
+    # Bump VERSION when the stored format changes; a file with another version is ignored
+    VERSION = 1
+
+    def __init__(self, path: str|None = None):
+        """
+        Keeps the discovered client info and devices (including their firmware versions) per gateway GUID.
+        When a path is given, the cache can be saved to and loaded from a json file, so it survives a restart.
+        Used by AsyncXcomDiscover.discover_topology to skip a full discovery of a known gateway.
+        """
+        self._path = path
+        self._topologies: dict[str, XcomTopology] = {}
+
+
+    @property
+    def path(self) -> str|None:
+        return self._path
+
+
+    def __len__(self):
+        return len(self._topologies)
+
+
+    def __contains__(self, guid: str):
+        return guid in self._topologies
+
+
+    def get(self, guid: str) -> XcomTopology|None:
+        return self._topologies.get(guid, None)
+
+
+    def put(self, topology: XcomTopology):
+        """
+        Store the topology under the GUID of its client
+        """
+        if not topology.client or not topology.client.guid:
+            raise XcomParamException("Topology without a client guid cannot be cached")
+
+        self._topologies[topology.client.guid] = topology
+
+
+    def remove(self, guid: str) -> XcomTopology|None:
+        return self._topologies.pop(guid, None)
+
+
+    async def load(self) -> bool:
+        """
+        Load the cached topologies from file. Returns False if there was nothing (valid) to load.
+        """
+        if not self._path:
+            return False
+
+        try:
+            async with aiofiles_open(self._path, "rb") as file_cache:
+                data = orjson.loads(await file_cache.read())
+
+            if data.get("version") != self.VERSION:
+                _LOGGER.debug(f"Ignoring cached topologies in '{self._path}'; version {data.get('version')} differs from {self.VERSION}")
+                return False
+
+            self._topologies = {
+                guid: XcomTopology(
+                    client = XcomDiscoveredClient(**val["client"]),
+                    devices = [XcomDiscoveredDevice(**device) for device in val["devices"]],
+                )
+                for guid,val in data["topologies"].items()
+            }
+
+            _LOGGER.info(f"Using {len(self._topologies)} cached topologies from '{self._path}'")
+            return True
+
+        except Exception as ex:
+            _LOGGER.debug(f"Cached topologies not available in '{self._path}': {ex}")
+            return False
+
+
+    async def save(self) -> bool:
+        """
+        Save the cached topologies to file. Returns False if they could not be saved.
+        """
+        if not self._path:
+            return False
+
+        try:
+            data = {
+                "version": self.VERSION,
+                "topologies": self._topologies,
+            }
+
+            # Write to a temporary file first, so a concurrent load never reads a partial file
+            os.makedirs(os.path.dirname(os.path.abspath(self._path)), exist_ok=True)
+            async with aiofiles_open(f"{self._path}.{os.getpid()}", "wb") as file_cache:
+                await file_cache.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+            os.replace(f"{self._path}.{os.getpid()}", self._path)
+            return True
+
+        except Exception as ex:
+            _LOGGER.warning(f"Failed to cache topologies in '{self._path}': {ex}")
+            return False
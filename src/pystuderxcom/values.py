@@ -12,6 +12,7 @@ import asyncio
 import binascii
 from enum import IntEnum
 import logging
+import math
 import struct
 from io import BufferedWriter, BufferedReader, BytesIO
 from typing import Any, Iterable
@@ -76,6 +77,21 @@ class XcomValuesItem():
         self.value = value
         self.error = error
 
+    @staticmethod
+    def from_resolved(datapoint: XcomDatapoint, code:str|None, address:int|None, aggregation_type:XcomAggregationType|None, value:Any=None, error:str|None=None) -> 'XcomValuesItem':
+        """
+        Create an item whose code, address and aggregation_type are already known, e.g. when decoding a response.
+        Skips the conversions done in __init__; the caller is responsible for passing consistent values.
+        """
+        item = XcomValuesItem.__new__(XcomValuesItem)
+        item.datapoint = datapoint
+        item.code = code
+        item.address = address
+        item.aggregation_type = aggregation_type
+        item.value = value
+        item.error = error
+        return item
+
 
 class XcomValues():
     items: Iterable[XcomValuesItem] # Both in request and response
@@ -101,23 +117,42 @@ class XcomValues():
             ))
         return XcomValues(items)
 
+    @staticmethod
+    def _get_request_join(req: 'XcomValues'):
+        """
+        Returns a function to find the requested datapoint for a response item.
+        Response items are joined to the request items on nr and aggregation_type;
+        if there is no exact match then fall back to the first request item with the same nr.
+        """
+        req_by_key = {}
+        req_by_nr = {}
+        for i in req.items:
+            req_by_key.setdefault((i.datapoint.nr, i.aggregation_type), i.datapoint)
+            req_by_nr.setdefault(i.datapoint.nr, i.datapoint)
+
+        return lambda nr, aggregation_type: req_by_key.get((nr, aggregation_type)) or req_by_nr.get(nr)
+
     @staticmethod
     def unpack_response(buf: bytes, req: 'XcomValues'):
         """Unpack response data"""
         rsp = XcomDataMultiInfoRsp.unpack(buf)
 
+        get_datapoint = XcomValues._get_request_join(req)
+
         # Resolve additional properties
         items = list()
         for item in rsp.items:
-            datapoint = next((i.datapoint for i in req.items if i.datapoint.nr==item.user_info_ref), None)
+            datapoint = get_datapoint(item.user_info_ref, item.aggregation_type)
+            if datapoint is None:
+                _LOGGER.debug(f"Skip response item for nr {item.user_info_ref} that was not requested")
+                continue
+
             aggregation_type = item.aggregation_type
-            value = XcomData.cast(item.data, datapoint.format) if datapoint is not None else None
+            address = XcomDeviceFamilies.get_addr_by_aggregationtype(aggregation_type, datapoint.family_id)
+            code = XcomDeviceFamilies.get_code_by_addr(address, datapoint.family_id) if address is not None else None
+            value = XcomData.cast(item.data, datapoint.format)
 
-            items.append(XcomValuesItem(
-                datapoint = datapoint,
-                aggregation_type = aggregation_type,
-                value = value
-            ))
+            items.append(XcomValuesItem.from_resolved(datapoint, code, address, aggregation_type, value))
 
         return XcomValues(items, rsp.flags, rsp.datetime)
 
@@ -137,3 +172,111 @@ class XcomValues():
         )
         return rsp.pack()
 
+
+
+
+class XcomValuesColumns():
+    """
+    Columnar variant of XcomValues, holding parallel lists per property instead of one object per value.
+    XcomValuesItem objects are only created when the items are accessed.
+    """
+    datapoints: list[XcomDatapoint]
+    aggregation_types: list[XcomAggregationType|None]
+    addresses: list[int|None]
+    values: list[Any]
+    errors: list[str|None]
+    flags: int                      # Only in response from request_infos
+    datetime: int                   # Only in response from request_infos
+
+    def __init__(self, datapoints: list[XcomDatapoint], aggregation_types: list[XcomAggregationType|None], addresses: list[int|None], values: list[Any], errors: list[str|None]|None = None, flags:int=None, datetime:int=None):
+        self.datapoints = datapoints
+        self.aggregation_types = aggregation_types
+        self.addresses = addresses
+        self.values = values
+        self.errors = errors if errors is not None else [None] * len(datapoints)
+        self.flags = flags
+        self.datetime = datetime
+        self._items: list[XcomValuesItem]|None = None
+
+    @staticmethod
+    def from_values(values: XcomValues) -> 'XcomValuesColumns':
+        """Convert a row based XcomValues into columns"""
+        items = list(values.items)
+        return XcomValuesColumns(
+            datapoints = [i.datapoint for i in items],
+            aggregation_types = [i.aggregation_type for i in items],
+            addresses = [i.address for i in items],
+            values = [i.value for i in items],
+            errors = [i.error for i in items],
+            flags = values.flags,
+            datetime = values.datetime,
+        )
+
+    @staticmethod
+    def unpack_response(buf: bytes, req: XcomValues) -> 'XcomValuesColumns':
+        """Unpack response data straight into columns, without creating an object per value"""
+        get_datapoint = XcomValues._get_request_join(req)
+        flags, datetime, nrs, aggregation_types, data = XcomDataMultiInfoRsp.unpack_columns(buf)
+
+        datapoints = [get_datapoint(nr, aggr) for nr, aggr in zip(nrs, aggregation_types)]
+
+        # Skip response items that were not requested, same as XcomValues.unpack_response
+        if None in datapoints:
+            for nr, dp in zip(nrs, datapoints):
+                if dp is None:
+                    _LOGGER.debug(f"Skip response item for nr {nr} that was not requested")
+
+            keep = [idx for idx, dp in enumerate(datapoints) if dp is not None]
+            datapoints = [datapoints[idx] for idx in keep]
+            aggregation_types = [aggregation_types[idx] for idx in keep]
+            data = [data[idx] for idx in keep]
+
+        values = [XcomData.cast(d, dp.format) for d, dp in zip(data, datapoints)]
+        addresses = [XcomDeviceFamilies.get_addr_by_aggregationtype(aggr, dp.family_id) for aggr, dp in zip(aggregation_types, datapoints)]
+
+        return XcomValuesColumns(datapoints, list(aggregation_types), addresses, values, flags=flags, datetime=datetime)
+
+    def __len__(self) -> int:
+        return len(self.datapoints)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    @property
+    def nrs(self) -> list[int|None]:
+        return [dp.nr if dp is not None else None for dp in self.datapoints]
+
+    @property
+    def items(self) -> list[XcomValuesItem]:
+        """The values as XcomValuesItem objects, created on first access"""
+        if self._items is None:
+            self._items = [XcomValuesItem.from_resolved(dp, XcomDeviceFamilies.get_code_by_addr(addr, dp.family_id) if addr is not None else None, addr, aggr, val, err)
+                           for dp, addr, aggr, val, err in zip(self.datapoints, self.addresses, self.aggregation_types, self.values, self.errors)]
+        return self._items
+
+    def to_values(self) -> XcomValues:
+        """Convert into a row based XcomValues"""
+        return XcomValues(self.items, self.flags, self.datetime)
+
+    def to_records(self) -> list[dict]:
+        """Export as a list of plain dicts, one per value"""
+        return [dict(nr=nr, address=addr, aggregation_type=aggr, value=val, error=err)
+                for nr, addr, aggr, val, err in zip(self.nrs, self.addresses, self.aggregation_types, self.values, self.errors)]
+
+    def to_numpy(self):
+        """
+        Export as a numpy structured array with fields nr, address, aggregation_type, value and error.
+        Missing addresses and aggregation types are set to -1, missing values to NaN.
+        Requires numpy to be installed; it is not a dependency of this library.
+        """
+        import numpy
+
+        dtype = [("nr", numpy.int32), ("address", numpy.int32), ("aggregation_type", numpy.int16), ("value", numpy.float64), ("error", object)]
+        rows = [(nr if nr is not None else -1,
+                 addr if addr is not None else -1,
+                 aggr if aggr is not None else -1,
+                 float(val) if isinstance(val, (int, float)) else math.nan,
+                 err)
+                for nr, addr, aggr, val, err in zip(self.nrs, self.addresses, self.aggregation_types, self.values, self.errors)]
+
+        return numpy.array(rows, dtype=dtype)
@@ -1,3 +1,3 @@
-from .xcom_test_api import AsyncTestApi, TestApi
+from .xcom_test_api import AsyncTestApi, TestApi, make_response
 
 from .tasks import AsyncTaskHelper, TaskHelper
@@ -26,6 +26,11 @@ class AsyncTaskHelper:
         self.result = await self._task
         return self.result
 
+    @staticmethod
+    def is_running(name: str) -> bool:
+        """Whether a task with the given name is still running"""
+        return any(task.get_name() == name and not task.done() for task in asyncio.all_tasks())
+
          
 class TaskHelper(threading.Thread):
     """
@@ -50,5 +55,11 @@ class TaskHelper(threading.Thread):
     def join(self):
         super().join()
         return self.result
+
+    @staticmethod
+    def is_running(name: str) -> bool:
+        """Whether a thread with the given name is still running"""
+        return any(thread.name == name and thread.is_alive() for thread in threading.enumerate())
+
          
     
\ No newline at end of file
@@ -1,18 +1,18 @@
 import asyncio
-import copy
+import time
 from datetime import datetime
 import pytest
 import pytest_asyncio
 
 from pystuderxcom import AsyncXcomApiBase, XcomApiBase
 from pystuderxcom import AsyncXcomFactory, XcomFactory
-from pystuderxcom import XcomApiTimeoutException, XcomApiResponseIsError, XcomParamException
+from pystuderxcom import XcomApiTimeoutException, XcomApiResponseIsError, XcomApiReadException, XcomParamException
 from pystuderxcom import XcomDataset, XcomData, XcomPackage
 from pystuderxcom import XcomValues, XcomValuesItem
 from pystuderxcom import XcomVoltage, XcomFormat, XcomAggregationType, XcomTarget, ScomServiceId, ScomServiceFlag, ScomFrameFlag, ScomObjType, ScomObjId, ScomQspId, ScomAddress, ScomErrorCode
 from pystuderxcom import XcomDataMessageRsp
 
-from . import AsyncTestApi, TestApi
+from . import AsyncTestApi, TestApi, make_response
 from . import AsyncTaskHelper, TaskHelper
 
 
@@ -33,7 +33,7 @@ async def test_flags(name, do_req, rsp_frm_flags, exp_imp, exp_wrr, exp_iscp, ex
 
     async def on_receive(api: AsyncTestApi):
         """Helper to turn a request into a response"""
-        api.response_package = copy.deepcopy(api.request_package)
+        api.response_package = make_response(api.request_package)
 
         api.response_package.header.frame_flags = rsp_frm_flags
         api.response_package.frame_data.service_flags = 0x02
@@ -86,7 +86,7 @@ async def test_request_virtual(name, test_nr, test_dest, rsp_frm_flags, rsp_data
 
     async def on_receive(api: AsyncTestApi):
         """Helper to turn a request into a response"""
-        api.response_package = copy.deepcopy(api.request_package)
+        api.response_package = make_response(api.request_package)
 
         api.response_package.header.frame_flags = rsp_frm_flags
         api.response_package.frame_data.service_flags = 0x02
@@ -120,7 +120,7 @@ async def test_request_guid(name, exp_dst_addr, exp_svc_id, exp_obj_type, exp_ob
 
     async def on_receive(api: AsyncTestApi):
         """Helper to turn a request into a response"""
-        api.response_package = copy.deepcopy(api.request_package)
+        api.response_package = make_response(api.request_package)
 
         api.response_package.frame_data.service_flags = rsp_flags
         api.response_package.frame_data.service_data.property_data = rsp_data
@@ -142,7 +142,7 @@ async def test_request_guid(name, exp_dst_addr, exp_svc_id, exp_obj_type, exp_ob
 
         assert api.receive_called == True
         assert api.response_package is not None
-        assert api.response_package.header.dst_addr == exp_dst_addr
+        assert api.response_package.header.src_addr == exp_dst_addr
         assert api.response_package.frame_data.service_id == exp_svc_id
         assert api.response_package.frame_data.service_data.object_type == exp_obj_type
         assert api.response_package.frame_data.service_data.object_id == exp_obj_id
@@ -173,7 +173,7 @@ async def test_request_value(name, test_nr, test_dest, exp_dst_addr, exp_svc_id,
 
     async def on_receive(api: AsyncTestApi):
         """Helper to turn a request into a response"""
-        api.response_package = copy.deepcopy(api.request_package)
+        api.response_package = make_response(api.request_package)
 
         api.response_package.header.frame_flags = ScomFrameFlag.IS_MESSAGE_PENDING
         api.response_package.frame_data.service_flags = rsp_flags
@@ -196,7 +196,7 @@ async def test_request_value(name, test_nr, test_dest, exp_dst_addr, exp_svc_id,
 
         assert api.receive_called == True
         assert api.response_package is not None
-        assert api.response_package.header.dst_addr == exp_dst_addr
+        assert api.response_package.header.src_addr == exp_dst_addr
         assert api.response_package.frame_data.service_id == exp_svc_id
         assert api.response_package.frame_data.service_data.object_type == exp_obj_type
         assert api.response_package.frame_data.service_data.object_id == exp_obj_id
@@ -225,7 +225,7 @@ async def test_update_value(name, test_nr, test_dest, test_value_update, exp_dst
 
     async def on_receive(api: AsyncTestApi):
         """Helper to turn a request into a response"""
-        api.response_package = copy.deepcopy(api.request_package)
+        api.response_package = make_response(api.request_package)
 
         api.response_package.frame_data.service_flags = rsp_flags
         api.response_package.frame_data.service_data.property_data = rsp_data
@@ -247,7 +247,7 @@ async def test_update_value(name, test_nr, test_dest, test_value_update, exp_dst
 
         assert api.receive_called == True
         assert api.response_package is not None
-        assert api.response_package.header.dst_addr == exp_dst_addr
+        assert api.response_package.header.src_addr == exp_dst_addr
         assert api.response_package.frame_data.service_id == exp_svc_id
         assert api.response_package.frame_data.service_data.object_type == exp_obj_type
         assert api.response_package.frame_data.service_data.object_id == exp_obj_id
@@ -466,7 +466,7 @@ async def test_request_infos(name, values_fixture, run_receive, exp_src_addr, ex
         if not run_receive:
             api.response_package = None
         else:
-            api.response_package = copy.deepcopy(api.request_package)
+            api.response_package = make_response(api.request_package)
 
             api.response_package.header.frame_flags = 0x1F
             api.response_package.frame_data.service_flags = rsp_flags
@@ -494,8 +494,8 @@ async def test_request_infos(name, values_fixture, run_receive, exp_src_addr, ex
 
         assert api.receive_called == True
         assert api.response_package is not None
-        assert api.response_package.header.src_addr == exp_src_addr
-        assert api.response_package.header.dst_addr == exp_dst_addr
+        assert api.response_package.header.src_addr == exp_dst_addr
+        assert api.response_package.header.dst_addr == exp_src_addr
         assert api.response_package.frame_data.service_id == exp_svc_id
         assert api.response_package.frame_data.service_data.object_type == exp_obj_type
         assert api.response_package.frame_data.service_data.object_id == exp_obj_id
@@ -544,7 +544,7 @@ async def test_request_values(name, values_fixture, run_receive, rsp_flags, exp_
         if not run_receive:
             api.response_package = None
         else:
-            api.response_package = copy.deepcopy(api.request_package)
+            api.response_package = make_response(api.request_package)
             api.response_package.header.frame_flags = 0x1F
             api.response_package.frame_data.service_flags = rsp_flags
 
@@ -621,7 +621,7 @@ async def test_request_message(name, test_nr, exp_svc_id, exp_obj_type, exp_obj_
 
     async def on_receive(api: AsyncTestApi):
         """Helper to turn a request into a response"""
-        api.response_package = copy.deepcopy(api.request_package)
+        api.response_package = make_response(api.request_package)
 
         api.response_package.frame_data.service_flags = rsp_flags
         api.response_package.frame_data.service_data.property_data = rsp_data
@@ -643,7 +643,7 @@ async def test_request_message(name, test_nr, exp_svc_id, exp_obj_type, exp_obj_
 
         assert api.receive_called == True
         assert api.response_package is not None
-        assert api.response_package.header.dst_addr == ScomAddress.RCC
+        assert api.response_package.header.src_addr == ScomAddress.RCC
         assert api.response_package.frame_data.service_id == exp_svc_id
         assert api.response_package.frame_data.service_data.object_type == exp_obj_type
         assert api.response_package.frame_data.service_data.object_id == exp_obj_id
@@ -659,3 +659,474 @@ async def test_request_message(name, test_nr, exp_svc_id, exp_obj_type, exp_obj_
         with pytest.raises(exp_except):
             msg = await api.request_message(test_nr, retries=1, timeout=5)
 
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "name, req_ids, rsp_ids, exp_ids",
+    [
+        ("in order",     [3000, 3001, 3002], [3000, 3001, 3002], [3000, 3001, 3002]),
+        ("out of order", [3000, 3001, 3002], [3002, 3000, 3001], [3000, 3001, 3002]),
+        ("unknown",      [3000, 3001],       [3001, 3005],       [None, 3001]),
+        ("same key",     [3000, 3000],       [3000],             [3000, None]),
+    ]
+)
+async def test_dispatch(name, req_ids, rsp_ids, exp_ids, request):
+
+    def gen_package(object_id, service_flags):
+        package = XcomPackage.gen_package(
+            service_id = ScomServiceId.READ,
+            object_type = ScomObjType.INFO,
+            object_id = object_id,
+            property_id = ScomQspId.VALUE,
+            property_data = XcomData.NONE,
+            dst_addr = 101,
+        )
+        package.frame_data.service_flags = service_flags
+        return package
+
+    api = AsyncTestApi()
+    api.request_window = len(req_ids)
+
+    pendings = [api._add_pending(gen_package(id, 0x00)) for id in req_ids]
+    for id in rsp_ids:
+        api._dispatch_package(make_response(gen_package(id, 0x02)))
+
+    for pending,exp_id in zip(pendings, exp_ids):
+        if exp_id is None:
+            assert pending.response is None
+        else:
+            assert pending.response is not None
+            assert pending.response.frame_data.service_data.object_id == exp_id
+
+    for pending in pendings:
+        api._remove_pending(pending)
+
+    assert len(api._pending) == 0
+
+    with pytest.raises(XcomParamException):
+        api.request_window = 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("dataset")
+async def test_dispatch_pipelined(request):
+    dataset = request.getfixturevalue("dataset")
+    sent = []
+    requested = []
+    answered = []
+
+    async def on_send(api: AsyncTestApi):
+        """Helper to remember all requests in flight"""
+        sent.append(api.request_package)
+        requested.append(api.request_package.frame_data.service_data.property_id)
+
+    async def on_receive(api: AsyncTestApi):
+        """Helper to answer the requests in flight in reverse order, once both have been sent"""
+        for _ in range(100):
+            if len(sent) >= 2 or len(answered) > 0:
+                break
+            await asyncio.sleep(0.01)
+
+        req = sent.pop()
+        answered.append(req.frame_data.service_data.property_id)
+
+        rsp_values = XcomValues.unpack_request(req.frame_data.service_data.property_data, dataset)
+        rsp_values.flags = 0
+        rsp_values.datetime = 0
+        for item in rsp_values.items:
+            item.value = float(item.datapoint.nr)
+
+        api.response_package = make_response(req)
+        api.response_package.frame_data.service_flags = 0x02
+        api.response_package.frame_data.service_data.property_data = rsp_values.pack_response()
+        api.response_package.header.data_length = len(api.response_package.frame_data)
+
+    api = AsyncTestApi(on_send_handler=on_send, on_receive_handler=on_receive)
+    api.request_window = 2
+
+    # Two multi-info requests in flight at the same time; each gets its own response,
+    # even though the responses arrive in the reverse order of the requests
+    req_1 = XcomValues([XcomValuesItem(dataset.get_by_nr(3000), code="XT1"), XcomValuesItem(dataset.get_by_nr(3001), code="XT1")])
+    req_2 = XcomValues([XcomValuesItem(dataset.get_by_nr(3023), code="XT1")])
+
+    task_1 = await AsyncTaskHelper(api.request_infos, req_1, retries=1, timeout=5).start()
+    task_2 = await AsyncTaskHelper(api.request_infos, req_2, retries=1, timeout=5).start()
+    rsp_1 = await task_1.join()
+    rsp_2 = await task_2.join()
+
+    assert len(set(requested)) == 2
+    assert answered == list(reversed(requested))
+    assert [(item.datapoint.nr, item.value) for item in rsp_1.items] == [(3000, 3000.0), (3001, 3001.0)]
+    assert [(item.datapoint.nr, item.value) for item in rsp_2.items] == [(3023, 3023.0)]
+    assert len(api._pending) == 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("dataset")
+async def test_dispatch_devices(request):
+    dataset = request.getfixturevalue("dataset")
+    sent = []
+    answered = []
+
+    async def on_send(api: AsyncTestApi):
+        """Helper to remember all requests in flight"""
+        sent.append(api.request_package)
+
+    async def on_receive(api: AsyncTestApi):
+        """Helper to answer the requests in flight in reverse order, once both have been sent"""
+        for _ in range(100):
+            if len(sent) >= 2 or len(answered) > 0:
+                break
+            await asyncio.sleep(0.01)
+
+        req = sent.pop()
+        answered.append(req.header.dst_addr)
+
+        api.response_package = make_response(req)
+        api.response_package.frame_data.service_flags = 0x02
+        api.response_package.frame_data.service_data.property_data = XcomData.pack(float(req.header.dst_addr), XcomFormat.FLOAT)
+        api.response_package.header.data_length = len(api.response_package.frame_data)
+
+    api = AsyncTestApi(on_send_handler=on_send, on_receive_handler=on_receive)
+    api.request_window = 2
+
+    # The same param requested from two devices at the same time; each device's answer
+    # must go to the request for that device, even though the answers arrive in reverse order
+    param = dataset.get_by_nr(1107)
+
+    task_1 = await AsyncTaskHelper(api.request_value, param, "XT1", retries=1, timeout=5).start()
+    task_2 = await AsyncTaskHelper(api.request_value, param, "XT2", retries=1, timeout=5).start()
+    value_1 = await task_1.join()
+    value_2 = await task_2.join()
+
+    assert answered == [102, 101]
+    assert value_1 == 101.0
+    assert value_2 == 102.0
+    assert len(api._pending) == 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("dataset")
+async def test_connection_lost(request):
+    dataset = request.getfixturevalue("dataset")
+
+    async def on_receive(api: AsyncTestApi):
+        """Helper to simulate the transport detecting a closed connection"""
+        api.response_package = None
+        api._connection_lost("closed by test")
+
+    api = AsyncTestApi(on_receive_handler=on_receive)
+
+    # Subscribers already notified before the outage
+    sub = api.subscribe(lambda item: None, 3000, "XT1")
+    sub.last_value = 1.0
+    sub.last_notified = time.monotonic()
+
+    # The pending request fails as soon as the connection is lost; no retries and no waiting for the timeout
+    ts_start = datetime.now()
+    with pytest.raises(XcomApiReadException):
+        await api.request_guid(retries=3, timeout=5)
+
+    assert (datetime.now() - ts_start).total_seconds() < 1
+    assert api.connected == False
+
+    # Later requests fail immediately as well
+    assert await api.request_guid(retries=3, timeout=5) is None
+
+    values = await api.request_values(XcomValues([XcomValuesItem(dataset.get_by_nr(3000), code="XT1")]), retries=3, timeout=5)
+    assert len(values.items) == 1
+    assert values.items[0].error is not None
+    assert (datetime.now() - ts_start).total_seconds() < 1
+
+    # Once restored, subscribers get the current values again
+    api._connection_restored()
+    assert api.connected == True
+    assert sub.last_notified is None
+
+    diag = await api.get_diagnostics()
+    assert diag["connection"] == {"connected": True, "disconnects": 1, "reconnects": 1}
+
+
+@pytest.mark.asyncio
+async def test_request_deadline(request):
+
+    async def on_receive(api: AsyncTestApi):
+        """Helper to simulate a gateway that trickles in data that never forms the expected response"""
+        await asyncio.sleep(0.2)
+        api.response_package = None
+
+    api = AsyncTestApi(on_receive_handler=on_receive)
+
+    # All receives share one deadline, so the request does not take longer than its timeout
+    ts_start = time.monotonic()
+    with pytest.raises(XcomApiTimeoutException):
+        await api.request_guid(retries=1, timeout=1)
+
+    ts_end = time.monotonic()
+    assert ts_end - ts_start < 1.5
+    assert api.receive_deadline == pytest.approx(ts_start + 1, abs=0.1)
+
+
+@pytest.mark.asyncio
+async def test_request_deadline_pipelined(request):
+
+    async def on_receive(api: AsyncTestApi):
+        """Helper to simulate a gateway that never answers"""
+        await asyncio.sleep(0.2)
+        api.response_package = None
+
+    async def request_guid(api: AsyncTestApi):
+        """Helper that returns the exception raised by the request"""
+        try:
+            await api.request_guid(retries=1, timeout=1)
+        except Exception as e:
+            return e
+
+    api = AsyncTestApi(on_receive_handler=on_receive)
+    api.request_window = 2
+
+    # The deadline starts when the request is made; waiting for a free slot in the request window
+    # or for the receive lock counts as well, so a queued request does not add its full timeout
+    ts_start = time.monotonic()
+    tasks = [await AsyncTaskHelper(request_guid, api).start() for _ in range(3)]
+    results = [await task.join() for task in tasks]
+
+    ts_end = time.monotonic()
+    assert ts_end - ts_start < 1.5
+    assert all(isinstance(result, XcomApiTimeoutException) for result in results)
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("dataset")
+async def test_negative_cache(request):
+    dataset = request.getfixturevalue("dataset")
+    info_3000 = dataset.get_by_nr(3000)
+    info_3023 = dataset.get_by_nr(3023)
+
+    errors = {}
+    sent = []
+
+    async def on_receive(api: AsyncTestApi):
+        """Helper to turn a request into an error response for the configured object types, or a value response"""
+        req = api.request_package
+        sent.append(req.frame_data.service_data.object_type)
+
+        api.response_package = make_response(req)
+        error = errors.get(req.frame_data.service_data.object_type)
+        if error is not None:
+            api.response_package.frame_data.service_flags = 0x03
+            api.response_package.frame_data.service_data.property_data = XcomData.pack(error, XcomFormat.ERROR)
+        else:
+            api.response_package.frame_data.service_flags = 0x02
+            api.response_package.frame_data.service_data.property_data = XcomData.pack(1.0, XcomFormat.FLOAT)
+        api.response_package.header.data_length = len(api.response_package.frame_data)
+
+    api = AsyncTestApi(on_receive_handler=on_receive)
+
+    # A permanent error is not retried, and the next request for the same object fails without being sent
+    errors[ScomObjType.INFO] = ScomErrorCode.DEVICE_NOT_FOUND
+    with pytest.raises(XcomApiResponseIsError):
+        await api.request_value(info_3000, "XT1", retries=3, timeout=1)
+    assert len(sent) == 1
+
+    with pytest.raises(XcomApiResponseIsError):
+        await api.request_value(info_3000, "XT1", retries=3, timeout=1)
+    assert len(sent) == 1
+
+    # Other objects are still sent, and errors that may go away are still retried
+    errors[ScomObjType.INFO] = ScomErrorCode.READ_PROPERTY_FAILED
+    with pytest.raises(XcomApiResponseIsError):
+        await api.request_value(info_3023, "XT1", retries=3, timeout=1)
+    assert len(sent) == 4
+
+    # Once cleared (or expired), the request is sent again
+    errors.pop(ScomObjType.INFO)
+    api.clear_negative_cache()
+    assert await api.request_value(info_3000, "XT1", retries=3, timeout=1) == pytest.approx(1.0)
+    assert len(sent) == 5
+
+    # An Xcom client that does not support multi-info is only asked once; next time values are requested one by one
+    errors[ScomObjType.MULTI_INFO] = ScomErrorCode.SERVICE_NOT_SUPPORTED
+    req_data = XcomValues([XcomValuesItem(info_3000, code="XT1"), XcomValuesItem(info_3023, code="XT1")])
+
+    sent.clear()
+    rsp_data = await api.request_values(req_data, retries=3, timeout=1)
+    assert all(item.value == pytest.approx(1.0) for item in rsp_data.items)
+    assert sent == [ScomObjType.MULTI_INFO, ScomObjType.INFO, ScomObjType.INFO]
+
+    sent.clear()
+    rsp_data = await api.request_values(req_data, retries=3, timeout=1)
+    assert all(item.value == pytest.approx(1.0) for item in rsp_data.items)
+    assert sent == [ScomObjType.INFO, ScomObjType.INFO]
+
+    diag = await api.get_diagnostics()
+    assert diag["negative_cache"] == {"entries": 1, "hits": 1, "multi_info_supported": False}
+
+    # A reconnect forgets all remembered errors
+    api._connection_restored()
+    diag = await api.get_diagnostics()
+    assert diag["negative_cache"]["entries"] == 0
+    assert diag["negative_cache"]["multi_info_supported"] == True
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("dataset")
+async def test_param_cache(request):
+    dataset = request.getfixturevalue("dataset")
+    param_1107 = dataset.get_by_nr(1107)
+    frame_flags = [0x00]
+    sent = []
+
+    async def on_receive(api: AsyncTestApi):
+        """Helper to turn a request into a response"""
+        req = api.request_package
+        sent.append((req.frame_data.service_id, req.header.dst_addr))
+
+        api.response_package = make_response(req)
+        api.response_package.header.frame_flags = frame_flags[0]
+        api.response_package.frame_data.service_flags = 0x02
+        if req.frame_data.service_id == ScomServiceId.READ:
+            api.response_package.frame_data.service_data.property_data = XcomData.pack(4.0, XcomFormat.FLOAT)
+        else:
+            api.response_package.frame_data.service_data.property_data = XcomData.NONE
+        api.response_package.header.data_length = len(api.response_package.frame_data)
+
+    api = AsyncTestApi(on_receive_handler=on_receive)
+
+    # Disabled by default
+    assert api.param_cache_ttl == 0
+    await api.request_value(param_1107, "XT1", retries=1, timeout=1)
+    await api.request_value(param_1107, "XT1", retries=1, timeout=1)
+    assert len(sent) == 2
+
+    # Once enabled, a param is read only once, also via request_values
+    api.param_cache_ttl = 60
+    sent.clear()
+    assert await api.request_value(param_1107, "XT1", retries=1, timeout=1) == pytest.approx(4.0)
+    assert await api.request_value(param_1107, "XT1", retries=1, timeout=1) == pytest.approx(4.0)
+    rsp_data = await api.request_values(XcomValues([XcomValuesItem(param_1107, code="XT1")]), retries=1, timeout=1)
+    assert rsp_data.items[0].value == pytest.approx(4.0)
+    assert sent == [(ScomServiceId.READ, 101)]
+
+    # An update writes through; the value is not read back
+    sent.clear()
+    assert await api.update_value(param_1107, 8.0, "XT1", retries=1, timeout=1) == True
+    assert await api.request_value(param_1107, "XT1", retries=1, timeout=1) == pytest.approx(8.0)
+    assert sent == [(ScomServiceId.WRITE, 101)]
+
+    # An update via the multicast address drops the cached value of all devices
+    assert await api.request_value(param_1107, "XT2", retries=1, timeout=1) == pytest.approx(4.0)
+    sent.clear()
+    assert await api.update_value(param_1107, 2.0, 100, retries=1, timeout=1) == True
+    assert await api.request_value(param_1107, "XT1", retries=1, timeout=1) == pytest.approx(4.0)
+    assert sent == [(ScomServiceId.WRITE, 100), (ScomServiceId.READ, 101)]
+
+    # A reset of the RCC drops all cached values
+    frame_flags[0] = ScomFrameFlag.WAS_RCC_RESETED
+    await api.request_value(param_1107, "XT2", retries=1, timeout=1)
+    sent.clear()
+    assert await api.request_value(param_1107, "XT1", retries=1, timeout=1) == pytest.approx(4.0)
+    assert await api.request_value(param_1107, "XT1", retries=1, timeout=1) == pytest.approx(4.0)
+    assert sent == [(ScomServiceId.READ, 101)]
+
+    diag = await api.get_diagnostics()
+    assert diag["param_cache"]["entries"] == 2
+    assert diag["param_cache"]["hits"] == 4
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("dataset")
+async def test_update_values(request):
+    dataset = request.getfixturevalue("dataset")
+    info_3000 = dataset.get_by_nr(3000)
+    param_1107 = dataset.get_by_nr(1107)
+    param_1108 = dataset.get_by_nr(1108)
+    writes = []
+
+    async def on_receive(api: AsyncTestApi):
+        """Helper to turn a request into a response; device XT3 is not present"""
+        req = api.request_package
+        api.response_package = make_response(req)
+
+        if req.header.dst_addr == 103:
+            api.response_package.frame_data.service_flags = 0x03
+            api.response_package.frame_data.service_data.property_data = XcomData.pack(ScomErrorCode.DEVICE_NOT_FOUND, XcomFormat.ERROR)
+
+        elif req.frame_data.service_id == ScomServiceId.WRITE:
+            writes.append((req.frame_data.service_data.object_id, req.header.dst_addr, XcomData.unpack(req.frame_data.service_data.property_data, XcomFormat.FLOAT)))
+            api.response_package.frame_data.service_flags = 0x02
+            api.response_package.frame_data.service_data.property_data = XcomData.NONE
+
+        else:
+            api.response_package.frame_data.service_flags = 0x02
+            api.response_package.frame_data.service_data.property_data = XcomData.pack(4.0, XcomFormat.FLOAT)
+
+        api.response_package.header.data_length = len(api.response_package.frame_data)
+
+    # Skipping unchanged values does not depend on the param cache, which is disabled by default
+    api = AsyncTestApi(on_receive_handler=on_receive)
+    assert api.param_cache_ttl == 0
+    await api.request_value(param_1107, "XT1", retries=1, timeout=1)
+
+    update_data = XcomValues([
+        XcomValuesItem(param_1107, code="XT1", value=4.0),  # same as the last read value; skipped
+        XcomValuesItem(param_1108, code="XT1", value=1.0),  # coalesced; only the last value is written
+        XcomValuesItem(param_1107, code="XT2", value=5.0),
+        XcomValuesItem(param_1108, code="XT1", value=2.0),
+        XcomValuesItem(param_1107, code="XT3", value=6.0),  # device not present
+    ])
+    rsp_data = await api.update_values(update_data, retries=3, timeout=1)
+
+    assert writes == [(1107, 102, 5.0), (1108, 101, 2.0)]
+    assert [(item.datapoint.nr, item.code) for item in rsp_data.items] == [(1107, "XT1"), (1107, "XT2"), (1108, "XT1"), (1107, "XT3")]
+    assert [item.value for item in rsp_data.items] == [4.0, 5.0, 2.0, None]
+    assert [item.error is None for item in rsp_data.items] == [True, True, True, False]
+
+    # Written values are not written again
+    writes.clear()
+    rsp_data = await api.update_values(XcomValues([XcomValuesItem(param_1107, code="XT2", value=5.0)]), retries=3, timeout=1)
+    assert writes == []
+    assert rsp_data.items[0].value == 5.0
+
+    # Only params can be written
+    with pytest.raises(XcomParamException):
+        await api.update_values(XcomValues([XcomValuesItem(info_3000, code="XT1", value=1.0)]))
+
+    # A value is required
+    with pytest.raises(XcomParamException):
+        await api.update_values(XcomValues([XcomValuesItem(param_1107, code="XT1", value=None)]))
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("dataset")
+async def test_negative_cache_multi_info(request):
+    dataset = request.getfixturevalue("dataset")
+    info_3000 = dataset.get_by_nr(3000)
+    sent = []
+
+    async def on_receive(api: AsyncTestApi):
+        """Helper to answer multi-info requests with DEVICE_NOT_FOUND, and single requests with a value"""
+        req = api.request_package
+        sent.append(req.frame_data.service_data.object_type)
+
+        api.response_package = make_response(req)
+        if req.frame_data.service_data.object_type == ScomObjType.MULTI_INFO:
+            api.response_package.frame_data.service_flags = 0x03
+            api.response_package.frame_data.service_data.property_data = XcomData.pack(ScomErrorCode.DEVICE_NOT_FOUND, XcomFormat.ERROR)
+        else:
+            api.response_package.frame_data.service_flags = 0x02
+            api.response_package.frame_data.service_data.property_data = XcomData.pack(1.0, XcomFormat.FLOAT)
+        api.response_package.header.data_length = len(api.response_package.frame_data)
+
+    api = AsyncTestApi(on_receive_handler=on_receive)
+    req_data = XcomValues([XcomValuesItem(info_3000, code="XT1"), XcomValuesItem(info_3000, code="XT2")])
+
+    # An absent device in a multi-info request does not mean multi-info is unsupported
+    for _ in range(2):
+        sent.clear()
+        await api.request_values(req_data, retries=3, timeout=1)
+        assert sent == [ScomObjType.MULTI_INFO, ScomObjType.INFO, ScomObjType.INFO]
+
+    diag = await api.get_diagnostics()
+    assert diag["negative_cache"] == {"entries": 0, "hits": 0, "multi_info_supported": True}
@@ -1,10 +1,10 @@
 import asyncio
-import copy
 from datetime import datetime
 import pytest
 import pytest_asyncio
 
 from pystuderxcom import AsyncXcomApiTcp, XcomApiTcp, XcomApiTcpMode
+from pystuderxcom import AsyncXcomApiTcpServer, XcomApiTcpServer
 from pystuderxcom import AsyncXcomFactory, XcomFactory
 from pystuderxcom import XcomApiTimeoutException, XcomApiResponseIsError, XcomParamException
 from pystuderxcom import XcomDataset, XcomData, XcomPackage
@@ -12,6 +12,7 @@ from pystuderxcom import XcomValues, XcomValuesItem
 from pystuderxcom import XcomVoltage, XcomFormat, XcomAggregationType, ScomServiceId, ScomObjType, ScomObjId, ScomQspId, ScomAddress, ScomErrorCode
 from pystuderxcom import XcomDataMessageRsp
 from . import AsyncTaskHelper, TaskHelper
+from . import make_response
 
 
 class TestContext:
@@ -151,3 +152,195 @@ async def test_send_receive(name, exp_data, request):
         rsp_package = await task_server.join()
 
         assert rsp_package is None
+
+
+async def respond_guid(client: AsyncXcomApiTcp, guid: str):
+    """Helper to let a client answer the GUID request of the server"""
+    req = await client._receive_package()
+    assert req.frame_data.service_data.object_type == ScomObjType.GUID
+
+    rsp = make_response(req)
+    rsp.frame_data.service_flags = 0x02
+    rsp.frame_data.service_data.property_data = XcomData.pack(guid, XcomFormat.GUID)
+    rsp.header.data_length = len(rsp.frame_data)
+    await client._send_package(rsp)
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("unused_tcp_port", "package_read_info")
+async def test_multi_client_server(request):
+    package = request.getfixturevalue("package_read_info")
+    server_port = request.getfixturevalue("unused_tcp_port")
+    server_ip   = "127.0.0.1"
+    guids = ["00000000-0000-0000-0000-000000000001", "00000000-0000-0000-0000-000000000002"]
+
+    connected = []
+    server = AsyncXcomApiTcpServer(listen_port=server_port, on_connect=lambda session: connected.append(session.key))
+    clients = [AsyncXcomApiTcp(mode=XcomApiTcpMode.CLIENT, remote_ip=server_ip, remote_port=server_port) for _ in guids]
+    try:
+        await server.start()
+
+        # Both gateways connect to the same port and are identified by their GUID
+        for client, guid in zip(clients, guids):
+            await client.start()
+            task_client = await AsyncTaskHelper(respond_guid, client, guid).start()
+            await task_client.join()
+
+        assert await server.wait_for_sessions(len(guids), timeout=5) == True
+        assert sorted(server.sessions.keys()) == guids
+        assert sorted(connected) == guids
+
+        for guid in guids:
+            session = server.get_session(guid)
+            assert session.connected == True
+            assert session.guid == guid
+            assert session.remote_ip == server_ip
+
+        # Each session talks to its own gateway only
+        session = server.get_session(guids[1])
+        await session._send_package(package)
+        task_client = await AsyncTaskHelper(clients[1]._receive_package).start()
+        rsp_package = await task_client.join()
+        assert rsp_package is not None
+        assert rsp_package.frame_data.service_data.object_id == package.frame_data.service_data.object_id
+
+        task_client = await AsyncTaskHelper(clients[0]._receive_package).start()
+        assert await task_client.join() is None
+
+        # Stopping a session removes it from the server
+        await server.get_session(guids[0]).stop()
+        assert list(server.sessions.keys()) == [guids[1]]
+
+    finally:
+        for client in clients:
+            await client.stop()
+        await server.stop()
+
+    assert server.sessions == {}
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("unused_tcp_port")
+async def test_multi_client_server_no_guid(request):
+    server_port = request.getfixturevalue("unused_tcp_port")
+    server_ip   = "127.0.0.1"
+
+    server = AsyncXcomApiTcpServer(listen_port=server_port, identify=False)
+    clients = [AsyncXcomApiTcp(mode=XcomApiTcpMode.CLIENT, remote_ip=server_ip, remote_port=server_port) for _ in range(2)]
+    try:
+        await server.start()
+
+        # Without a GUID, gateways behind the same ip do not replace each other
+        for client in clients:
+            await client.start()
+
+        assert await server.wait_for_sessions(len(clients), timeout=5) == True
+        sessions = server.sessions
+        assert len(sessions) == 2
+        assert all(key == f"{session.remote_ip}:{session._remote_port}" for key,session in sessions.items())
+        assert all(session.connected for session in sessions.values())
+        assert server.get_session(server_ip) is not None
+
+    finally:
+        for client in clients:
+            await client.stop()
+        await server.stop()
+
+    assert server.sessions == {}
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("context", "unused_tcp_port")
+async def test_reconnect(request):
+    context = request.getfixturevalue("context")
+    server_port = request.getfixturevalue("unused_tcp_port")
+    server_ip   = "127.0.0.1"
+
+    task_server = await AsyncTaskHelper(context.start_server, server_port).start()
+    await asyncio.sleep(0.5)    # allow the server to start listening
+    await context.start_client(server_ip, server_port)
+    await task_server.join()
+    assert await context.server._wait_until_connected(5) == True
+
+    # Server side detects the closed connection without waiting for request timeouts
+    await context.stop_client()
+    await asyncio.sleep(0.5)
+
+    ts_start = datetime.now()
+    assert await context.server.request_guid(retries=3, timeout=5) is None
+    assert (datetime.now() - ts_start).total_seconds() < 1
+    assert context.server.connected == False
+
+    # Client side reconnects in the background once the server accepts connections again
+    await context.start_client(server_ip, server_port)
+    assert await context.server._wait_until_connected(5) == True
+
+    await context.stop_server()
+    await asyncio.sleep(0.5)
+    assert context.client._check_connection() == False
+
+    task_server = await AsyncTaskHelper(context.start_server, server_port).start()
+    assert await context.client._wait_until_connected(5) == True
+    await task_server.join()
+    assert await context.server._wait_until_connected(5) == True
+
+    diag = await context.client.get_diagnostics()
+    assert diag["connection"]["disconnects"] == 1
+    assert diag["connection"]["reconnects"] == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("context", "unused_tcp_port")
+async def test_reconnect_stop(request):
+    context = request.getfixturevalue("context")
+    server_port = request.getfixturevalue("unused_tcp_port")
+    server_ip   = "127.0.0.1"
+
+    task_server = await AsyncTaskHelper(context.start_server, server_port).start()
+    await asyncio.sleep(0.5)    # allow the server to start listening
+    await context.start_client(server_ip, server_port)
+    await task_server.join()
+    assert await context.server._wait_until_connected(5) == True
+
+    # Client side starts reconnecting once the server is gone
+    await context.stop_server()
+    await asyncio.sleep(0.5)
+    client = context.client
+    assert client._check_connection() == False
+    await asyncio.sleep(0.1)    # allow the reconnect loop to start
+    assert client._reconnecting == True
+
+    # Stopping ends the reconnect loop right away, without waiting for its next attempt
+    ts_start = datetime.now()
+    await context.stop_client()
+    assert (datetime.now() - ts_start).total_seconds() < 1
+    assert client._reconnecting == False
+    assert client.connected == False
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("context", "unused_tcp_port")
+async def test_reconnect_stop_server(request):
+    context = request.getfixturevalue("context")
+    server_port = request.getfixturevalue("unused_tcp_port")
+    server_ip   = "127.0.0.1"
+
+    task_server = await AsyncTaskHelper(context.start_server, server_port).start()
+    await asyncio.sleep(0.5)    # allow the server to start listening
+    await context.start_client(server_ip, server_port)
+    await task_server.join()
+    assert await context.server._wait_until_connected(5) == True
+
+    # Server side starts waiting for the next connection once the client is gone
+    await context.stop_client()
+    await asyncio.sleep(0.5)
+    server = context.server
+    assert server._check_connection() == False
+    await asyncio.sleep(0.1)    # allow the reconnect loop to start
+
+    # Stopping ends the wait for the next connection right away
+    ts_start = datetime.now()
+    await context.stop_server()
+    assert (datetime.now() - ts_start).total_seconds() < 1
+    assert server._reconnecting == False
+    assert AsyncTaskHelper.is_running("XcomApiTcpReconnect") == False
@@ -0,0 +1,60 @@
+import pytest
+from pystuderxcom import XcomParamException
+from pystuderxcom.cache import XcomParamCache
+
+
+def test_ttl():
+    cache = XcomParamCache(ttl=10)
+    cache.put(1107, 101, 4.0, now=100)
+
+    assert cache.get(1107, 101, now=105) == (True, 4.0)
+    assert cache.get(1107, 102, now=105) == (False, None)
+    assert cache.get(1107, 101, now=110) == (False, None)
+    assert len(cache) == 0
+    assert cache.hits == 1
+    assert cache.misses == 2
+
+
+def test_lru():
+    cache = XcomParamCache(ttl=10, max_size=2)
+    cache.put(1107, 101, 1.0, now=100)
+    cache.put(1108, 101, 2.0, now=100)
+
+    # Using 1107 makes 1108 the least recently used one
+    assert cache.get(1107, 101, now=101) == (True, 1.0)
+    cache.put(1109, 101, 3.0, now=101)
+
+    assert len(cache) == 2
+    assert cache.get(1107, 101, now=102) == (True, 1.0)
+    assert cache.get(1108, 101, now=102) == (False, None)
+    assert cache.get(1109, 101, now=102) == (True, 3.0)
+
+
+def test_invalidate():
+    cache = XcomParamCache(ttl=10)
+    for nr in [1107, 1108]:
+        for addr in [101, 102]:
+            cache.put(nr, addr, 1.0, now=100)
+
+    cache.invalidate(1107, 101)
+    assert len(cache) == 3
+
+    cache.invalidate(addr=102)
+    assert len(cache) == 1
+
+    cache.invalidate()
+    assert len(cache) == 0
+
+
+def test_disabled():
+    cache = XcomParamCache(ttl=0)
+    cache.put(1107, 101, 4.0)
+
+    assert cache.enabled == False
+    assert cache.get(1107, 101) == (False, None)
+    assert len(cache) == 0
+
+    with pytest.raises(XcomParamException):
+        XcomParamCache(ttl=-1)
+    with pytest.raises(XcomParamException):
+        XcomParamCache(ttl=10, max_size=0)
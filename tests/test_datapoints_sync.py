@@ -5,6 +5,7 @@ import pytest_asyncio
 
 from pystuderxcom import (
     XcomDataset, 
+    XcomLazyDataset,
     XcomVoltage, 
     XcomFormat, 
     XcomCategory, 
@@ -33,6 +34,48 @@ def test_create(voltageAC, voltageDC, exp_len):
     assert len(dataset._datapoints) == exp_len
 
 
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "voltageAC, voltageDC",
+    [
+        (XcomVoltage.AC120, XcomVoltage.DC12),
+        (XcomVoltage.AC240, XcomVoltage.DC48),
+    ]
+)
+def test_cache(voltageAC, voltageDC, tmp_path, monkeypatch):
+    cache_dir = tmp_path / "cache"
+
+    dataset_nocache = XcomFactory.create_dataset(voltageAC, voltageDC, use_cache=False, cache_dir=str(cache_dir))
+    assert not cache_dir.exists()
+
+    # First create writes the snapshot, second one loads it
+    dataset_write = XcomFactory.create_dataset(voltageAC, voltageDC, cache_dir=str(cache_dir))
+    assert len(list(cache_dir.iterdir())) == 1
+
+    dataset_read = XcomFactory.create_dataset(voltageAC, voltageDC, cache_dir=str(cache_dir))
+    assert len(list(cache_dir.iterdir())) == 1
+
+    assert dataset_write._datapoints == dataset_nocache._datapoints
+    assert dataset_read._datapoints == dataset_nocache._datapoints
+    assert dataset_read.get_by_nr(1108).max == dataset_nocache.get_by_nr(1108).max
+
+    # A corrupt snapshot is ignored and replaced
+    cache_path = next(cache_dir.iterdir())
+    cache_path.write_bytes(b"corrupt")
+
+    dataset_corrupt = XcomFactory.create_dataset(voltageAC, voltageDC, cache_dir=str(cache_dir))
+    assert dataset_corrupt._datapoints == dataset_nocache._datapoints
+    assert cache_path.read_bytes() != b"corrupt"
+
+    # A modified json source results in a new snapshot
+    path_xcom = tmp_path / "datapoints_xcom.json"
+    path_xcom.write_bytes(open(XcomDataset.PATH_XCOM, "rb").read())
+    monkeypatch.setattr(XcomDataset, "PATH_XCOM", str(path_xcom))
+
+    XcomFactory.create_dataset(voltageAC, voltageDC, cache_dir=str(cache_dir))
+    assert len(list(cache_dir.iterdir())) == 2
+
+
 @pytest.mark.asyncio
 def test_nr():
     dataset = XcomFactory.create_dataset(XcomVoltage.AC240, XcomVoltage.DC48)
@@ -136,6 +179,24 @@ def test_enum():
     assert param.enum_key("1") == None
 
 
+@pytest.mark.asyncio
+def test_shared():
+    dataset = XcomFactory.create_dataset(XcomVoltage.AC240, XcomVoltage.DC48)
+
+    # Datapoints are slotted, and identical option dicts and repeated strings are shared
+    param_1 = dataset.get_by_nr(1552)
+    assert not hasattr(param_1, "__dict__")
+
+    options = [point.options for point in dataset._datapoints if point.options is not None]
+    assert len({id(opt) for opt in options}) < len(options)
+
+    for point in dataset._datapoints:
+        if point.options == param_1.options:
+            assert point.options is param_1.options
+        if point.family_id == param_1.family_id:
+            assert point.family_id is param_1.family_id
+
+
 @pytest.mark.asyncio
 def test_menu():
     dataset = XcomFactory.create_dataset(XcomVoltage.AC240, XcomVoltage.DC48)
@@ -147,3 +208,62 @@ def test_menu():
         sub_items = dataset.get_menu_items(item.nr)
         assert len(sub_items) > 0
 
+
+    xt_items = dataset.get_menu_items(0, "xt")
+    assert 0 < len(xt_items) < len(root_items)
+    assert all(item.family_id == "xt" for item in xt_items)
+    assert [item.nr for item in xt_items] == [item.nr for item in root_items if item.family_id == "xt"]
+
+
+@pytest.mark.asyncio
+def test_name():
+    dataset = XcomFactory.create_dataset(XcomVoltage.AC240, XcomVoltage.DC48)
+
+    param = dataset.get_by_nr(3000, "xt")
+    assert dataset.get_by_name(param.name) is dataset.get_by_nr(3000)
+    assert dataset.get_by_name(param.name, "xt") is param
+
+    with pytest.raises(XcomDatapointUnknownException):
+        param = dataset.get_by_name("Unknown name")
+
+    with pytest.raises(XcomDatapointUnknownException):
+        param = dataset.get_by_name(param.name, "xcom")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "voltageAC, voltageDC",
+    [
+        (XcomVoltage.AC120, XcomVoltage.DC12),
+        (XcomVoltage.AC240, XcomVoltage.DC48),
+    ]
+)
+def test_lazy(voltageAC, voltageDC):
+    dataset = XcomFactory.create_dataset(voltageAC, voltageDC)
+    dataset_lazy = XcomFactory.create_dataset(voltageAC, voltageDC, lazy=True)
+
+    assert isinstance(dataset_lazy, XcomLazyDataset)
+    assert len(dataset_lazy) == len(dataset)
+
+    # Datapoints are only built when looked up, and then kept
+    assert all(point is None for point in dataset_lazy._points)
+
+    param = dataset_lazy.get_by_nr(1108, "xt")
+    assert param == dataset.get_by_nr(1108, "xt")
+    assert param is dataset_lazy.get_by_nr(1108)
+    assert sum(point is not None for point in dataset_lazy._points) == 1
+
+    # The name index is built from the names kept up front, without building other datapoints
+    assert dataset_lazy.get_by_name(param.name, "xt") is param
+    assert sum(point is not None for point in dataset_lazy._points) == 1
+
+    with pytest.raises(XcomDatapointUnknownException):
+        dataset_lazy.get_by_nr(9999)
+
+    with pytest.raises(XcomDatapointUnknownException):
+        dataset_lazy.get_by_name("Unknown name")
+
+    # Same menu structure and same datapoints as a normal dataset
+    assert dataset_lazy.get_menu_items(0) == dataset.get_menu_items(0)
+    assert dataset_lazy.get_menu_items(0, "xt") == dataset.get_menu_items(0, "xt")
+    assert dataset_lazy._datapoints == dataset._datapoints
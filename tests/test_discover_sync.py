@@ -1,17 +1,18 @@
 # Do not edit this file directly. It has been autogenerated from
 # tests\test_discover_async.py
 import asyncio
-import copy
 import threading
 import pytest
 import pytest_asyncio
 
 from pystuderxcom import AsyncXcomDiscover, XcomDiscover
+from pystuderxcom import AsyncXcomTopologyCache, XcomTopologyCache
 from pystuderxcom import AsyncXcomFactory, XcomFactory
-from pystuderxcom import XcomDataset, XcomData, XcomPackage
+from pystuderxcom import XcomDataset, XcomData, XcomPackage, XcomValues
 from pystuderxcom import XcomApiTimeoutException, XcomApiResponseIsError
 from pystuderxcom import XcomVoltage, XcomFormat, ScomServiceId, ScomObjType, ScomQspId, ScomErrorCode
-from . import AsyncTestApi, TestApi
+from . import AsyncTestApi, TestApi, make_response
+import time
 
 
 def on_receive(api: TestApi):
@@ -30,7 +31,7 @@ def on_receive(api: TestApi):
             flags = 0x02
             data = api.rsp_dict[str(req.frame_data.service_data.object_id)]
 
-        api.response_package = copy.deepcopy(api.request_package)
+        api.response_package = make_response(api.request_package)
         api.response_package.frame_data.service_flags = flags
         api.response_package.frame_data.service_data.property_data = data
         api.response_package.header.data_length = len(api.response_package.frame_data)
@@ -108,6 +109,53 @@ def test_discover_devices(name, rsp_dest, rsp_dict, exp_devices, request):
         assert device.sw_version is None
 
 
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("context")
+@pytest.mark.parametrize("window", [1, 4])
+def test_discover_devices_absent(window, request):
+    # Create discover instance
+    context = request.getfixturevalue("context")
+    rsp_dest = [101,102,301,501,601,701,990]
+    rsp_dict = {
+        "3000": XcomData.pack(1234.0, XcomFormat.FLOAT),
+        "5002": XcomData.pack(1234.0, XcomFormat.FLOAT),
+        "7054": XcomData.pack(1234.0, XcomFormat.FLOAT),
+        "11000": XcomData.pack(1234.0, XcomFormat.FLOAT),
+        "15000": XcomData.pack(1234.0, XcomFormat.FLOAT),
+    }
+    context.start_discover(rsp_dest, rsp_dict)
+
+    sent = []
+
+    def on_send(api: TestApi):
+        """Helper to remember all requests in flight"""
+        sent.append(api.request_package)
+
+    def on_receive(api: TestApi):
+        """Helper to answer the oldest request in flight; requests for absent devices are never answered"""
+        api.response_package = None
+        while sent:
+            req = sent.pop(0)
+            if req.header.dst_addr in rsp_dest:
+                api.response_package = make_response(req)
+                api.response_package.frame_data.service_flags = 0x02
+                api.response_package.frame_data.service_data.property_data = rsp_dict[str(req.frame_data.service_data.object_id)]
+                api.response_package.header.data_length = len(api.response_package.frame_data)
+                return
+
+        time.sleep(0.01)
+
+    context.api._on_send = on_send
+    context.api._on_receive = on_receive
+    context.api.request_window = window
+
+    # Perform the discover
+    devices = context.discover.discover_devices(retries=1, timeout=0.5)
+
+    # All present devices are found, in family order, even though the probes of absent devices time out
+    assert [device.code for device in devices] == ["XT1", "XT2", "RCC", "BMS", "VT1", "VS1", "XCOM"]
+
+
 @pytest.mark.asyncio
 @pytest.mark.usefixtures("context", "unused_tcp_port")
 @pytest.mark.parametrize(
@@ -208,3 +256,170 @@ def test_clientinfo(name, rsp_dest, rsp_dict, exp_ip, exp_guid, request):
     assert client_info is not None
     assert client_info.ip == exp_ip
     assert client_info.guid == exp_guid
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("context")
+def test_discover_extendedinfo_multi(request):
+    # Create discover instance
+    context = request.getfixturevalue("context")
+    context.start_discover([101,102,990], { "3000": XcomData.pack(1234.0, XcomFormat.FLOAT) })
+
+    ids = { 3124: 0x01, 3129: 0x0203, 3132: 0x0405, 3130: 0x0607, 3131: 0x0809, 3156: 0x0908, 3157: 0x0706 }
+    obj_types = []
+
+    def on_receive_multi(api: TestApi):
+        """Helper to also answer multi-info requests, like an Xcom client that supports these"""
+        req: XcomPackage = api.request_package
+        obj_types.append(req.frame_data.service_data.object_type)
+
+        if req.frame_data.service_data.object_type != ScomObjType.MULTI_INFO:
+            on_receive(api)
+            return
+
+        rsp_values = XcomValues.unpack_request(req.frame_data.service_data.property_data, context.dataset)
+        rsp_values.flags = 0
+        rsp_values.datetime = 0
+        for item in rsp_values.items:
+            item.value = float(ids[item.datapoint.nr])
+
+        api.response_package = make_response(req)
+        api.response_package.frame_data.service_flags = 0x02
+        api.response_package.frame_data.service_data.property_data = rsp_values.pack_response()
+        api.response_package.header.data_length = len(api.response_package.frame_data)
+
+    context.api._on_receive = on_receive_multi
+
+    # Perform the discover
+    devices = context.discover.discover_devices(getExtendedInfo=True)
+
+    # Check discovered devices and their extended info
+    assert [device.code for device in devices] == ["XT1", "XT2", "XCOM"]
+    for device in devices[0:2]:
+        assert device.device_model == "XTH"
+        assert device.hw_version == "2.3 / 4.5"
+        assert device.sw_version == "6.8.9"
+        assert device.fid == "09080706"
+
+    # The ID values of each Xtender were retrieved via one multi-info request instead of one request per value
+    assert obj_types.count(ScomObjType.MULTI_INFO) == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("context")
+def test_discover_topology(tmp_path, request):
+    # Create discover instance
+    context = request.getfixturevalue("context")
+    guid1 = "137aef81-08b7-4e70-ad89-0dad0563d627"
+    guid2 = "00000000-0000-0000-0000-000000000002"
+    rsp_dest = [101,102,501,990]
+    rsp_dict = { 
+        "0": XcomData.pack(guid1, XcomFormat.GUID),
+        "3000": XcomData.pack(1234.0, XcomFormat.FLOAT),
+    }
+    context.start_discover(rsp_dest, rsp_dict)
+
+    requests = []
+    def on_receive_count(api: TestApi):
+        """Helper to count the requests sent to the Xcom client"""
+        requests.append(api.request_package)
+        on_receive(api)
+
+    context.api._on_receive = on_receive_count
+
+    # First time a full discovery is done and the result is cached
+    cache = XcomTopologyCache(str(tmp_path / "topology.json"))
+    assert cache.load() == False
+
+    topology = context.discover.discover_topology(cache)
+    count_full = len(requests)
+
+    assert topology.client.guid == guid1
+    assert [device.code for device in topology.devices] == ["XT1", "XT2", "XCOM"]
+    assert guid1 in cache
+
+    # After a restart, the cached topology is only revalidated
+    cache = XcomTopologyCache(str(tmp_path / "topology.json"))
+    assert cache.load() == True
+    assert len(cache) == 1
+
+    requests.clear()
+    topology = context.discover.discover_topology(cache)
+
+    assert topology.client.guid == guid1
+    assert [device.code for device in topology.devices] == ["XT1", "XT2", "XCOM"]
+    assert len(requests) < count_full / 2
+
+    # A device that no longer responds leads to a full discovery
+    rsp_dest.remove(102)
+    requests.clear()
+    topology = context.discover.discover_topology(cache)
+
+    assert [device.code for device in topology.devices] == ["XT1", "XCOM"]
+    assert len(requests) > count_full / 2
+    assert [device.code for device in cache.get(guid1).devices] == ["XT1", "XCOM"]
+
+    # Another gateway leads to a full discovery as well
+    rsp_dict["0"] = XcomData.pack(guid2, XcomFormat.GUID)
+    requests.clear()
+    topology = context.discover.discover_topology(cache)
+
+    assert topology.client.guid == guid2
+    assert len(requests) > count_full / 2
+    assert len(cache) == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("context")
+def test_discover_topology_extendedinfo(tmp_path, request):
+    # Create discover instance
+    context = request.getfixturevalue("context")
+    guid = "137aef81-08b7-4e70-ad89-0dad0563d627"
+    rsp_dest = [101,501,990]
+    rsp_dict = { 
+        "0": XcomData.pack(guid, XcomFormat.GUID),
+        "3000": XcomData.pack(1234.0, XcomFormat.FLOAT), # detect
+        "3124": XcomData.pack(0x01, XcomFormat.FLOAT),   # device_model
+        "3129": XcomData.pack(0x0203, XcomFormat.FLOAT), # hw_version
+        "3132": XcomData.pack(0x0405, XcomFormat.FLOAT), # hw_version
+        "3130": XcomData.pack(0x0607, XcomFormat.FLOAT), # sw_version
+        "3131": XcomData.pack(0x0809, XcomFormat.FLOAT), # sw_version
+        "3156": XcomData.pack(0x0908, XcomFormat.FLOAT), # fid
+        "3157": XcomData.pack(0x0706, XcomFormat.FLOAT), # fid
+    }
+    context.start_discover(rsp_dest, rsp_dict)
+
+    requests = []
+    def on_receive_count(api: TestApi):
+        """Helper to count the requests sent to the Xcom client"""
+        requests.append(api.request_package)
+        on_receive(api)
+
+    context.api._on_receive = on_receive_count
+
+    # The topology is cached by a discovery without extended info
+    cache = XcomTopologyCache(str(tmp_path / "topology.json"))
+    topology = context.discover.discover_topology(cache)
+
+    assert [device.code for device in topology.devices] == ["XT1", "XCOM"]
+    assert topology.devices[0].device_model is None
+
+    # Asking for extended info fetches it for the cached devices, without a full discovery
+    requests.clear()
+    topology = context.discover.discover_topology(cache, getExtendedInfo=True)
+    count_extended = len(requests)
+
+    assert [device.code for device in topology.devices] == ["XT1", "XCOM"]
+    assert topology.devices[0].device_model == "XTH"
+    assert topology.devices[0].fid == "09080706"
+    assert cache.get(guid).devices[0].device_model == "XTH"
+
+    # Once cached with extended info, the cached devices are only revalidated
+    cache = XcomTopologyCache(str(tmp_path / "topology.json"))
+    assert cache.load() == True
+
+    requests.clear()
+    topology = context.discover.discover_topology(cache, getExtendedInfo=True)
+
+    assert topology.devices[0].device_model == "XTH"
+    assert len(requests) < count_extended
@@ -10,6 +10,18 @@ def test_list():
     assert len(families) == 10
 
 
+def test_static_maps():
+    # Built once at import, read-only afterwards
+    assert isinstance(XcomDeviceFamilies._families, tuple)
+    with pytest.raises(TypeError):
+        XcomDeviceFamilies._code_map["XT1"] = None
+
+    assert XcomDeviceFamilies._code_map["XT1"] == (XcomDeviceFamilies.XTENDER, 101, XcomAggregationType.DEVICE1)
+    assert XcomDeviceFamilies._family_addr_to_code_map[("xt", 191)] == "L1"
+    assert XcomDeviceFamilies._family_addr_to_code_map[("bms", 601)] == "BMS"
+    assert XcomDeviceFamilies._family_addr_to_code_map[("bsp", 601)] == "BSP"
+
+
 def test_id():
     families = XcomDeviceFamilies.get_list()
     for family in families:
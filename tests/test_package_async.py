@@ -1,11 +1,14 @@
 from datetime import datetime
+from io import BytesIO
 import math
 import pytest
 import pytest_asyncio
 from pystuderxcom import AsyncXcomFactory
 from pystuderxcom import XcomFactory
-from pystuderxcom import XcomPackage, XcomDataset, XcomData, XcomDataMultiInfoReq, XcomDataMultiInfoReqItem, XcomDataMultiInfoRsp, XcomDataMultiInfoRspItem, XcomDataMessageRsp
+from pystuderxcom import XcomFramer, XcomPackage, XcomDataset, XcomData, XcomDataMultiInfoReq, XcomDataMultiInfoReqItem, XcomDataMultiInfoRsp, XcomDataMultiInfoRspItem, XcomDataMessageRsp
 from pystuderxcom import XcomFormat, XcomVoltage, XcomAggregationType, ScomServiceId, ScomObjType, ScomQspId, ScomAddress
+from pystuderxcom import XcomApiUnpackException
+from pystuderxcom.data import AsyncReader, SyncReader
 
 
 @pytest_asyncio.fixture
@@ -111,6 +114,11 @@ async def test_package_props(fixture, exp_src_addr, exp_dst_addr, exp_svc_id, ex
     assert buf is not None
     assert len(buf) > 0
 
+    # The single-pass encoder must give the same bytes as assemble
+    ref = BytesIO()
+    package.assemble(ref)
+    assert package._encode() == ref.getvalue()
+
     # Test parse_bytes (calls parse)
     clone = await AsyncXcomFactory.parse_package_bytes(buf)
 
@@ -172,3 +180,195 @@ async def test_package_flags(name, fixture, modify_flags, modify_data, expected_
     assert clone.get_error() == expected_getError
 
 
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("package_read_info", "package_read_param")
+@pytest.mark.parametrize(
+    "name, prefix, suffix, corrupt_at, exp_start, exp_package, exp_except",
+    [
+        ("package",           b'',             b'',     None, 0, True,  None),
+        ("skip bytes",        b'\xff\x00\x01', b'',     None, 3, True,  None),
+        ("incomplete header", b'\xff',         None,    6,    1, False, None),
+        ("incomplete frame",  b'',             None,    16,   0, False, None),
+        ("header checksum",   b'',             b'',     3,    0, False, XcomApiUnpackException),
+        ("frame checksum",    b'',             b'',     16,   0, False, XcomApiUnpackException),
+        ("no start byte",     b'\x00\x01',     None,    0,    2, False, None),
+    ]
+)
+async def test_parse_buffer(name, prefix, suffix, corrupt_at, exp_start, exp_package, exp_except, request):
+    package: XcomPackage = request.getfixturevalue("package_read_info")
+    buf = bytearray(package.get_bytes())
+
+    if suffix is None:
+        # Truncate the buffer at corrupt_at
+        buf = buf[:corrupt_at]
+    elif corrupt_at is not None:
+        # Flip a byte to invalidate a checksum
+        buf[corrupt_at] ^= 0xFF
+    buf = bytearray(prefix) + buf
+
+    if exp_except is not None:
+        with pytest.raises(exp_except):
+            XcomPackage.parse_buffer(buf)
+        return
+
+    clone, start, end = XcomPackage.parse_buffer(buf)
+    assert start == exp_start
+
+    if exp_package:
+        assert end == len(buf)
+        assert clone.get_bytes() == package.get_bytes()
+    else:
+        assert clone is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("package_read_info", "package_read_param")
+async def test_parse_buffer_multiple(request):
+    package1: XcomPackage = request.getfixturevalue("package_read_info")
+    package2: XcomPackage = request.getfixturevalue("package_read_param")
+
+    buf = bytearray(package1.get_bytes() + b'\xff' + package2.get_bytes())
+
+    clone1, start1, end1 = XcomPackage.parse_buffer(buf)
+    clone2, start2, end2 = XcomPackage.parse_buffer(buf, end1)
+
+    assert start1 == 0
+    assert start2 == end1 + 1
+    assert end2 == len(buf)
+    assert clone1.get_bytes() == package1.get_bytes()
+    assert clone2.get_bytes() == package2.get_bytes()
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("package_read_info", "package_read_param")
+async def test_parse_package_stream(request):
+    package1: XcomPackage = request.getfixturevalue("package_read_info")
+    package2: XcomPackage = request.getfixturevalue("package_read_param")
+
+    # Packages are parsed one after the other from the same stream, skipping garbage in between
+    reader = AsyncReader(b'\xff' + package1.get_bytes() + b'\xff\x00' + package2.get_bytes())
+
+    clone1 = await AsyncXcomFactory.parse_package(reader, timeout=1)
+    clone2 = await AsyncXcomFactory.parse_package(reader, timeout=1)
+
+    assert clone1.get_bytes() == package1.get_bytes()
+    assert clone2.get_bytes() == package2.get_bytes()
+
+    # Corrupt header
+    corrupt = bytearray(package1.get_bytes())
+    corrupt[3] ^= 0xFF
+    with pytest.raises(XcomApiUnpackException):
+        await AsyncXcomFactory.parse_package(AsyncReader(bytes(corrupt)), timeout=1)
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("package_read_info", "package_read_param", "package_write_param")
+@pytest.mark.parametrize(
+    "name, chunk_size, garbage, exp_skipped",
+    [
+        ("one chunk",         None, b'',                0),
+        ("byte by byte",      1,    b'',                0),
+        ("split chunks",      7,    b'',                0),
+        ("garbage",           None, b'\xff\x00',        8),
+        ("garbage by byte",   1,    b'\xff\x00',        8),
+        ("false start byte",  5,    b'\xaa\x01\x02',    9),
+    ]
+)
+async def test_framer(name, chunk_size, garbage, exp_skipped, request):
+    packages: list[XcomPackage] = [
+        request.getfixturevalue("package_read_info"),
+        request.getfixturevalue("package_read_param"),
+        request.getfixturevalue("package_write_param"),
+    ]
+
+    # Garbage before, between and after the packages
+    buf = garbage + garbage.join(p.get_bytes() for p in packages) + garbage
+    chunk_size = chunk_size or len(buf)
+
+    framer = XcomFramer()
+    clones = []
+    for idx in range(0, len(buf), chunk_size):
+        framer.feed(buf[idx:idx+chunk_size])
+        while (clone := framer.get_package()) is not None:
+            clones.append(clone)
+
+    assert [c.get_bytes() for c in clones] == [p.get_bytes() for p in packages]
+    assert len(framer) == 0
+    assert framer.skipped == exp_skipped
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("package_read_info")
+async def test_framer_corrupt(request):
+    package: XcomPackage = request.getfixturevalue("package_read_info")
+
+    # A package with a bad frame checksum is discarded, the next good one is still found
+    corrupt = bytearray(package.get_bytes())
+    corrupt[-1] ^= 0xFF
+
+    framer = XcomFramer()
+    assert framer.feed(bytes(corrupt) + package.get_bytes()) == 1
+    assert framer.get_package().get_bytes() == package.get_bytes()
+    assert framer.get_package() is None
+
+    # Partial remainder is kept until reset
+    framer.feed(package.get_bytes()[:5])
+    framer.reset()
+    assert framer.feed(package.get_bytes()[5:]) == 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "name, data",
+    [
+        ("empty",    b''),
+        ("single",   b'\x01'),
+        ("overflow", b'\xff' * 3),
+        ("header",   bytes(range(11))),
+        ("max",      bytes(range(256))),
+    ]
+)
+async def test_checksum(name, data):
+    # Reference implementation of the checksum as described in the Studer documentation
+    A = 0xFF
+    B = 0x00
+    for d in data:
+        A = (A + d) % 0x100
+        B = (B + A) % 0x100
+
+    assert XcomPackage.checksum(data) == bytes([A, B])
+    assert XcomPackage.checksum(memoryview(bytearray(data))) == bytes([A, B])
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "name, property_ids",
+    [
+        ("same id",        [0x0001, 0x0001]),
+        ("low byte",       [0x0001, 0x0002, 0x00FF]),
+        ("high byte",      [0x0100, 0xFF00, 0x0000]),
+        ("both bytes",     [0x1234, 0xFFFF, 0x0000, 0xABCD]),
+    ]
+)
+async def test_template(name, property_ids, request):
+    data = XcomDataMultiInfoReq([XcomDataMultiInfoReqItem(3000+idx, XcomAggregationType.DEVICE1) for idx in range(10)]).pack()
+
+    for property_id in property_ids:
+        package = XcomPackage.gen_package(
+            service_id = ScomServiceId.READ,
+            object_type = ScomObjType.MULTI_INFO,
+            object_id = 0x01,
+            property_id = property_id,
+            property_data = data,
+            dst_addr = ScomAddress.RCC,
+        )
+
+        # Bytes from the template must be identical to a full assemble
+        buf = BytesIO()
+        package.assemble(buf)
+        assert package.get_bytes() == buf.getvalue()
+
+        clone = await AsyncXcomFactory.parse_package_bytes(package.get_bytes())
+        assert clone.frame_data.service_data.property_id == property_id
@@ -0,0 +1,109 @@
+import pytest
+import pytest_asyncio
+
+from pystuderxcom import AsyncXcomGatewayPool, XcomGatewayPool
+from pystuderxcom import AsyncXcomFactory, XcomFactory
+from pystuderxcom import XcomData, XcomPackage
+from pystuderxcom import XcomValues, XcomValuesItem
+from pystuderxcom import XcomVoltage, XcomFormat, ScomObjType, XcomParamException
+from . import AsyncTestApi, TestApi, make_response
+
+
+async def on_receive(api: AsyncTestApi):
+    """Helper to turn a request into a response"""
+    req: XcomPackage = api.request_package
+    req_data = req.frame_data.service_data.property_data
+
+    api.response_package = make_response(req)
+    api.response_package.frame_data.service_flags = 0x02
+
+    if req.frame_data.service_data.object_type == ScomObjType.MULTI_INFO:
+        rsp_values = XcomValues.unpack_request(req_data, api.rsp_dict)
+        rsp_values.flags = 0
+        rsp_values.datetime = 0
+        for item in rsp_values.items:
+            item.value = 1.0
+        api.response_package.frame_data.service_data.property_data = rsp_values.pack_response()
+    else:
+        api.response_package.frame_data.service_data.property_data = XcomData.pack(1.0, XcomFormat.FLOAT)
+
+    api.response_package.header.data_length = len(api.response_package.frame_data)
+    api.rsp_dest.append(req.frame_data.service_data.object_type)
+
+
+async def on_receive_fail(api: AsyncTestApi):
+    """Helper to simulate a gateway that has a problem"""
+    raise ValueError("gateway failure")
+
+
+@pytest_asyncio.fixture
+async def dataset():
+    dataset = await AsyncXcomFactory.create_dataset(XcomVoltage.AC240, XcomVoltage.DC48)
+    yield dataset
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("dataset")
+async def test_request_values(request):
+    dataset = request.getfixturevalue("dataset")
+
+    api1 = AsyncTestApi(on_receive_handler=on_receive, rsp_dest=[], rsp_dict=dataset)
+    api2 = AsyncTestApi(on_receive_handler=on_receive, rsp_dest=[], rsp_dict=dataset)
+    api3 = AsyncTestApi(on_receive_handler=on_receive_fail, rsp_dest=[], rsp_dict=dataset)
+    api4 = AsyncTestApi(on_receive_handler=on_receive, rsp_dest=[], rsp_dict=dataset)
+    api4._connected = False
+
+    pool = AsyncXcomGatewayPool()
+    pool.add("site1", api1)
+    pool.add("site2", api2)
+    pool.add("site3", api3)
+    pool.add("site4", api4)
+
+    assert len(pool) == 4
+    assert "site2" in pool
+    assert pool.get("site3") is api3
+    assert pool.names == ["site1", "site2", "site3", "site4"]
+    assert pool.connected == {"site1": True, "site2": True, "site3": True, "site4": False}
+
+    with pytest.raises(XcomParamException):
+        pool.add("site1", api1)
+
+    req = {
+        "site1": XcomValues([XcomValuesItem(dataset.get_by_nr(3000), code="XT1"), XcomValuesItem(dataset.get_by_nr(3023), code="XT1")]),
+        "site2": XcomValues([XcomValuesItem(dataset.get_by_nr(1107), code="XT1")]),
+        "site3": XcomValues([XcomValuesItem(dataset.get_by_nr(3000), code="XT1")]),
+        "site4": XcomValues([XcomValuesItem(dataset.get_by_nr(3000), code="XT1")]),
+    }
+    rsp = await pool.request_values(req, retries=1, timeout=1)
+
+    assert list(rsp.keys()) == ["site1", "site2", "site3", "site4"]
+    assert [item.datapoint.nr for item in rsp["site1"].items] == [3000, 3023]
+    assert [item.datapoint.nr for item in rsp["site2"].items] == [1107]
+    assert all(item.value == pytest.approx(1.0) for item in rsp["site1"].items + rsp["site2"].items)
+
+    # Each request only went to its own gateway
+    assert api1.rsp_dest == [ScomObjType.MULTI_INFO]
+    assert api2.rsp_dest == [ScomObjType.PARAMETER]
+    assert api4.rsp_dest == []
+
+    # A failing gateway does not affect the others, and items that could not be retrieved are flagged
+    assert all(item.error is not None for item in rsp["site3"].items)
+    assert rsp["site4"] is None
+
+    with pytest.raises(XcomParamException):
+        await pool.request_values({"unknown": XcomValues([])})
+
+    # Test api's cannot be started or stopped; failures are reported per gateway
+    assert await pool.start(timeout=1) == {"site1": False, "site2": False, "site3": False, "site4": False}
+    await pool.stop()
+
+    diag = await pool.get_diagnostics()
+    assert diag["statistics"]["gateways"] == 4
+    assert diag["statistics"]["connected"] == 3
+    assert diag["statistics"]["errors"] == 8
+    assert diag["gateways"]["site1"]["errors"] == 2
+    assert diag["gateways"]["site1"]["last_error"] is not None
+    assert sum(diag["statistics"]["retries"].values()) == sum(sum(diag["gateways"][name]["statistics"]["retries"].values()) for name in pool.names)
+
+    assert pool.remove("site4") is api4
+    assert len(pool) == 3
@@ -0,0 +1,107 @@
+import time
+import pytest
+import pytest_asyncio
+
+from pystuderxcom import AsyncXcomScheduler, XcomScheduler
+from pystuderxcom import AsyncXcomFactory, XcomFactory
+from pystuderxcom import XcomData, XcomPackage
+from pystuderxcom import XcomValues, XcomValuesItem
+from pystuderxcom import XcomVoltage, XcomFormat, ScomObjType
+from pystuderxcom import XcomParamException
+from pystuderxcom.const import POLL_INTERVAL_FAST, POLL_INTERVAL_NORMAL, POLL_INTERVAL_SLOW
+from . import AsyncTestApi, TestApi, make_response
+
+
+async def on_receive(api: AsyncTestApi):
+    """Helper to turn a request into a response"""
+    req: XcomPackage = api.request_package
+    req_data = req.frame_data.service_data.property_data
+
+    api.response_package = make_response(req)
+    api.response_package.frame_data.service_flags = 0x02
+
+    if req.frame_data.service_data.object_type == ScomObjType.MULTI_INFO:
+        rsp_values = XcomValues.unpack_request(req_data, api.rsp_dict)
+        rsp_values.flags = 0
+        rsp_values.datetime = 0
+        for item in rsp_values.items:
+            item.value = 1.0
+        api.response_package.frame_data.service_data.property_data = rsp_values.pack_response()
+    else:
+        api.response_package.frame_data.service_data.property_data = XcomData.pack(1.0, XcomFormat.FLOAT)
+
+    api.response_package.header.data_length = len(api.response_package.frame_data)
+    api.rsp_dest.append(req.frame_data.service_data.object_type)
+
+
+@pytest_asyncio.fixture
+async def dataset():
+    dataset = await AsyncXcomFactory.create_dataset(XcomVoltage.AC240, XcomVoltage.DC48)
+    yield dataset
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("dataset")
+@pytest.mark.parametrize(
+    "name, nr, exp_interval",
+    [
+        ("info voltage", 3000, POLL_INTERVAL_NORMAL),
+        ("info current", 3005, POLL_INTERVAL_FAST),
+        ("info power",   3023, POLL_INTERVAL_FAST),
+        ("info id",      3124, POLL_INTERVAL_SLOW),
+        ("param",        1107, POLL_INTERVAL_SLOW),
+    ]
+)
+async def test_default_interval(name, nr, exp_interval, request):
+    dataset = request.getfixturevalue("dataset")
+
+    assert AsyncXcomScheduler.get_default_interval(dataset.get_by_nr(nr)) == exp_interval
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("dataset")
+async def test_tick(request):
+    dataset = request.getfixturevalue("dataset")
+
+    api = AsyncTestApi(on_receive_handler=on_receive, rsp_dest=[], rsp_dict=dataset)
+    scheduler = AsyncXcomScheduler(api)
+
+    scheduler.register(XcomValuesItem(dataset.get_by_nr(3000), code="XT1"))
+    scheduler.register(XcomValuesItem(dataset.get_by_nr(3005), code="XT1"))
+    scheduler.register(XcomValuesItem(dataset.get_by_nr(3023), code="XT1"))
+    scheduler.register(XcomValuesItem(dataset.get_by_nr(1107), code="XT1"))
+    scheduler.register(XcomValuesItem(dataset.get_by_nr(1107), code="XT1"), interval=600)
+
+    with pytest.raises(XcomParamException):
+        scheduler.register(XcomValuesItem(dataset.get_by_nr(3000), code="XT1"), interval=0)
+
+    assert len(scheduler.items) == 4
+    assert len(scheduler.get_due_items()) == 4
+
+    # Subscribers on the api are notified of the polled values
+    notified = []
+    api.subscribe(lambda item: notified.append(item.datapoint.nr), 3005, "XT1")
+
+    # First tick polls everything; the three infos in one multi-info request and the param on its own
+    values = await scheduler.tick(retries=1, timeout=1)
+    assert notified == [3005]
+    assert len(values.items) == 4
+    assert api.rsp_dest == [ScomObjType.MULTI_INFO, ScomObjType.PARAMETER]
+    assert all(item.value == pytest.approx(1.0) for item in values.items)
+
+    # Directly after, nothing is due
+    api.rsp_dest.clear()
+    values = await scheduler.tick(retries=1, timeout=1)
+    assert len(values.items) == 0
+    assert api.rsp_dest == []
+
+    # After the fast interval only the current and power infos are due
+    due = scheduler.get_due_items(time.monotonic() + POLL_INTERVAL_FAST+1)
+    assert sorted(item.datapoint.nr for item in due) == [3005, 3023]
+
+    # After the normal interval all infos are due, but not yet the param
+    due = scheduler.get_due_items(time.monotonic() + POLL_INTERVAL_NORMAL+1)
+    assert sorted(item.datapoint.nr for item in due) == [3000, 3005, 3023]
+
+    scheduler.unregister(XcomValuesItem(dataset.get_by_nr(3000), code="XT1"))
+    assert len(scheduler.items) == 3
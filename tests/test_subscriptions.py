@@ -0,0 +1,69 @@
+import pytest
+import pytest_asyncio
+import time
+from pystuderxcom import XcomValues, XcomValuesItem
+from pystuderxcom import XcomVoltage
+from pystuderxcom import AsyncXcomFactory
+from pystuderxcom.subscriptions import XcomSubscriptions
+
+
+@pytest_asyncio.fixture
+async def dataset():
+    dataset = await AsyncXcomFactory.create_dataset(XcomVoltage.AC240, XcomVoltage.DC48)
+    yield dataset
+
+
+@pytest.mark.usefixtures("dataset")
+@pytest.mark.parametrize(
+    "name, deadband, min_interval, polls, exp_notified",
+    [
+        ("every change",  0,   0,  [(0, 1.0), (1, 1.0), (2, 1.1), (3, 1.2)], [1.0, 1.1, 1.2]),
+        ("deadband",      0.5, 0,  [(0, 1.0), (1, 1.4), (2, 1.6), (3, 2.0)], [1.0, 1.6]),
+        ("min interval",  0,   10, [(0, 1.0), (1, 2.0), (5, 3.0), (11, 3.0), (12, 4.0)], [1.0, 3.0]),
+        ("error skipped", 0,   0,  [(0, 1.0), (1, None), (2, 1.0), (3, 2.0)], [1.0, 2.0]),
+    ]
+)
+async def test_notify(name, deadband, min_interval, polls, exp_notified, request):
+    dataset = request.getfixturevalue("dataset")
+    info_3000 = dataset.get_by_nr(3000)
+
+    notified = []
+    subscriptions = XcomSubscriptions()
+    subscriptions.subscribe(3000, "XT1", lambda item: notified.append(item.value), deadband=deadband, min_interval=min_interval)
+
+    start = time.monotonic()
+    for offset, value in polls:
+        error = "failed" if value is None else None
+        values = XcomValues([
+            XcomValuesItem(info_3000, code="XT1", value=value, error=error),
+            XcomValuesItem(info_3000, code="XT2", value=99.0),  # Other device; not subscribed
+        ])
+        subscriptions.notify(values, now=start+offset)
+
+    assert notified == exp_notified
+
+
+@pytest.mark.usefixtures("dataset")
+async def test_subscribe_unsubscribe(request):
+    dataset = request.getfixturevalue("dataset")
+    info_3000 = dataset.get_by_nr(3000)
+
+    notified_1 = []
+    notified_2 = []
+    subscriptions = XcomSubscriptions()
+    sub_1 = subscriptions.subscribe(3000, "XT1", lambda item: notified_1.append(item.value))
+    sub_2 = subscriptions.subscribe(3000, "XT1", lambda item: notified_2.append(item.value))
+    assert len(subscriptions) == 2
+
+    assert subscriptions.notify(XcomValues([XcomValuesItem(info_3000, code="XT1", value=1.0)])) == 2
+
+    subscriptions.unsubscribe(sub_1)
+    assert len(subscriptions) == 1
+
+    assert subscriptions.notify(XcomValues([XcomValuesItem(info_3000, code="XT1", value=2.0)])) == 1
+    assert notified_1 == [1.0]
+    assert notified_2 == [1.0, 2.0]
+
+    subscriptions.unsubscribe(sub_2)
+    subscriptions.unsubscribe(sub_2)
+    assert len(subscriptions) == 0
@@ -1,7 +1,7 @@
 import math
 import pytest
 import pytest_asyncio
-from pystuderxcom import XcomValues, XcomValuesItem
+from pystuderxcom import XcomValues, XcomValuesColumns, XcomValuesItem
 from pystuderxcom import XcomFormat, XcomVoltage, XcomAggregationType
 from pystuderxcom import XcomDataset, XcomDatapoint
 from pystuderxcom import AsyncXcomFactory
@@ -88,3 +88,103 @@ async def test_pack_unpack(name, values_fixture, request):
         assert clone_item.address == org_item.address
         assert clone_item.aggregation_type == org_item.aggregation_type
         assert clone_item.value == org_item.value
+
+
+@pytest.mark.usefixtures("dataset")
+async def test_unpack_response_join(request):
+    dataset: XcomDataset = request.getfixturevalue("dataset")
+    info_3000 = dataset.get_by_nr(3000)
+    info_3032 = dataset.get_by_nr(3032)
+    info_3001 = dataset.get_by_nr(3001)
+
+    values_req = XcomValues([
+        XcomValuesItem(info_3000, aggregation_type=XcomAggregationType.DEVICE1),
+        XcomValuesItem(info_3000, aggregation_type=XcomAggregationType.DEVICE2),
+        XcomValuesItem(info_3032, aggregation_type=XcomAggregationType.DEVICE1),
+    ])
+
+    # Response items in a different order than requested, plus an unrequested nr and a trailing partial record
+    values_rsp = XcomValues(
+        flags = 0,
+        datetime = 0,
+        items = [
+            XcomValuesItem(info_3032, aggregation_type=XcomAggregationType.MASTER, value=7),
+            XcomValuesItem(info_3000, aggregation_type=XcomAggregationType.DEVICE2, value=2.0),
+            XcomValuesItem(info_3000, aggregation_type=XcomAggregationType.DEVICE1, value=1.0),
+            XcomValuesItem(info_3001, aggregation_type=XcomAggregationType.DEVICE1, value=9.0),
+        ]
+    )
+    buf = values_rsp.pack_response() + b'\x00\x01\x02'
+
+    clone = XcomValues.unpack_response(buf, values_req)
+    assert len(clone.items) == 3
+
+    assert [item.datapoint.nr for item in clone.items] == [3032, 3000, 3000]
+    assert [item.aggregation_type for item in clone.items] == [XcomAggregationType.MASTER, XcomAggregationType.DEVICE2, XcomAggregationType.DEVICE1]
+    assert [item.value for item in clone.items] == [7, 2.0, 1.0]
+
+    # The columnar path skips the unrequested nr as well
+    columns = XcomValuesColumns.unpack_response(buf, values_req)
+    assert columns.nrs == [3032, 3000, 3000]
+    assert columns.values == [7, 2.0, 1.0]
+
+
+@pytest.mark.usefixtures("dataset", "values_rsp")
+async def test_from_resolved(request):
+    values_rsp: XcomValues = request.getfixturevalue("values_rsp")
+
+    for item in values_rsp.items:
+        clone = XcomValuesItem.from_resolved(item.datapoint, item.code, item.address, item.aggregation_type, item.value)
+        slow = XcomValuesItem(item.datapoint, aggregation_type=item.aggregation_type, value=item.value)
+
+        assert vars(clone) == vars(item)
+        assert vars(slow) == vars(item)
+
+
+@pytest.mark.usefixtures("dataset", "values_req", "values_rsp")
+async def test_columns(request):
+    values_req: XcomValues = request.getfixturevalue("values_req")
+    values_rsp: XcomValues = request.getfixturevalue("values_rsp")
+
+    buf = values_rsp.pack_response()
+    rows = XcomValues.unpack_response(buf, values_req)
+    cols = XcomValuesColumns.unpack_response(buf, values_req)
+
+    assert len(cols) == len(rows.items)
+    assert cols.flags == rows.flags
+    assert cols.datetime == rows.datetime
+    assert cols._items is None
+
+    assert cols.nrs == [item.datapoint.nr for item in rows.items]
+    assert cols.addresses == [item.address for item in rows.items]
+    assert cols.aggregation_types == [item.aggregation_type for item in rows.items]
+    assert cols.values == [item.value for item in rows.items]
+    assert cols.errors == [None] * len(cols)
+
+    # Items are created on first access only
+    for col_item, row_item in zip(cols, rows.items):
+        assert col_item.datapoint is row_item.datapoint
+        assert col_item.code == row_item.code
+        assert col_item.address == row_item.address
+        assert col_item.aggregation_type == row_item.aggregation_type
+        assert col_item.value == row_item.value
+
+    records = cols.to_records()
+    assert records[0] == dict(nr=3021, address=101, aggregation_type=XcomAggregationType.DEVICE1, value=pytest.approx(1.0), error=None)
+
+    clone = XcomValuesColumns.from_values(rows)
+    assert clone.to_records() == records
+
+
+@pytest.mark.usefixtures("dataset", "values_req", "values_rsp")
+async def test_columns_numpy(request):
+    numpy = pytest.importorskip("numpy")
+    values_req: XcomValues = request.getfixturevalue("values_req")
+    values_rsp: XcomValues = request.getfixturevalue("values_rsp")
+
+    cols = XcomValuesColumns.unpack_response(values_rsp.pack_response(), values_req)
+    arr = cols.to_numpy()
+
+    assert len(arr) == len(cols)
+    assert list(arr["nr"]) == cols.nrs
+    assert numpy.allclose(arr["value"], [float(v) for v in cols.values])
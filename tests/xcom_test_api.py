@@ -1,4 +1,5 @@
 
+import copy
 import logging
 
 from pystuderxcom import (
@@ -11,6 +12,16 @@ from pystuderxcom import (
 _LOGGER = logging.getLogger(__name__)
 
 
+def make_response(request: XcomPackage) -> XcomPackage:
+    """
+    Helper to turn a request into a response package, sent back by the addressed device
+    """
+    response = copy.deepcopy(request)
+    response.header.src_addr = request.header.dst_addr
+    response.header.dst_addr = request.header.src_addr
+    return response
+
+
 class AsyncTestApi(AsyncXcomApiBase):
     """
     Derived class to help test the parent class
@@ -31,6 +42,7 @@ class AsyncTestApi(AsyncXcomApiBase):
         self.receive_called: bool = False
         self.request_package: XcomPackage = None
         self.response_package: XcomPackage = None
+        self.receive_deadline: float|None = None
 
     async def _send_package(self, package: XcomPackage):
         self.send_called = True
@@ -39,7 +51,8 @@ class AsyncTestApi(AsyncXcomApiBase):
         if self._on_send:
             await self._on_send(self)
 
-    async def _receive_package(self) -> XcomPackage | None:
+    async def _receive_package(self, deadline: float|None = None) -> XcomPackage | None:
+        self.receive_deadline = deadline
         if self._on_receive:
             await self._on_receive(self)
 
@@ -68,6 +81,7 @@ class TestApi(XcomApiBase):
         self.receive_called: bool = False
         self.request_package: XcomPackage = None
         self.response_package: XcomPackage = None
+        self.receive_deadline: float|None = None
 
     def _send_package(self, package: XcomPackage):
         self.send_called = True
@@ -76,7 +90,8 @@ class TestApi(XcomApiBase):
         if self._on_send:
             self._on_send(self)
 
-    def _receive_package(self) -> XcomPackage | None:
+    def _receive_package(self, deadline: float|None = None) -> XcomPackage | None:
+        self.receive_deadline = deadline
         if self._on_receive:
             self._on_receive(self)
 